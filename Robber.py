@@ -8,6 +8,8 @@ import re
 import sqlite3
 import datetime
 
+# Same default as Robber_logic.SCAN_URL_TEMPLATE; use Robber_GUI's "Crawl targets" mode for several exams at once
+SCAN_URL_TEMPLATE = "https://www.examtopics.com/discussions/amazon/view/{id}-exam-aws-certified-cloud-practitioner-clf-c02-topic-1/"
 
 fail=0
 conn = sqlite3.connect("RobberDB.db")
@@ -167,9 +169,10 @@ def desi(des):
         case 1:
             conn = sqlite3.connect("RobberDB.db")
             Urlvar= input("Would you like to change the id number (this modify the starting point, if is 1st time then set it to 0): ")
+            template= input("Discussion URL template with {id} (leave empty for AWS CLF-C02): ").strip() or SCAN_URL_TEMPLATE
             while fail<99:
                 Urlvar=str(Urlvar)
-                url = f"https://www.examtopics.com/discussions/amazon/view/{Urlvar}-exam-aws-certified-cloud-practitioner-clf-c02-topic-1/"
+                url = template.format(id=Urlvar)
                 sleep= round(random.uniform(1,3),2)
                 time.sleep(sleep)
                 Waiting= Waiting + sleep
@@ -1,8 +1,30 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
-from queue import Queue
-from Robber_logic import RobberLogic
+import os
+import re
+import logging
+from logging.handlers import RotatingFileHandler
+from collections import deque
+from Robber_logic import RobberLogic, SCAN_URL_TEMPLATE
+from Robber_scheduler import CrawlTarget
+
+LOG_MAX_LINES = 2000                # Lines kept in the on-screen log
+LOG_FILE = "RobberLog.txt"          # Full log, rotated at LOG_FILE_BYTES
+LOG_FILE_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+METRICS_OPERATIONS = ("probe", "download", "write", "db_commit")   # Latency rows in the metrics panel
+
+def get_file_logger():
+    """Logger that spills every scraper message to a rotating file."""
+    logger = logging.getLogger("robber")
+    if not logger.handlers:
+        handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
 
 class RobberGUI:
     def __init__(self, master):
@@ -11,8 +33,15 @@ class RobberGUI:
         self.top.geometry("800x600")
 
         self.robber_logic = RobberLogic()
-        self.message_queue = Queue()
+        # Ring buffer between workers and the GUI: when the GUI falls behind, the
+        # oldest lines are dropped here (they are still in LOG_FILE)
+        self.message_queue = deque(maxlen=LOG_MAX_LINES)
+        self.dropped_messages = 0
+        self.message_lock = threading.Lock()    # Guards message_queue and dropped_messages together
+        self.file_logger = get_file_logger()
         self.worker_thread = None
+        self.ticks = 0
+        self.last_metrics = None
 
         self.create_widgets()
         self.top.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -35,6 +64,8 @@ class RobberGUI:
         scan_radio.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
         download_radio = ttk.Radiobutton(controls_frame, text="Download from links", variable=self.mode, value="download", command=self.toggle_controls)
         download_radio.grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
+        targets_radio = ttk.Radiobutton(controls_frame, text="Crawl targets", variable=self.mode, value="targets", command=self.toggle_controls)
+        targets_radio.grid(row=0, column=3, padx=5, pady=5, sticky=tk.W)
 
         # --- Scan Controls ---
         self.scan_frame = ttk.Frame(controls_frame)
@@ -47,9 +78,65 @@ class RobberGUI:
         # --- Download Controls ---
         self.download_frame = ttk.Frame(controls_frame)
         self.download_frame.grid(row=2, column=0, columnspan=3, padx=5, pady=5, sticky=tk.W)
-        ttk.Label(self.download_frame, text="Keyword:").pack(side=tk.LEFT, padx=5)
-        self.keyword_entry = ttk.Entry(self.download_frame, width=40)
+        keyword_row = ttk.Frame(self.download_frame)
+        keyword_row.pack(fill=tk.X)
+        ttk.Label(keyword_row, text="Keyword:").pack(side=tk.LEFT, padx=5)
+        self.keyword_entry = ttk.Entry(keyword_row, width=40)
         self.keyword_entry.pack(side=tk.LEFT, padx=5)
+        self.direct_exam_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(keyword_row, text="Build exam directly", variable=self.direct_exam_var).pack(side=tk.LEFT, padx=5)
+        self.offline_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(keyword_row, text="Offline (replay cache)", variable=self.offline_var).pack(side=tk.LEFT, padx=5)
+
+        # Storage of the downloaded pages
+        storage_row = ttk.Frame(self.download_frame)
+        storage_row.pack(fill=tk.X, pady=(5, 0))
+        self.archive_html_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(storage_row, text="Keep raw HTML", variable=self.archive_html_var).pack(side=tk.LEFT, padx=5)
+        self.assets_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(storage_row, text="Save images", variable=self.assets_var).pack(side=tk.LEFT, padx=5)
+        self.compress_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(storage_row, text="Compress pages (.gz)", variable=self.compress_var).pack(side=tk.LEFT, padx=5)
+        self.prune_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(storage_row, text="Keep only question cards", variable=self.prune_var).pack(side=tk.LEFT, padx=5)
+
+        # --- Crawl Target Controls ---
+        self.targets_frame = ttk.Frame(controls_frame)
+        self.targets_frame.grid(row=3, column=0, columnspan=4, padx=5, pady=5, sticky=tk.EW)
+        self.targets_frame.columnconfigure(1, weight=1)
+        columns = ("name", "range", "next_id", "probes", "hits", "status")
+        self.targets_tree = ttk.Treeview(self.targets_frame, columns=columns, show="headings", height=4)
+        for col, width in zip(columns, (140, 120, 80, 70, 60, 80)):
+            self.targets_tree.heading(col, text=col.replace("_", " ").title())
+            self.targets_tree.column(col, width=width, anchor=tk.W)
+        self.targets_tree.grid(row=0, column=0, columnspan=4, sticky=tk.EW, pady=5)
+
+        ttk.Label(self.targets_frame, text="Name:").grid(row=1, column=0, sticky=tk.W)
+        self.target_name_entry = ttk.Entry(self.targets_frame, width=20)
+        self.target_name_entry.grid(row=1, column=1, sticky=tk.W, padx=5)
+        ttk.Label(self.targets_frame, text="Start/End ID:").grid(row=1, column=2, sticky=tk.W)
+        range_frame = ttk.Frame(self.targets_frame)
+        range_frame.grid(row=1, column=3, sticky=tk.W)
+        self.target_start_entry = ttk.Entry(range_frame, width=10)
+        self.target_start_entry.pack(side=tk.LEFT)
+        self.target_start_entry.insert(0, "0")
+        self.target_end_entry = ttk.Entry(range_frame, width=10)
+        self.target_end_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(self.targets_frame, text="URL template:").grid(row=2, column=0, sticky=tk.W)
+        self.target_url_entry = ttk.Entry(self.targets_frame)
+        self.target_url_entry.grid(row=2, column=1, columnspan=3, sticky=tk.EW, padx=5, pady=2)
+        self.target_url_entry.insert(0, SCAN_URL_TEMPLATE)
+
+        target_buttons = ttk.Frame(self.targets_frame)
+        target_buttons.grid(row=3, column=0, columnspan=4, sticky=tk.W, pady=5)
+        ttk.Button(target_buttons, text="Add/Update", command=self.add_target).pack(side=tk.LEFT, padx=5)
+        ttk.Button(target_buttons, text="Remove", command=self.remove_target).pack(side=tk.LEFT, padx=5)
+        ttk.Button(target_buttons, text="Start selected", command=self.start_selected_targets).pack(side=tk.LEFT, padx=5)
+        ttk.Button(target_buttons, text="Stop selected", command=self.stop_selected_targets).pack(side=tk.LEFT, padx=5)
+        ttk.Label(target_buttons, text="Requests/s (all targets):").pack(side=tk.LEFT, padx=5)
+        self.rate_var = tk.StringVar(value=str(self.robber_logic.scheduler.budget.rate))
+        ttk.Entry(target_buttons, textvariable=self.rate_var, width=6).pack(side=tk.LEFT)
+        self.refresh_targets()
 
         # --- Action Buttons ---
         buttons_frame = ttk.Frame(main_frame)
@@ -59,6 +146,28 @@ class RobberGUI:
         self.stop_button = ttk.Button(buttons_frame, text="Stop", command=self.stop_operation, state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=5)
 
+        # --- Pipeline Throughput ---
+        stats_frame = ttk.LabelFrame(main_frame, text="Download pipeline", padding="10")
+        stats_frame.pack(fill=tk.X, pady=5)
+        self.stage_labels = {}
+        for col, stage in enumerate(("fetch", "rewrite", "images", "write")):
+            label = ttk.Label(stats_frame, text=f"{stage}: idle", width=24)
+            label.grid(row=0, column=col, padx=5, sticky=tk.W)
+            self.stage_labels[stage] = label
+
+        # --- Live Metrics ---
+        metrics_frame = ttk.LabelFrame(main_frame, text="Metrics", padding="10")
+        metrics_frame.pack(fill=tk.X, pady=5)
+        metrics_frame.columnconfigure(0, weight=1)
+        self.metrics_label = ttk.Label(metrics_frame, text="No requests yet.", font=("Courier", 9), justify=tk.LEFT)
+        self.metrics_label.grid(row=0, column=0, rowspan=3, sticky=tk.W)
+        ttk.Button(metrics_frame, text="Export snapshot...", command=self.export_metrics).grid(row=0, column=1, columnspan=2, padx=5, sticky=tk.EW)
+        self.auto_export_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(metrics_frame, text="Auto-export every (s):", variable=self.auto_export_var,
+                        command=self.toggle_auto_export).grid(row=1, column=1, padx=5, sticky=tk.W)
+        self.export_interval_var = tk.StringVar(value="60")
+        ttk.Entry(metrics_frame, textvariable=self.export_interval_var, width=6).grid(row=1, column=2, sticky=tk.W)
+
         # --- Log Viewer ---
         log_frame = ttk.LabelFrame(main_frame, text="Log", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -68,26 +177,164 @@ class RobberGUI:
         self.toggle_controls()
 
     def toggle_controls(self):
-        if self.mode.get() == "scan":
-            self.scan_frame.grid()
-            self.download_frame.grid_remove()
-        else:
-            self.scan_frame.grid_remove()
-            self.download_frame.grid()
+        mode = self.mode.get()
+        for frame, frame_mode in ((self.scan_frame, "scan"), (self.download_frame, "download"), (self.targets_frame, "targets")):
+            if mode == frame_mode:
+                frame.grid()
+            else:
+                frame.grid_remove()
+        # Targets are started and stopped from their own buttons
+        busy = self.worker_thread is not None and self.worker_thread.is_alive()
+        self.start_button.config(state=tk.DISABLED if mode == "targets" or busy else tk.NORMAL)
+
+    def refresh_targets(self):
+        selected = set(self.targets_tree.selection())
+        self.targets_tree.delete(*self.targets_tree.get_children())
+        for target in self.robber_logic.scheduler.targets():
+            end = target["end_id"] if target["end_id"] is not None else "..."
+            self.targets_tree.insert("", tk.END, iid=target["name"], values=(
+                target["name"], f"{target['start_id']}-{end}", target["next_id"],
+                target["probes"], target["hits"], target["status"]
+            ))
+        self.targets_tree.selection_set([iid for iid in selected if self.targets_tree.exists(iid)])
+
+    def add_target(self):
+        try:
+            target = CrawlTarget(
+                self.target_name_entry.get().strip(),
+                self.target_url_entry.get().strip(),
+                self.target_start_entry.get().strip() or 0,
+                self.target_end_entry.get().strip() or None,
+            )
+            if not target.name:
+                raise ValueError("Target name is required")
+        except ValueError as e:
+            messagebox.showerror("Invalid target", str(e), parent=self.top)
+            return
+        self.robber_logic.scheduler.add_target(target)
+        self.refresh_targets()
+
+    def remove_target(self):
+        for name in self.targets_tree.selection():
+            self.robber_logic.scheduler.remove_target(name)
+        self.refresh_targets()
+
+    def start_selected_targets(self):
+        try:
+            rate = float(self.rate_var.get())
+            if rate <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid rate", "Requests per second must be a positive number.", parent=self.top)
+            return
+        self.robber_logic.scheduler.budget.rate = rate
+        for name in self.targets_tree.selection():
+            self.robber_logic.scheduler.start_target(name, self.queue_update)
+        self.refresh_targets()
+
+    def stop_selected_targets(self):
+        for name in self.targets_tree.selection():
+            self.robber_logic.scheduler.stop_target(name)
 
-    def update_log(self, message):
+    def update_log(self, messages):
+        """Append a batch of lines in one widget update, keeping at most LOG_MAX_LINES."""
         self.log_area.config(state=tk.NORMAL)
-        self.log_area.insert(tk.END, message + "\n")
+        self.log_area.insert(tk.END, "\n".join(messages) + "\n")
+        line_count = int(self.log_area.index("end-1c").split(".")[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self.log_area.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
         self.log_area.see(tk.END)
         self.log_area.config(state=tk.DISABLED)
 
+    def update_stage_stats(self):
+        for stats in self.robber_logic.pipeline_stats():
+            self.stage_labels[stats["stage"]].config(
+                text=f"{stats['stage']} x{stats['workers']}: {stats['processed']} ok, "
+                     f"{stats['failed']} failed, {stats['rate']:.1f}/s, queued {stats['queued']}"
+            )
+
+    def update_metrics(self):
+        """Show live rates (since the previous refresh) and latency percentiles per operation."""
+        snapshot = self.robber_logic.metrics_snapshot()
+        previous, self.last_metrics = self.last_metrics, snapshot
+        if previous is None:
+            return
+        interval = max(snapshot["timestamp"] - previous["timestamp"], 1e-9)
+        counters = {name: c["total"] for name, c in snapshot["counters"].items()}
+        old_counters = {name: c["total"] for name, c in previous["counters"].items()}
+        rate = lambda name: (counters.get(name, 0) - old_counters.get(name, 0)) / interval
+
+        lines = []
+        for operation in METRICS_OPERATIONS:
+            latency = snapshot["latency"].get(operation)
+            if latency is None:
+                continue
+            old_count = previous["latency"].get(operation, {}).get("count", 0)
+            lines.append(
+                f"{operation:<9} {latency['count']:>7} total {(latency['count'] - old_count) / interval:>6.1f}/s  "
+                f"p50 {latency['p50'] * 1000:>6.0f}ms  p90 {latency['p90'] * 1000:>6.0f}ms  p99 {latency['p99'] * 1000:>6.0f}ms"
+            )
+        if not lines:
+            return
+        lines.append(
+            f"bytes     download {rate('download.bytes') / 1024:.0f} KB/s, write {rate('write.bytes') / 1024:.0f} KB/s"
+        )
+        errors = [f"{name[len('errors.'):]} {total}" for name, total in counters.items() if name.startswith("errors.")]
+        lines.append("errors    " + (", ".join(errors) if errors else "none"))
+        self.metrics_label.config(text="\n".join(lines))
+
+    def export_metrics(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.top, title="Export metrics snapshot", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV (appends a row per metric)", "*.csv")]
+        )
+        if not path:
+            return None
+        try:
+            self.robber_logic.metrics.export(path)
+        except OSError as e:
+            messagebox.showerror("Export failed", str(e), parent=self.top)
+            return None
+        self.queue_update(f"Metrics snapshot saved to {path}")
+        return path
+
+    def toggle_auto_export(self):
+        if not self.auto_export_var.get():
+            self.robber_logic.metrics.stop_periodic_export()
+            return
+        try:
+            interval = float(self.export_interval_var.get())
+            if interval <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid interval", "The export interval must be a positive number of seconds.", parent=self.top)
+            self.auto_export_var.set(False)
+            return
+        path = self.export_metrics()
+        if path is None:
+            self.auto_export_var.set(False)
+            return
+        self.robber_logic.metrics.start_periodic_export(path, interval)
+        self.queue_update(f"Exporting metrics to {path} every {interval:g}s")
+
     def process_queue(self):
         try:
-            message = self.message_queue.get_nowait()
-            self.update_log(message)
-        except Exception:
-            pass
+            # Drain everything queued since the last tick
+            with self.message_lock:
+                batch = list(self.message_queue)
+                self.message_queue.clear()
+                dropped, self.dropped_messages = self.dropped_messages, 0
+            if dropped:
+                batch.insert(0, f"... {dropped} older lines not shown, see {LOG_FILE}")
+            if batch:
+                self.update_log(batch)
         finally:
+            self.update_stage_stats()
+            self.ticks += 1
+            if self.ticks % 10 == 0:
+                self.update_metrics()
+                if self.mode.get() == "targets":
+                    self.refresh_targets()
             self.top.after(100, self.process_queue)
 
     def start_operation(self):
@@ -107,9 +354,17 @@ class RobberGUI:
             )
         else: # download
             keyword = self.keyword_entry.get()
+            exam_path = None
+            if self.direct_exam_var.get():
+                safe_keyword = re.sub(r'[\\/*?:"<>|]', "_", keyword.strip()) or "Robbed"
+                exam_path = os.path.join("exams", f"{safe_keyword}.json")
             self.worker_thread = threading.Thread(
                 target=self.robber_logic.start_downloading,
-                args=(keyword, self.queue_update)
+                args=(keyword, self.queue_update),
+                kwargs={"exam_path": exam_path, "archive_html": self.archive_html_var.get(),
+                        "offline": self.offline_var.get(), "download_assets": self.assets_var.get(),
+                        "page_compression": "gz" if self.compress_var.get() else None,
+                        "prune_pages": self.prune_var.get()}
             )
         
         self.worker_thread.start()
@@ -121,18 +376,26 @@ class RobberGUI:
             self.stop_button.config(state=tk.DISABLED)
 
     def queue_update(self, message):
-        self.message_queue.put(message)
+        self.file_logger.info(message)
+        with self.message_lock:
+            if len(self.message_queue) == self.message_queue.maxlen:
+                self.dropped_messages += 1
+            self.message_queue.append(message)
 
     def check_thread(self):
         if self.worker_thread and self.worker_thread.is_alive():
             self.top.after(100, self.check_thread)
         else:
-            self.start_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
+            self.toggle_controls()
             if not self.robber_logic.stop_event.is_set():
                 self.queue_update("-----Operation finished.-----")
 
     def on_closing(self):
+        if self.robber_logic.scheduler.any_running():
+            self.robber_logic.scheduler.stop_all()
+            self.top.after(100, self.on_closing)
+            return
         if self.worker_thread and self.worker_thread.is_alive():
             self.stop_operation()
             # Wait a moment for the thread to acknowledge the stop signal
@@ -0,0 +1,137 @@
+import os
+import hashlib
+import mimetypes
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+
+class AssetStore:
+    """
+    Shared store for question and answer images of downloaded pages.
+    Files live under root named by the SHA-256 of their content, and the assets
+    table maps every source URL to its file. A URL is fetched at most once
+    (also when several pages ask for it at the same time) and identical images
+    behind different URLs are stored once.
+    db is a Robber_db.Database.
+    """
+    def __init__(self, db, headers, root=os.path.join("Robbed", "_assets"), workers=8):
+        self.db = db
+        self.headers = headers
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.in_flight = {}     # url -> Future, for fetches that haven't finished yet
+        self.stored = {}        # url -> path, for downloads whose row may not be committed yet
+        self.lock = threading.Lock()
+        self.db.write("""
+        CREATE TABLE IF NOT EXISTS assets (
+            url TEXT PRIMARY KEY,
+            content_hash TEXT NOT NULL,
+            path TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """).result()
+
+    def _known_path(self, url):
+        row = self.db.read_one("SELECT path FROM assets WHERE url = ?", (url,))
+        if row is None and url in self.stored:
+            row = (self.stored[url],)
+        if row and os.path.exists(row[0]):
+            return row[0]
+        return None
+
+    def _download(self, url):
+        """Fetch url into the store. Returns (path, fetched) or (None, False) on failure."""
+        path = self._known_path(url)
+        if path:
+            return path, False
+        try:
+            response = requests.get(url, headers=self.headers, timeout=10)
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            return None, False
+        data = response.content
+        content_hash = hashlib.sha256(data).hexdigest()
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if not ext or len(ext) > 5:
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+            ext = mimetypes.guess_extension(content_type) or ".img"
+        path = os.path.join(self.root, content_hash[:2], content_hash + ext)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.part"
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        self.stored[url] = path
+        self.db.write(
+            "INSERT OR REPLACE INTO assets (url, content_hash, path) VALUES (?, ?, ?)",
+            (url, content_hash, path)
+        )
+        return path, True
+
+    def fetch(self, url):
+        """Return a Future resolving to (path, fetched) for url, sharing in-flight downloads."""
+        with self.lock:
+            future = self.in_flight.get(url)
+            if future is not None:
+                return future
+            future = self.in_flight[url] = self.executor.submit(self._download, url)
+        # Outside the lock: a download that already finished runs the callback right here
+        future.add_done_callback(lambda done, url=url: self._forget(url, done))
+        return future
+
+    def _forget(self, url, future):
+        with self.lock:
+            if self.in_flight.get(url) is future:
+                del self.in_flight[url]
+
+    def start(self, soup, offline=False):
+        """
+        Start downloading every image inside the page's question cards, without
+        waiting. With offline=True only images already in the store are used.
+        Returns the pending downloads, for finish().
+        """
+        images = []
+        for card in soup.find_all("div", attrs={"class": "card exam-question-card"}):
+            images.extend(img for img in card.find_all("img") if img.get("src", "").startswith(("http://", "https://")))
+        futures = {}
+        for url in {img["src"] for img in images}:
+            if offline:
+                futures[url] = Future()
+                futures[url].set_result((self._known_path(url), False))
+            else:
+                futures[url] = self.fetch(url)
+        return images, futures
+
+    def finish(self, pending, page_folder):
+        """
+        Wait for the downloads of start() and point the images' src at the
+        local copies, relative to page_folder.
+        Returns (images fetched now, images already in the store, failures).
+        """
+        images, futures = pending
+        results = {url: future.result() for url, future in futures.items()}
+
+        fetched = reused = failed = 0
+        local = {}
+        for url, (path, was_fetched) in results.items():
+            if path is None:
+                failed += 1
+                continue
+            local[url] = os.path.relpath(path, page_folder).replace(os.sep, "/")
+            if was_fetched:
+                fetched += 1
+            else:
+                reused += 1
+        for img in images:
+            if img["src"] in local:
+                img["src"] = local[img["src"]]
+        return fetched, reused, failed
+
+    def localize(self, soup, page_folder, offline=False):
+        """start() and finish() in one call."""
+        return self.finish(self.start(soup, offline), page_folder)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
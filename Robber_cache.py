@@ -0,0 +1,140 @@
+import os
+import gzip
+import hashlib
+import threading
+import time
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache for the scraper.
+    Metadata (ETag, Last-Modified, content hash, size) lives in the http_cache
+    table next to the other Robber tables; bodies are gzip files under cache_dir
+    named by their SHA-256, so identical pages share one file.
+    Once the stored bodies exceed max_bytes the least recently used entries are evicted.
+    db is a Robber_db.Database; table updates are queued on its writer thread.
+    """
+    def __init__(self, db, cache_dir="RobberCache", max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()    # guards total_bytes, pending and the body files
+        self.pending = {}               # content_hash -> stores whose row isn't written yet
+        self.db = db
+        self.db.write("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            final_url TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL,
+            last_access REAL
+        )
+        """).result()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = self._stored_bytes()
+
+    def _stored_bytes(self):
+        row = self.db.read_one("SELECT SUM(size) FROM (SELECT DISTINCT content_hash, size FROM http_cache)")
+        return row[0] or 0
+
+    def _body_path(self, content_hash):
+        return os.path.join(self.cache_dir, content_hash[:2], content_hash + ".gz")
+
+    def lookup(self, url):
+        """Return the cache entry for url as a dict, or None."""
+        row = self.db.read_one(
+            "SELECT url, final_url, etag, last_modified, content_hash, size FROM http_cache WHERE url = ?",
+            (url,)
+        )
+        if not row:
+            return None
+        keys = ("url", "final_url", "etag", "last_modified", "content_hash", "size")
+        return dict(zip(keys, row))
+
+    def conditional_headers(self, entry):
+        """Validators to send with a re-download of a cached URL."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load_body(self, entry):
+        """Return the cached body text, or None if the file has gone missing."""
+        try:
+            with gzip.open(self._body_path(entry["content_hash"]), "rt", encoding="utf-8") as fh:
+                body = fh.read()
+        except OSError:
+            return None
+        self.touch(entry["url"])
+        return body
+
+    def touch(self, url):
+        self.db.write("UPDATE http_cache SET last_access = ? WHERE url = ?", (time.time(), url))
+
+    def store(self, url, final_url, body, etag=None, last_modified=None):
+        """
+        Save a fresh response. Returns True when the content differs from what
+        was cached for url before (or nothing was cached). The body file is
+        written right away; the table update and any eviction are queued.
+        """
+        data = body.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._body_path(content_hash)
+        now = time.time()
+        previous = self.db.read_one("SELECT content_hash FROM http_cache WHERE url = ?", (url,))
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with gzip.open(path, "wb", compresslevel=6) as fh:
+                    fh.write(data)
+                self.total_bytes += os.path.getsize(path)
+            size = os.path.getsize(path)
+            self.pending[content_hash] = self.pending.get(content_hash, 0) + 1
+
+        def update(conn):
+            # Runs on the writer thread, so it sees every earlier queued write
+            old = conn.execute("SELECT content_hash FROM http_cache WHERE url = ?", (url,)).fetchone()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (url, final_url, etag, last_modified, content_hash, size, fetched_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, final_url, etag, last_modified, content_hash, size, now, now)
+                )
+            finally:
+                with self.lock:
+                    self.pending[content_hash] -= 1
+                    if not self.pending[content_hash]:
+                        del self.pending[content_hash]
+            if old and old[0] != content_hash:
+                self._drop_body_if_unused(conn, old[0])
+            if self.total_bytes > self.max_bytes:
+                self._evict(conn)
+        self.db.transaction(update)
+        return previous is None or previous[0] != content_hash
+
+    def _drop_body_if_unused(self, conn, content_hash):
+        in_use = conn.execute("SELECT 1 FROM http_cache WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+        if in_use:
+            return
+        path = self._body_path(content_hash)
+        with self.lock:
+            if content_hash not in self.pending and os.path.exists(path):
+                self.total_bytes -= os.path.getsize(path)
+                os.remove(path)
+
+    def _evict(self, conn):
+        # Least recently used first, down to 90% of the budget so we don't evict on every store
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT url, content_hash FROM http_cache ORDER BY last_access ASC").fetchall()
+        for url, content_hash in rows:
+            if self.total_bytes <= target:
+                break
+            conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self._drop_body_if_unused(conn, content_hash)
+
+    def close(self):
+        """Wait for queued cache updates; the Database itself is closed by its owner."""
+        self.db.flush()
@@ -0,0 +1,156 @@
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+_memory_ids = itertools.count()
+
+class Database:
+    """
+    SQLite access shared by the scan, download and crawl threads.
+    Every write goes through a queue to one writer thread, which owns the only
+    writing connection and commits whatever has piled up in a single transaction,
+    so callers never wait for a commit unless they ask to. Reads use a separate
+    connection per thread; WAL mode lets them run while the writer commits.
+    Reads see committed data only: call flush() first to read your own writes.
+    """
+    def __init__(self, path, batch_size=200, on_commit=None, on_error=None):
+        if path == ":memory:":
+            # Per-thread connections must all see the same in-memory database
+            self.path, self.uri = f"file:robberdb{next(_memory_ids)}?mode=memory&cache=shared", True
+        else:
+            self.path, self.uri = path, False
+        self.batch_size = batch_size
+        self.on_commit = on_commit      # called with the seconds each commit took
+        self.on_error = on_error        # called with a description of each failed write
+        self.local = threading.local()
+        self.readers = []
+        self.readers_lock = threading.Lock()
+        self.queue = queue.Queue()
+
+        self.writer_conn = self._connect()
+        self.writer_conn.isolation_level = None     # transactions are managed explicitly below
+        self.writer_conn.execute("PRAGMA journal_mode=WAL")
+        self.writer_conn.execute("PRAGMA synchronous=NORMAL")
+        self.writer = threading.Thread(target=self._write_loop, name="robber-db-writer", daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, uri=self.uri, check_same_thread=False, timeout=30)
+
+    # --- Reads ---
+
+    def _reader(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self._connect()
+            if self.uri:
+                # Shared-cache memory databases lock whole tables; don't wait on the writer's
+                conn.execute("PRAGMA read_uncommitted=1")
+            with self.readers_lock:
+                self.readers.append(conn)
+        return conn
+
+    def read(self, sql, params=()):
+        """All rows of a query, on this thread's own connection."""
+        return self._reader().execute(sql, params).fetchall()
+
+    def read_one(self, sql, params=()):
+        return self._reader().execute(sql, params).fetchone()
+
+    def release_reader(self):
+        """Close this thread's read connection, if it has one. Call it before a thread that read ends."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            return
+        self.local.conn = None
+        with self.readers_lock:
+            self.readers.remove(conn)
+        conn.close()
+
+    # --- Writes ---
+
+    def write(self, sql, params=()):
+        """Queue one statement. Returns a Future with its rowcount, set once committed."""
+        return self._submit(lambda conn: conn.execute(sql, params).rowcount, sql)
+
+    def write_many(self, sql, seq_of_params):
+        return self._submit(lambda conn: conn.executemany(sql, list(seq_of_params)).rowcount, sql)
+
+    def transaction(self, fn):
+        """
+        Queue fn(conn) to run on the writer thread, atomically and after every
+        write queued before it. Use it for read-modify-write steps. Returns a
+        Future with fn's result, set once committed.
+        """
+        return self._submit(fn, getattr(fn, "__name__", "transaction"))
+
+    def _submit(self, fn, description):
+        future = Future()
+        self.queue.put((fn, description, future))
+        return future
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        self.transaction(lambda conn: None).result()
+
+    def _write_loop(self):
+        conn = self.writer_conn
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            batch = [item for item in batch if item is not _STOP]
+            if batch:
+                self._run_batch(conn, batch)
+            if stop:
+                break
+        conn.close()
+
+    def _run_batch(self, conn, batch):
+        results = []
+        conn.execute("BEGIN")
+        for fn, description, future in batch:
+            # Each item gets a savepoint so a failing statement doesn't undo the rest of the batch
+            conn.execute("SAVEPOINT item")
+            try:
+                results.append((future, fn(conn), None))
+                conn.execute("RELEASE item")
+            except Exception as e:
+                conn.execute("ROLLBACK TO item")
+                conn.execute("RELEASE item")
+                results.append((future, None, e))
+                if self.on_error:
+                    self.on_error(f"Database write failed ({description.strip().splitlines()[0]}): {e}")
+        started = time.perf_counter()
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            if self.on_error:
+                self.on_error(f"Database commit failed: {e}")
+            results = [(future, None, e) for future, _, _ in results]
+        if self.on_commit:
+            self.on_commit(time.perf_counter() - started)
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def close(self):
+        """Commit what is queued, stop the writer and close every connection."""
+        if self.writer.is_alive():
+            self.queue.put(_STOP)
+            self.writer.join()
+        with self.readers_lock:
+            for conn in self.readers:
+                conn.close()
+            self.readers.clear()
@@ -0,0 +1,253 @@
+class IdBitmap:
+    """
+    Compact record of which discussion IDs were probed and which were hits.
+    IDs are grouped in chunks of CHUNK_BITS; each chunk is two bit arrays
+    (probed, hit) stored as BLOBs in the id_bitmap table, one row per chunk.
+    db is a Robber_db.Database.
+    """
+    CHUNK_BITS = 8192
+
+    def __init__(self, db, target="default"):
+        self.db = db
+        self.target = target
+        self.chunks = {}
+        self.dirty = set()
+        self.db.write("""
+        CREATE TABLE IF NOT EXISTS id_bitmap (
+            target TEXT NOT NULL,
+            chunk INTEGER NOT NULL,
+            probed BLOB NOT NULL,
+            hit BLOB NOT NULL,
+            PRIMARY KEY (target, chunk)
+        )
+        """)
+        # Gallop gaps whose backfill was started but not finished
+        self.db.write("""
+        CREATE TABLE IF NOT EXISTS id_backfill (
+            target TEXT NOT NULL,
+            lo INTEGER NOT NULL,
+            hi INTEGER NOT NULL,
+            PRIMARY KEY (target, lo)
+        )
+        """).result()
+
+    def _chunk(self, chunk_no):
+        chunk = self.chunks.get(chunk_no)
+        if chunk is None:
+            row = self.db.read_one(
+                "SELECT probed, hit FROM id_bitmap WHERE target = ? AND chunk = ?", (self.target, chunk_no)
+            )
+            size = self.CHUNK_BITS // 8
+            chunk = (bytearray(row[0]), bytearray(row[1])) if row else (bytearray(size), bytearray(size))
+            self.chunks[chunk_no] = chunk
+        return chunk
+
+    def _locate(self, id_):
+        chunk_no, bit = divmod(id_, self.CHUNK_BITS)
+        return self._chunk(chunk_no), bit >> 3, 1 << (bit & 7), chunk_no
+
+    def mark(self, id_, hit):
+        (probed, hits), byte, mask, chunk_no = self._locate(id_)
+        probed[byte] |= mask
+        if hit:
+            hits[byte] |= mask
+        else:
+            hits[byte] &= ~mask
+        self.dirty.add(chunk_no)
+
+    def is_probed(self, id_):
+        (probed, _), byte, mask, _ = self._locate(id_)
+        return bool(probed[byte] & mask)
+
+    def is_hit(self, id_):
+        (_, hits), byte, mask, _ = self._locate(id_)
+        return bool(hits[byte] & mask)
+
+    def max_probed(self):
+        """Highest probed ID for this target, or None if nothing was probed yet."""
+        rows = self.db.read("SELECT chunk FROM id_bitmap WHERE target = ?", (self.target,))
+        chunk_numbers = sorted({r[0] for r in rows} | set(self.chunks), reverse=True)
+        for chunk_no in chunk_numbers:
+            probed = self._chunk(chunk_no)[0]
+            for byte in range(len(probed) - 1, -1, -1):
+                if probed[byte]:
+                    return chunk_no * self.CHUNK_BITS + byte * 8 + probed[byte].bit_length() - 1
+        return None
+
+    def add_backfill(self, lo, hi):
+        self.db.write("INSERT OR REPLACE INTO id_backfill (target, lo, hi) VALUES (?, ?, ?)", (self.target, lo, hi))
+
+    def remove_backfill(self, lo):
+        self.db.write("DELETE FROM id_backfill WHERE target = ? AND lo = ?", (self.target, lo))
+
+    def pending_backfills(self):
+        """(lo, hi) ranges whose backfill a stopped scan left unfinished."""
+        self.db.flush()
+        return [tuple(r) for r in self.db.read("SELECT lo, hi FROM id_backfill WHERE target = ? ORDER BY lo",
+                                                (self.target,))]
+
+    def counts(self):
+        """Return (probed, hits) over every chunk of this target."""
+        rows = self.db.read("SELECT chunk FROM id_bitmap WHERE target = ?", (self.target,))
+        probed = hits = 0
+        for chunk_no in {r[0] for r in rows} | set(self.chunks):
+            p, h = self._chunk(chunk_no)
+            probed += sum(bin(b).count("1") for b in p)
+            hits += sum(bin(b).count("1") for b in h)
+        return probed, hits
+
+    def clear(self):
+        """Forget everything probed for this target, including pending backfills."""
+        self.chunks.clear()
+        self.dirty.clear()
+        self.db.write("DELETE FROM id_backfill WHERE target = ?", (self.target,))
+        self.db.write("DELETE FROM id_bitmap WHERE target = ?", (self.target,)).result()
+
+    def flush(self, wait=False):
+        """Queue the changed chunks for writing; wait=True blocks until they are committed."""
+        rows = [(self.target, chunk_no, bytes(self.chunks[chunk_no][0]), bytes(self.chunks[chunk_no][1]))
+                for chunk_no in self.dirty]
+        self.dirty.clear()
+        future = self.db.write_many(
+            "INSERT OR REPLACE INTO id_bitmap (target, chunk, probed, hit) VALUES (?, ?, ?, ?)", rows
+        )
+        if wait:
+            future.result()
+
+
+class IdSpaceExplorer:
+    """
+    Walks discussion IDs adaptively instead of one by one.
+
+    Hit density is estimated (exponential moving average) from the IDs probed
+    one by one. From it follows the dead span: how many misses in a row make a
+    region look empty, about five average gaps between hits, so uniformly
+    sparse regions are still walked one by one. Past the dead span the
+    frontier gallops, doubling its stride on every miss. The stride is capped
+    at a quarter of the typical width of the hit clusters seen so far, so a
+    gallop cannot jump clean over a cluster. When a galloping probe lands on a
+    hit, the IDs it jumped over are backfilled from the hit downwards until a
+    dead span of misses shows the cluster has ended. Scanning stops once the
+    frontier is more than max_gap IDs past the last hit, so long dead gaps are
+    crossed in a handful of requests instead of ending the scan.
+
+    IDs already marked in the bitmap are never requested again, so a stopped
+    scan resumes from resume_point() without repeating work. A backfill is
+    recorded in the bitmap's database while it runs, so one cut short by a
+    stop is finished first when the scan resumes.
+    """
+    def __init__(self, bitmap, max_stride=256, max_gap=20000, min_dead_span=8, max_dead_span=1000, flush_every=50):
+        self.bitmap = bitmap
+        self.max_stride = max_stride
+        self.max_gap = max_gap
+        self.min_dead_span = min_dead_span
+        self.max_dead_span = max_dead_span
+        self.flush_every = flush_every
+        # Start pessimistic: a low prior means a long dead span until real hits are seen
+        self.density = 0.05
+        self.cluster_width = None
+        self.requests = 0
+        self.hits = 0
+
+    def resume_point(self, default=0):
+        last = self.bitmap.max_probed()
+        return last + 1 if last is not None else default
+
+    def dead_span(self):
+        """Misses in a row after which the region counts as empty."""
+        span = int(5 / max(self.density, 0.001))
+        return max(self.min_dead_span, min(self.max_dead_span, span))
+
+    def stride_cap(self):
+        if self.cluster_width is None:
+            return self.max_stride
+        return max(1, min(self.max_stride, int(self.cluster_width // 4)))
+
+    def _record_cluster(self, width):
+        if self.cluster_width is None:
+            self.cluster_width = float(width)
+        else:
+            self.cluster_width = 0.7 * self.cluster_width + 0.3 * width
+
+    def _probe(self, id_, probe, linear):
+        if self.bitmap.is_probed(id_):
+            return self.bitmap.is_hit(id_)
+        result = probe(id_)
+        self.requests += 1
+        if result is None:
+            # Inconclusive (e.g. a timeout): treat as a miss but keep it unprobed
+            return False
+        hit = bool(result)
+        self.bitmap.mark(id_, hit)
+        self.hits += hit
+        # Gallop probes are deliberately spread out and would understate the density
+        if linear:
+            self.density = 0.95 * self.density + 0.05 * (1.0 if hit else 0.0)
+        if self.requests % self.flush_every == 0:
+            self.bitmap.flush()
+        return hit
+
+    def _backfill(self, lo, hi, probe, should_stop):
+        """Probe hi down to lo until a dead span of misses. Returns the lowest hit, or None."""
+        self.bitmap.add_backfill(lo, hi)
+        lowest = None
+        misses = 0
+        id_ = hi
+        while id_ >= lo and misses < self.dead_span() and not should_stop():
+            if self._probe(id_, probe, linear=True):
+                lowest = id_
+                misses = 0
+            else:
+                misses += 1
+            id_ -= 1
+        if id_ < lo or misses >= self.dead_span():
+            self.bitmap.remove_backfill(lo)
+        return lowest
+
+    def run(self, start_id, probe, should_stop=lambda: False, end_id=None):
+        """
+        Explore from start_id. probe(id) performs one request and returns
+        True (page exists), False (no page) or None (inconclusive).
+        Returns (requests made, hits found) for this run.
+        """
+        self.requests = self.hits = 0
+        frontier = int(start_id)
+        stride = 1
+        misses = 0
+        last_hit = frontier - 1
+        prev_frontier = frontier - 1
+        cluster_start = None
+
+        try:
+            for lo, hi in self.bitmap.pending_backfills():
+                if should_stop():
+                    break
+                self._backfill(lo, hi, probe, should_stop)
+            while not should_stop():
+                if end_id is not None and frontier > end_id:
+                    break
+                if frontier - last_hit > self.max_gap:
+                    break
+
+                if self._probe(frontier, probe, linear=stride == 1):
+                    if cluster_start is None:
+                        cluster_start = frontier
+                    if stride > 1:
+                        lowest = self._backfill(prev_frontier + 1, frontier - 1, probe, should_stop)
+                        if lowest is not None:
+                            cluster_start = lowest
+                    last_hit = frontier
+                    stride = 1
+                    misses = 0
+                else:
+                    misses += 1
+                    if misses >= self.dead_span():
+                        if cluster_start is not None:
+                            self._record_cluster(last_hit - cluster_start + 1)
+                            cluster_start = None
+                        stride = min(stride * 2, self.stride_cap())
+                prev_frontier = frontier
+                frontier += stride
+        finally:
+            self.bitmap.flush(wait=True)
+        return self.requests, self.hits
@@ -5,34 +5,88 @@ import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import re
-import sqlite3
 import datetime
 import threading
+from Robber_pipeline import DownloadPipeline
+from parse_html import parse_cards_from_soup, prune_soup
+from exam_io import ExamStreamWriter
+from Robber_cache import ResponseCache
+from Robber_explorer import IdBitmap, IdSpaceExplorer
+from Robber_scheduler import CrawlScheduler
+from Robber_assets import AssetStore
+from Robber_metrics import Metrics
+from Robber_db import Database
+from page_sources import write_page_file
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+}
+
+SCAN_URL_TEMPLATE = "https://www.examtopics.com/discussions/amazon/view/{id}-exam-aws-certified-cloud-practitioner-clf-c02-topic-1/"
 
 class RobberLogic:
-    def __init__(self, db_path="RobberDB.db"):
+    def __init__(self, db_path="RobberDB.db", fetch_workers=4, rewrite_workers=2, image_workers=4, queue_size=8,
+                 cache_dir="RobberCache", cache_max_mb=512, crawl_rate=1.0, scan_delay=(1, 3)):
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.cur = self.conn.cursor()
-        self._initialize_db()
         self.stop_event = threading.Event()
+        self.log_lock = threading.Lock()
+
+        # Counters and latency histograms for probes, downloads, writes and DB commits
+        self.metrics = Metrics()
+
+        # Scan, download and crawl threads all share the DB: writes are queued to
+        # one writer thread, reads use a connection per thread
+        self.db = Database(
+            self.db_path,
+            on_commit=lambda seconds: self.metrics.observe("db_commit", seconds),
+            on_error=self._log_error,
+        )
+        self._initialize_db()
+
+        # Random pause (min, max seconds) before each probe of start_scanning
+        self.scan_delay = scan_delay
+
+        # Download pipeline sizing: per-stage workers and queue bound
+        self.fetch_workers = fetch_workers
+        self.rewrite_workers = rewrite_workers
+        self.image_workers = image_workers
+        self.queue_size = queue_size
+        self.pipeline = None
+
+        # Direct scrape-to-exam mode: set for the duration of one download run
+        self.exam_writer = None
+        self.archive_html = True
+        self.page_compression = None   # "gz" / "xz" saves pages as .html.gz / .html.xz
+        self.prune_pages = False       # keep only the title and question cards of saved pages
+
+        # Response cache: conditional re-downloads and offline replay
+        self.cache = ResponseCache(self.db, cache_dir, max_bytes=cache_max_mb * 1024 * 1024)
+        self.offline = False
+        self.visited = set()
+
+        # Multi-target crawls share one request budget (requests per second)
+        self.scheduler = CrawlScheduler(self, rate=crawl_rate)
+
+        # Images of downloaded pages, fetched concurrently and shared between pages
+        self.assets = AssetStore(self.db, HEADERS)
+        self.download_assets = True
 
     def _initialize_db(self):
-        self.cur.execute("""
+        self.db.write("""
         CREATE TABLE IF NOT EXISTS files (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             filename TEXT UNIQUE,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """)
-        self.cur.execute("""
+        self.db.write("""
         CREATE TABLE IF NOT EXISTS visited_urls(
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             url TEXT UNIQUE,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """)
-        self.cur.execute("""
+        self.db.write("""
         CREATE TABLE IF NOT EXISTS escanned_url (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             title TEXT NOT NULL,
@@ -40,156 +94,385 @@ class RobberLogic:
             dateCreated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """)
-        self.cur.execute("""
+        self.db.write("""
         CREATE TABLE IF NOT EXISTS progress (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             last_number INTEGER,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """)
-        self.conn.commit()
+        self.db.flush()
 
-    def get_last_scan_id(self):
-        self.cur.execute("SELECT last_number FROM progress ORDER BY id DESC LIMIT 1")
-        result = self.cur.fetchone()
+    def get_last_scan_id(self, target="default"):
+        """Where the next scan should start: just past the highest probed ID in the bitmap."""
+        bitmap = IdBitmap(self.db, target)
+        last = bitmap.max_probed()
+        if last is not None:
+            return last + 1
+        # Databases from before the bitmap only know the linear scanner's position
+        result = self.db.read_one("SELECT last_number FROM progress ORDER BY id DESC LIMIT 1")
         return result[0] if result else 0
 
-    def save_html_from_url(self, url, update_callback):
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-        }
+    def _log_error(self, description):
+        now = datetime.datetime.now()
+        with self.log_lock:
+            with open("ErrorLogs.txt", "a") as Log:
+                Log.write(f"-----Error has occurred at {now}, Description: {description} \n")
+
+    def fetch_page(self, url, update_callback):
+        """
+        Download one page. Returns a page dict for rewrite_page, or None on failure.
+        Cached URLs are re-requested with If-None-Match / If-Modified-Since; pages
+        that come back unchanged and were already saved are skipped, unless an exam
+        is being built from them. In offline mode pages only come from the cache.
+        """
+        entry = self.cache.lookup(url)
+        if self.offline:
+            body = self.cache.load_body(entry) if entry else None
+            if body is None:
+                self.metrics.incr("download.cache_misses")
+                update_callback(f"-----Not in cache, skipping: {url}")
+                return None
+            self.metrics.incr("download.cache_hits")
+            return {"url": url, "current_url": entry["final_url"] or url, "text": body}
+
+        headers = dict(HEADERS)
+        headers.update(self.cache.conditional_headers(entry))
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            with self.metrics.timer("download"):
+                response = requests.get(url, headers=headers, timeout=10)
+            if response.status_code == 304 and entry:
+                self.metrics.incr("download.not_modified")
+                if self._skip_unchanged(entry["final_url"] or url):
+                    update_callback(f"Unchanged since last download, skipping: {url}")
+                    return None
+                body = self.cache.load_body(entry)
+                if body is not None:
+                    return {"url": url, "current_url": entry["final_url"] or url, "text": body}
+                # Body was evicted under us: fetch it again unconditionally
+                with self.metrics.timer("download"):
+                    response = requests.get(url, headers=HEADERS, timeout=10)
             response.raise_for_status()
+            self.metrics.incr("download.pages")
+            self.metrics.incr("download.bytes", len(response.content))
+            changed = self.cache.store(
+                url, response.url, response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            if not changed and self._skip_unchanged(response.url):
+                update_callback(f"Unchanged since last download, skipping: {url}")
+                return None
+            return {"url": url, "current_url": response.url, "text": response.text}
+        except requests.exceptions.RequestException as e:
+            self.metrics.record_error(e)
+            update_callback(f"-----An error has occurred during request: {e}")
+            self._log_error(e)
+            return None
 
-            soup = BeautifulSoup(response.text, "html.parser")
-            current_url = response.url
+    def _skip_unchanged(self, current_url):
+        # Only pages that were actually written before can be skipped
+        return self.exam_writer is None and current_url in self.visited
+
+    def load_image(self, path_or_url):
+        """Image bytes for direct exam building: local asset files or remote URLs; None if unavailable."""
+        if not path_or_url.startswith(("http://", "https://")):
+            if not os.path.exists(path_or_url):
+                return None
+            with open(path_or_url, "rb") as fh:
+                return fh.read()
+        if self.offline:
+            return None
+        return self.fetch_image(path_or_url)
+
+    def fetch_image(self, url):
+        """Download image bytes directly, bypassing the asset store; None if unavailable."""
+        try:
+            response = requests.get(url, headers=HEADERS, timeout=10)
+            response.raise_for_status()
+            return response.content
+        except requests.exceptions.RequestException as e:
+            self._log_error(f"Image {url}: {e}")
+            return None
+
+    def page_folder(self, safe_title):
+        """Robbed/<first three title words>, the folder a page is saved in."""
+        GROUP_WORDS = 3
+        words = safe_title.split()
+        prefix = " ".join(words[:GROUP_WORDS]) if len(words) >= GROUP_WORDS else safe_title
+        return os.path.join("Robbed", prefix)
+
+    def rewrite_page(self, page, update_callback):
+        """
+        Parse the page, make its links absolute and drop popup strings.
+        Downloads of its question and answer images are handed to the asset
+        store's pool; finish_page() waits for them. With prune_pages set,
+        everything but the title and the question cards is dropped first, so
+        the rest of the page is never walked.
+        """
+        try:
+            soup = BeautifulSoup(page["text"], "html.parser")
             title = soup.title.string.strip() if soup.title else "output"
             safe_title = re.sub(r'[\\/*?:"<>|]', "_", title)
+            if self.prune_pages:
+                soup = self._prune(soup, page, safe_title, update_callback)
+
+            for tag in soup.find_all(["a", "link", "script", "img"]):
+                attr = "href" if tag.name in ["a", "link"] else "src"
+                if tag.has_attr(attr):
+                    tag[attr] = urljoin(page["url"], tag[attr])
+
+            for popup_tag in soup.find_all(string=lambda text: "popup" in text.lower()):
+                popup_tag.extract()
+
+            page["safe_title"] = safe_title
+            if self.download_assets:
+                page["images"] = self.assets.start(soup, offline=self.offline)
+            page["soup"] = soup
+            del page["text"]
+            return page
+        except Exception as e:
+            self.metrics.record_error(e)
+            error_message = f"-----Error rewriting page for URL {page['url']}: {e}"
+            update_callback(error_message)
+            self._log_error(error_message)
+            return None
+
+    def finish_page(self, page, update_callback):
+        """
+        Wait for the page's image downloads and point the images at the local
+        copies. In direct mode the question cards are extracted here, so each
+        page is parsed exactly once; the page is then serialized for writing.
+        """
+        try:
+            soup = page.pop("soup")
+            folder = self.page_folder(page["safe_title"])
+            if "images" in page:
+                fetched, reused, failed = self.assets.finish(page.pop("images"), folder)
+                if fetched or reused or failed:
+                    update_callback(f"Images for {page['safe_title']}: {fetched} downloaded, "
+                                    f"{reused} already stored, {failed} failed")
+            if self.exam_writer is not None:
+                # Localized images resolve against the page folder; any left remote are fetched directly
+                page["questions"] = parse_cards_from_soup(soup, folder, image_loader=self.load_image)
+            if self.archive_html:
+                page["html"] = str(soup)
+            return page
+        except Exception as e:
+            self.metrics.record_error(e)
+            error_message = f"-----Error saving images for URL {page['url']}: {e}"
+            update_callback(error_message)
+            self._log_error(error_message)
+            return None
+
+    def _prune(self, soup, page, safe_title, update_callback):
+        """Prune soup, recording how many bytes of the page were dropped."""
+        pruned = prune_soup(soup)
+        if pruned is None:
+            update_callback(f"No question cards in {safe_title}, saving the whole page")
+            return soup
+        size_before = len(page["text"].encode("utf-8"))
+        size_after = len(str(pruned).encode("utf-8"))
+        self.metrics.incr("prune.pages")
+        self.metrics.incr("prune.bytes_in", size_before)
+        self.metrics.incr("prune.bytes_removed", size_before - size_after)
+        update_callback(f"Pruned {safe_title}: {size_before / 1024:.1f} KB -> {size_after / 1024:.1f} KB")
+        return pruned
 
-            # --- Start of file I/O operations ---
-            try:
-                os.makedirs("Robbed", exist_ok=True)
-                
-                GROUP_WORDS = 3
-                words = safe_title.split()
-                prefix = " ".join(words[:GROUP_WORDS]) if len(words) >= GROUP_WORDS else safe_title
-                sub_folder = os.path.join("Robbed", prefix)
+    def write_page(self, page, update_callback):
+        """
+        Write a rewritten page under Robbed/<prefix>/ (compressed if
+        page_compression is set) and record it in the DB.
+        In direct mode its questions are appended to the exam being built.
+        """
+        safe_title = page["safe_title"]
+        try:
+            if self.archive_html:
+                sub_folder = self.page_folder(safe_title)
                 os.makedirs(sub_folder, exist_ok=True)
                 filename = os.path.join(sub_folder, f"{safe_title}.html")
 
-                for tag in soup.find_all(["a", "link", "script", "img"]):
-                    attr = "href" if tag.name in ["a", "link"] else "src"
-                    if tag.has_attr(attr):
-                        tag[attr] = urljoin(url, tag[attr])
-
-                for popup_tag in soup.find_all(string=lambda text: "popup" in text.lower()):
-                    popup_tag.extract()
-
-                with open(filename, "w", encoding="utf-8") as file:
-                    file.write(str(soup))
-                
-                self.cur.execute("INSERT OR IGNORE INTO files (filename) VALUES (?)", (safe_title,))
-                self.conn.commit()
-                self.cur.execute("INSERT OR IGNORE INTO visited_urls (url) VALUES (?)", (current_url,))
-                self.conn.commit()
-                
+                with self.metrics.timer("write"):
+                    filename = write_page_file(filename, page["html"], self.page_compression)
+                self.metrics.incr("write.bytes", os.path.getsize(filename))
                 update_callback(f"Legible HTML saved to {filename}")
-                return True
-            except Exception as e:
-                error_message = f"-----Error saving file for URL {url}: {e}"
-                update_callback(error_message)
-                now = datetime.datetime.now()
-                with open("ErrorLogs.txt", "a") as Log:
-                    Log.write(f"-----Error has occurred at {now}, Description: {error_message} \n")
-                return False
-            # --- End of file I/O operations ---
 
-        except requests.exceptions.RequestException as e:
-            update_callback(f"-----An error has occurred during request: {e}")
-            now = datetime.datetime.now()
-            with open("ErrorLogs.txt", "a") as Log:
-                Log.write(f"-----Error has occurred at {now}, Description: {e} \n")
+            if self.exam_writer is not None:
+                for question in page["questions"]:
+                    self.exam_writer.append(question)
+                update_callback(f"Added {len(page['questions'])} question(s) from {safe_title}")
+
+            self.db.write("INSERT OR IGNORE INTO files (filename) VALUES (?)", (safe_title,))
+            self.db.write("INSERT OR IGNORE INTO visited_urls (url) VALUES (?)", (page["current_url"],))
+            self.metrics.incr("write.pages")
+            return True
+        except Exception as e:
+            self.metrics.record_error(e)
+            error_message = f"-----Error saving file for URL {page['url']}: {e}"
+            update_callback(error_message)
+            self._log_error(error_message)
             return False
 
+    def save_html_from_url(self, url, update_callback):
+        """Fetch, rewrite and write a single page on the calling thread."""
+        page = self.fetch_page(url, update_callback)
+        if page is None:
+            return False
+        page = self.rewrite_page(page, update_callback)
+        if page is None:
+            return False
+        page = self.finish_page(page, update_callback)
+        if page is None:
+            return False
+        return self.write_page(page, update_callback)
+
     def escaneo(self, url, update_callback):
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-        }
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            with self.metrics.timer("probe"):
+                response = requests.get(url, headers=HEADERS, timeout=10)
             response.raise_for_status()
+            self.metrics.incr("probe.hits")
             
             soup = BeautifulSoup(response.text, "html.parser")
             current_url = response.url
             title = soup.title.string.strip() if soup.title else "output"
             safe_title = re.sub(r'[\\/*?:"<>|]', "_", title)
 
-            self.cur.execute("SELECT 1 FROM escanned_url WHERE title = ?", (safe_title,))
-            if self.cur.fetchone():
+            if self.db.read_one("SELECT 1 FROM escanned_url WHERE title = ?", (safe_title,)):
                 update_callback(f"File already recorded and stored, skipping...")
-                return False
-        
-            self.cur.execute("INSERT OR IGNORE INTO escanned_url (title, url) VALUES (?, ?)", (safe_title, current_url))
-            self.conn.commit()
+                return True  # The page exists, which is all the ID explorer needs to know
+
+            # Checked again on the writer thread: a row for this title may still be queued
+            self.db.write(
+                "INSERT INTO escanned_url (title, url) SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM escanned_url WHERE title = ?)",
+                (safe_title, current_url, safe_title)
+            )
             update_callback(f"Saved link and title to DB: {safe_title} ({current_url})")
             return True
         except requests.exceptions.RequestException as e:
             update_callback(f"-----An error has occurred: {e}")
-            now = datetime.datetime.now()
-            with open("ErrorLogs.txt", "a") as Log:
-                Log.write(f"-----Error has occurred at {now}, Description: {e} \n")
-            return False
+            self._log_error(e)
+            # Only a definite "no such page" is a miss; None leaves the ID unprobed for a later run
+            status = getattr(e.response, "status_code", None)
+            if status in (404, 410):
+                self.metrics.incr("probe.misses")
+                return False
+            self.metrics.record_error(e)
+            return None
 
-    def start_scanning(self, start_id, update_callback):
+    def start_scanning(self, start_id, update_callback, url_template=SCAN_URL_TEMPLATE, target="default", end_id=None):
+        """
+        Probe discussion IDs from start_id (up to end_id, if given) with
+        IdSpaceExplorer, recording every page found in escanned_url and every
+        probe in the id_bitmap table. Returns (requests made, pages found).
+        """
         self.stop_event.clear()
-        fail_count = 0
         waiting_time = 0.0
-        current_id = int(start_id)
 
-        while not self.stop_event.is_set() and fail_count < 99:
-            url = f"https://www.examtopics.com/discussions/amazon/view/{current_id}-exam-aws-certified-cloud-practitioner-clf-c02-topic-1/"
-            sleep_duration = round(random.uniform(1, 3), 2)
+        def probe(current_id):
+            nonlocal waiting_time
+            sleep_duration = round(random.uniform(*self.scan_delay), 2)
             time.sleep(sleep_duration)
             waiting_time += sleep_duration
-            
             update_callback(f"It has passed: {sleep_duration}s: Total time elapsed: {round(waiting_time, 2)}s Id number: {current_id}")
-            
-            if self.escaneo(url, update_callback):
-                fail_count = 0
-            else:
-                fail_count += 1
-
-            current_id += 1
-            self.cur.execute("DELETE FROM progress")
-            self.cur.execute("INSERT INTO progress (last_number) VALUES (?)", (current_id,))
-            self.conn.commit()
-        
+            return self.escaneo(url_template.format(id=current_id), update_callback)
+
+        try:
+            explorer = IdSpaceExplorer(IdBitmap(self.db, target))
+            requests_made, hits = explorer.run(int(start_id), probe, should_stop=self.stop_event.is_set, end_id=end_id)
+        finally:
+            self.db.release_reader()    # Scans usually run on a thread of their own
+        update_callback(f"Made {requests_made} requests, found {hits} pages.")
+
         if self.stop_event.is_set():
             update_callback("-----Scanning stopped by user.")
         else:
             update_callback("-----The execution ended.")
+        return requests_made, hits
 
-    def start_downloading(self, keyword, update_callback):
+    def start_downloading(self, keyword, update_callback, exam_path=None, archive_html=True, offline=False,
+                          download_assets=True, page_compression=None, prune_pages=False):
+        """
+        Download every scanned URL whose title matches keyword.
+        With exam_path set, question cards are extracted while downloading and
+        streamed into that exam JSON; archive_html=False then skips saving the
+        raw pages under Robbed/ altogether.
+        offline=True replays the response cache without touching the network.
+        download_assets saves question/answer images to Robbed/_assets and
+        rewrites the pages to use them.
+        page_compression ("gz" or "xz") stores pages compressed; the parsers
+        read them as they are. prune_pages keeps only the title and question
+        cards of each saved page.
+        """
         self.stop_event.clear()
         update_callback(f"Filters gathered are: {keyword}")
         
-        self.cur.execute("SELECT url FROM escanned_url WHERE LOWER(title) LIKE ?", (f'%{keyword.lower()}%',))
-        results = self.cur.fetchall()
+        self.db.flush()     # Pages found by a scan that just ended may still be queued
+        results = self.db.read("SELECT url FROM escanned_url WHERE LOWER(title) LIKE ?", (f'%{keyword.lower()}%',))
         
         update_callback(f"Found {len(results)} URLs to download.")
 
-        for (url,) in results:
-            if self.stop_event.is_set():
-                update_callback("-----Downloading stopped by user.")
-                break
-            self.save_html_from_url(url, update_callback)
-        
-        if not self.stop_event.is_set():
+        self.visited = {url for (url,) in self.db.read("SELECT url FROM visited_urls")}
+        self.offline = offline
+        self.download_assets = download_assets
+        self.page_compression = page_compression
+        self.prune_pages = prune_pages
+
+        self.pipeline = DownloadPipeline(
+            fetch=lambda url: self.fetch_page(url, update_callback),
+            rewrite=lambda page: self.rewrite_page(page, update_callback),
+            images=lambda page: self.finish_page(page, update_callback),
+            write=lambda page: self.write_page(page, update_callback),
+            stop_event=self.stop_event,
+            fetch_workers=self.fetch_workers,
+            rewrite_workers=self.rewrite_workers,
+            image_workers=self.image_workers,
+            queue_size=self.queue_size,
+            metrics=self.metrics,
+            on_worker_exit=self.db.release_reader,
+        )
+        self.archive_html = archive_html or not exam_path
+        pruned_in, pruned_removed = self.metrics.total("prune.bytes_in"), self.metrics.total("prune.bytes_removed")
+        self.exam_writer = ExamStreamWriter(exam_path, title=keyword or "ParsedExam") if exam_path else None
+        try:
+            self.pipeline.run(url for (url,) in results)
+            self.db.flush()
+        finally:
+            if self.exam_writer is not None:
+                self.exam_writer.close()
+                update_callback(f"Exam with {self.exam_writer.count} question(s) saved to {exam_path}")
+            self.exam_writer = None
+            self.db.release_reader()    # Downloads usually run on a thread of their own
+            self.archive_html = True
+            self.offline = False
+            self.download_assets = True
+            self.page_compression = None
+            self.prune_pages = False
+
+        total_in = self.metrics.total("prune.bytes_in") - pruned_in
+        if total_in:
+            removed = self.metrics.total("prune.bytes_removed") - pruned_removed
+            update_callback(f"Pruning removed {removed / 1e6:.1f} of {total_in / 1e6:.1f} MB ({100 * removed / total_in:.0f}%)")
+
+        if self.stop_event.is_set():
+            update_callback("-----Downloading stopped by user.")
+        else:
             update_callback("-----Program Finished correctly.")
 
+    def pipeline_stats(self):
+        """Per-stage counters of the current (or last) download, or [] if none ran."""
+        return self.pipeline.stats() if self.pipeline else []
+
+    def metrics_snapshot(self):
+        """Counters, rates and latency percentiles recorded since startup (see Robber_metrics)."""
+        return self.metrics.snapshot()
+
     def stop_operation(self):
         self.stop_event.set()
 
     def close_connection(self):
-        self.conn.close()
+        self.metrics.stop_periodic_export()
+        self.scheduler.stop_all()
+        self.assets.close()
+        self.cache.close()
+        self.db.close()
@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class LatencyHistogram:
+    """
+    Latency histogram with fixed, log-spaced buckets (1 ms to about 65 s,
+    each bucket sqrt(2) wider than the last). Memory is constant no matter
+    how many observations are made; percentiles are read from the buckets.
+    """
+    BOUNDS = [0.001 * 2 ** (i / 2) for i in range(33)]
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = 0
+        while index < len(self.BOUNDS) and seconds > self.BOUNDS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (p in 0-100)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """
+    Counters and latency histograms for the scraper, safe to update from any thread.
+    Names are dotted strings, e.g. "probe", "download.bytes", "errors.ConnectTimeout".
+    """
+    def __init__(self):
+        self.started_at = time.time()
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self._export_stop = None
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Time the with-block into histogram `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def total(self, name):
+        """Current value of counter name (0 if it was never incremented)."""
+        with self.lock:
+            return self.counters.get(name, 0)
+
+    def record_error(self, error):
+        """Count an exception by class, and HTTP errors by status code as well."""
+        self.incr(f"errors.{type(error).__name__}")
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        if status is not None:
+            self.incr(f"errors.http_{status}")
+
+    def reset(self):
+        with self.lock:
+            self.started_at = time.time()
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self):
+        """Point-in-time view: counters with per-second rates, plus latency percentiles."""
+        with self.lock:
+            elapsed = max(time.time() - self.started_at, 1e-9)
+            return {
+                "timestamp": time.time(),
+                "elapsed": elapsed,
+                "counters": {name: {"total": value, "rate": value / elapsed} for name, value in sorted(self.counters.items())},
+                "latency": {name: h.snapshot() for name, h in sorted(self.histograms.items())},
+            }
+
+    def export(self, path):
+        """
+        Write a snapshot to path. A .csv path gets one row per metric appended,
+        so periodic exports build a time series; anything else is written as JSON.
+        """
+        snap = self.snapshot()
+        if path.lower().endswith(".csv"):
+            new_file = not os.path.exists(path)
+            with open(path, "a", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                if new_file:
+                    writer.writerow(["timestamp", "metric", "kind", "total", "rate", "count", "avg", "p50", "p90", "p99", "max"])
+                for name, c in snap["counters"].items():
+                    writer.writerow([f"{snap['timestamp']:.3f}", name, "counter", c["total"], f"{c['rate']:.4f}", "", "", "", "", "", ""])
+                for name, h in snap["latency"].items():
+                    writer.writerow([f"{snap['timestamp']:.3f}", name, "latency", "", "", h["count"],
+                                     *(f"{h[k]:.6f}" for k in ("avg", "p50", "p90", "p99", "max"))])
+        else:
+            tmp_path = path + ".part"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(snap, fh, indent=2)
+            os.replace(tmp_path, path)
+
+    def start_periodic_export(self, path, interval=60.0):
+        """Export a snapshot to path every interval seconds until stop_periodic_export()."""
+        self.stop_periodic_export()
+        stop = self._export_stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                try:
+                    self.export(path)
+                except OSError:
+                    pass
+        threading.Thread(target=loop, daemon=True).start()
+
+    def stop_periodic_export(self):
+        if self._export_stop is not None:
+            self._export_stop.set()
+            self._export_stop = None
@@ -0,0 +1,145 @@
+import logging
+import threading
+import time
+from queue import Queue
+
+_DONE = object()  # Sentinel pushed downstream once a stage has no more work
+
+logger = logging.getLogger("robber.pipeline")
+
+
+class StageCounter:
+    """Thread-safe throughput counters for one pipeline stage."""
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.started_at = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.time()
+
+    def record(self, elapsed, ok=True):
+        with self._lock:
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.busy_time += elapsed
+
+    def snapshot(self, queued=0):
+        with self._lock:
+            wall = time.time() - self.started_at if self.started_at else 0.0
+            done = self.processed + self.failed
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "processed": self.processed,
+                "failed": self.failed,
+                "queued": queued,
+                "rate": done / wall if wall > 0 else 0.0,
+                "avg_time": self.busy_time / done if done else 0.0,
+            }
+
+
+class DownloadPipeline:
+    """
+    Runs fetch -> rewrite -> write as separate stages joined by bounded queues.
+    Fetchers are I/O bound, rewriters are CPU bound and a single writer thread
+    owns the disk and the database. An optional images stage between rewrite
+    and write waits for each page's image downloads, so rewriters never do.
+    A full queue blocks the stage feeding it, so a slow writer throttles the
+    fetchers instead of piling pages in memory.
+
+    Each stage function takes one item and returns the item for the next stage,
+    or a falsy value to drop it. Stage functions report their expected errors
+    themselves; anything they raise is logged and counted in metrics (a
+    Robber_metrics.Metrics, if given) and the item is dropped. on_worker_exit,
+    if given, is called on each worker thread as it ends, e.g. to release its
+    Robber_db.Database read connection.
+    """
+    def __init__(self, fetch, rewrite, write, stop_event,
+                 fetch_workers=4, rewrite_workers=2, queue_size=8, metrics=None,
+                 images=None, image_workers=4, on_worker_exit=None):
+        self.stop_event = stop_event
+        self.metrics = metrics
+        self.on_worker_exit = on_worker_exit
+        self.stages = [
+            (fetch, StageCounter("fetch", fetch_workers)),
+            (rewrite, StageCounter("rewrite", rewrite_workers)),
+        ]
+        if images is not None:
+            self.stages.append((images, StageCounter("images", image_workers)))
+        self.stages.append((write, StageCounter("write", 1)))
+        # queues[0] feeds the fetchers, the others sit between two stages
+        self.queues = [Queue(maxsize=queue_size) for _ in self.stages]
+        self._remaining = [counter.workers for _, counter in self.stages]
+        self._lock = threading.Lock()
+
+    def run(self, items):
+        """Push every item through the pipeline and block until it drains."""
+        threads = []
+        for index, (func, counter) in enumerate(self.stages):
+            for _ in range(counter.workers):
+                t = threading.Thread(target=self._worker, args=(index, func, counter), daemon=True)
+                t.start()
+                threads.append(t)
+
+        for item in items:
+            if self.stop_event.is_set():
+                break
+            self.queues[0].put(item)
+        for _ in range(self.stages[0][1].workers):
+            self.queues[0].put(_DONE)
+
+        for t in threads:
+            t.join()
+
+    def _worker(self, index, func, counter):
+        try:
+            self._work(index, func, counter)
+        finally:
+            if self.on_worker_exit is not None:
+                self.on_worker_exit()
+
+    def _work(self, index, func, counter):
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        counter.start()
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            # After a stop request keep draining so upstream puts never block forever
+            if self.stop_event.is_set():
+                continue
+            started = time.perf_counter()
+            try:
+                result = func(item)
+            except Exception as e:
+                logger.exception("Pipeline %s stage failed", counter.name)
+                if self.metrics is not None:
+                    self.metrics.record_error(e)
+                result = None
+            counter.record(time.perf_counter() - started, ok=bool(result))
+            if result and outbox is not None:
+                outbox.put(result)
+        self._finish_stage(index)
+
+    def _finish_stage(self, index):
+        # The last worker of a stage to exit tells every worker of the next stage to stop
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1][1].workers):
+                self.queues[index + 1].put(_DONE)
+
+    def stats(self):
+        """Return one counter snapshot per stage, in pipeline order."""
+        return [counter.snapshot(self.queues[i].qsize()) for i, (_, counter) in enumerate(self.stages)]
@@ -0,0 +1,175 @@
+import threading
+import time
+from Robber_explorer import IdBitmap, IdSpaceExplorer
+
+class RateBudget:
+    """
+    One request budget shared by every crawl target.
+    Each acquire() reserves the next free slot, 1/rate seconds after the
+    previous one, in arrival order. Every target has at most one request
+    waiting, so slots go round-robin between the targets that are running.
+    """
+    def __init__(self, rate=1.0):
+        self.rate = rate
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self, stop_event):
+        """Wait for a slot. Returns False if stop_event was set while waiting."""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + 1.0 / self.rate
+        delay = slot - time.monotonic()
+        if delay > 0:
+            return not stop_event.wait(delay)
+        return not stop_event.is_set()
+
+
+class CrawlTarget:
+    """One vendor/exam to crawl: a discussion URL template with an {id} field and an ID range."""
+    def __init__(self, name, url_template, start_id=0, end_id=None):
+        if "{id}" not in url_template:
+            raise ValueError("URL template must contain an {id} placeholder")
+        self.name = name
+        self.url_template = url_template
+        self.start_id = int(start_id)
+        self.end_id = int(end_id) if end_id not in (None, "") else None
+
+
+class CrawlScheduler:
+    """
+    Crawls many targets at once under a single RateBudget.
+    Every started target gets its own worker thread and IdSpaceExplorer
+    (with its own bitmap rows); progress is kept in the crawl_targets table
+    so each target can be stopped and resumed independently.
+    """
+    def __init__(self, robber_logic, rate=1.0):
+        self.logic = robber_logic
+        self.db = robber_logic.db
+        self.budget = RateBudget(rate)
+        self.workers = {}       # name -> (thread, stop_event)
+        self.removed = set()    # Running targets to delete once their thread is done
+        self.lock = threading.Lock()
+        self.db.write("""
+        CREATE TABLE IF NOT EXISTS crawl_targets (
+            name TEXT PRIMARY KEY,
+            url_template TEXT NOT NULL,
+            start_id INTEGER NOT NULL,
+            end_id INTEGER,
+            next_id INTEGER,
+            probes INTEGER DEFAULT 0,
+            hits INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'idle',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        # Anything left 'running' by a crash is just stopped now
+        self.db.write("UPDATE crawl_targets SET status = 'stopped' WHERE status = 'running'").result()
+
+    def add_target(self, target):
+        """Create or update a target row. Progress counters are kept on update."""
+        self.db.write(
+            "INSERT INTO crawl_targets (name, url_template, start_id, end_id, next_id) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET url_template = excluded.url_template, "
+            "start_id = excluded.start_id, end_id = excluded.end_id",
+            (target.name, target.url_template, target.start_id, target.end_id, target.start_id)
+        ).result()
+
+    def remove_target(self, name):
+        """
+        Delete a target and its progress. A running target is only stopped
+        here; its own thread deletes it after its last progress write, so
+        that write can't bring the bitmap rows back.
+        """
+        with self.lock:
+            if name in self.workers:
+                self.removed.add(name)
+                self.workers[name][1].set()
+                return
+        self._delete_target(name)
+
+    def _delete_target(self, name):
+        self.db.write("DELETE FROM crawl_targets WHERE name = ?", (name,))
+        IdBitmap(self.db, self._bitmap_key(name)).clear()
+
+    def targets(self):
+        """Progress rows for every target, as dicts."""
+        rows = self.db.read(
+            "SELECT name, url_template, start_id, end_id, next_id, probes, hits, status FROM crawl_targets ORDER BY name"
+        )
+        keys = ("name", "url_template", "start_id", "end_id", "next_id", "probes", "hits", "status")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def is_running(self, name):
+        worker = self.workers.get(name)
+        return bool(worker and worker[0].is_alive())
+
+    def any_running(self):
+        return any(self.is_running(name) for name in list(self.workers))
+
+    def start_target(self, name, update_callback):
+        with self.lock:
+            if self.is_running(name):
+                return False
+            row = next((t for t in self.targets() if t["name"] == name), None)
+            if row is None:
+                raise KeyError(name)
+            stop_event = threading.Event()
+            thread = threading.Thread(target=self._crawl, args=(row, stop_event, update_callback), daemon=True)
+            self.workers[name] = (thread, stop_event)
+            thread.start()
+            return True
+
+    def stop_target(self, name):
+        worker = self.workers.get(name)
+        if worker:
+            worker[1].set()
+
+    def stop_all(self):
+        for name in list(self.workers):
+            self.stop_target(name)
+
+    def _bitmap_key(self, name):
+        return f"target:{name}"
+
+    def _set_progress(self, name, **fields):
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        return self.db.write(
+            f"UPDATE crawl_targets SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE name = ?",
+            (*fields.values(), name)
+        )
+
+    def _crawl(self, row, stop_event, update_callback):
+        name = row["name"]
+        log = lambda message: update_callback(f"[{name}] {message}")
+        explorer = IdSpaceExplorer(IdBitmap(self.db, self._bitmap_key(name)))
+        start_id = explorer.resume_point(default=row["start_id"])
+        probes, hits = row["probes"] or 0, row["hits"] or 0
+        self._set_progress(name, status="running", next_id=start_id)
+        log(f"Starting at id {start_id}")
+
+        def probe(current_id):
+            nonlocal probes, hits
+            if not self.budget.acquire(stop_event):
+                return None
+            found = self.logic.escaneo(row["url_template"].format(id=current_id), log)
+            probes += 1
+            hits += bool(found)
+            self._set_progress(name, next_id=current_id + 1, probes=probes, hits=hits)
+            return found
+
+        try:
+            explorer.run(start_id, probe, should_stop=stop_event.is_set, end_id=row["end_id"])
+        finally:
+            status = "stopped" if stop_event.is_set() else "finished"
+            self._set_progress(name, status=status).result()
+            log(f"Crawl {status}: {probes} requests, {hits} pages so far")
+            with self.lock:
+                del self.workers[name]
+                removed = name in self.removed
+                self.removed.discard(name)
+            if removed:
+                self._delete_target(name)
+                log("Target removed")
+            self.db.release_reader()
@@ -2,30 +2,26 @@ from bs4 import BeautifulSoup as bs
 import os
 import re
 import urllib.parse
+from page_sources import iter_pages
+from question_model import Question, Part, TEXT, IMAGE
 
-class AnswerPart:
-    """
-    Represents a portion of an answer: either text or an image path.
-    e.g. ("text", "some text..."), ("image", "/path/to/image.jpg")
+# A portion of a question or answer: ("text", "some text..."), ("image", "/path/to/image.jpg")
+AnswerPart = Part
+
+class Card(Question):
     """
-    def __init__(self, ptype, content):
-        self.ptype = ptype
-        self.content = content
-
-class Card:
-    """ 
-        Represents one question, multi-choice answers, correct answers,
-        question text, question number, plus question parts (text/image).
-        Each answer is a list of AnswerPart too, so some answers may have images.
+    A Question as CardList builds it: image parts are ("image", path) rather
+    than base64, with the old Card attribute names kept for callers.
     """
-    def __init__(self, question: str, answers: list, correct_answer: list, question_number: str,
-                 question_parts=None):
-        self.question = question
-        self.answers = answers            # This will be a list of lists (answer-part lists), explained below
-        self.correct_answer = correct_answer
-        self.question_number = question_number
-        # question_parts is a list of (ptype, content) for the question text area
-        self.question_parts = question_parts if question_parts else []
+    __slots__ = ()
+
+    @property
+    def question(self):
+        return self.question_text
+
+    @property
+    def correct_answer(self):
+        return list(self.correct_answers)
 
     def print_card(self):
         print("=" * 30)
@@ -45,52 +41,36 @@ class Card:
 
 
 class CardList:
-    """ Loads Card objects from .html or .htm files in a directory. """
+    """
+    Loads Card objects from .html or .htm files in a directory.
+    Compressed pages (.gz / .xz) and .zip / .tar bundles are read in place;
+    image paths of bundled pages point inside the bundle (see page_sources).
+    """
     def __init__(self, resources_dir) -> None:
         self.resources_dir = resources_dir
-        self.__page_soups = self.__init_soups(self.__get_html_files(resources_dir))
         self.cards_list = []
 
-        for soup in self.__page_soups:
-            new_cards = self.__parse_cards_from_soup(soup)
+        for page in iter_pages(resources_dir):
+            new_cards = self.__parse_cards_from_soup(bs(page.html, "html.parser"), page.base_folder)
             self.cards_list.extend(new_cards)
 
-    def __get_html_files(self, folder):
-        """Return a list of .html or .htm files in 'folder'."""
-        result = []
-        for file in os.listdir(folder):
-            path = os.path.join(folder, file)
-            if os.path.isfile(path) and file.lower().endswith((".html", ".htm")):
-                result.append(path)
-        return result
-
-    def __init_soups(self, html_files):
-        soups = []
-        for f in html_files:
-            with open(f, "r", encoding="utf-8") as fh:
-                soup = bs(fh.read(), "html.parser")
-                soups.append(soup)
-        return soups
-
-    def __parse_cards_from_soup(self, soup):
+    def __parse_cards_from_soup(self, soup, base_folder):
         card_divs = soup.find_all("div", attrs={"class": "card exam-question-card"})
         cards = []
         for div in card_divs:
-            q_parts = self.__parse_question_parts(div)
-            question_text = self.__combine_text(q_parts)
-
-            ans = self.__parse_answers(div)
+            q_parts = self.__parse_question_parts(div, base_folder)
+            ans = self.__parse_answers(div, base_folder)
             correct = self.__parse_correct_answers(div)
             qnum = self.__parse_question_number(div)
 
-            card_obj = Card(question_text, ans, correct, qnum, q_parts)
+            card_obj = Card(qnum, q_parts, ans, correct)
             cards.append(card_obj)
         return cards
 
-    def __parse_question_parts(self, card_div):
+    def __parse_question_parts(self, card_div, base_folder):
         """ 
         For the main question text <p class="card-text"> parse text & <img> 
-        Return a list of AnswerPart objects: e.g. [AnswerPart("text","..."), AnswerPart("image","...")]
+        Return a list of Parts: e.g. [Part("text","..."), Part("image","...")]
         """
         results = []
         p_tag = card_div.find("p", attrs={"class": "card-text"})
@@ -102,37 +82,32 @@ class CardList:
                 # It's an <img>
                 src = child.get("src", "")
                 decoded = urllib.parse.unquote(src)
-                img_path = os.path.join(self.resources_dir, decoded)
-                results.append(AnswerPart("image", img_path))
+                img_path = os.path.join(base_folder, decoded)
+                results.append(Part(IMAGE, img_path))
             else:
                 # It's text or something else
                 txt = child.string if child.string else child.get_text(separator=" ")
                 txt = self.__clean_string(txt)
                 if txt:
-                    results.append(AnswerPart("text", txt))
+                    results.append(Part(TEXT, txt))
         return results
 
-    def __combine_text(self, question_parts):
-        """ Combine text parts for a simpler 'question' string. """
-        texts = [qp.content for qp in question_parts if qp.ptype == "text"]
-        return " ".join(texts)
-
-    def __parse_answers(self, card_div):
+    def __parse_answers(self, card_div, base_folder):
         """
         Each answer is an <li class="multi-choice-item">.
         We parse children in the li: text + <img> if any.
-        Return a list of answer-part-lists, e.g. [ [AnswerPart("text","stuff"), ...], [AnswerPart("text","more"), AnswerPart("image","...")] ]
+        Return a list of answer-part-lists, e.g. [ [Part("text","stuff"), ...], [Part("text","more"), Part("image","...")] ]
         """
         results = []
         li_items = card_div.find_all("li", attrs={"class": "multi-choice-item"})
         for li_tag in li_items:
-            answer_parts = self.__parse_answer_parts(li_tag)
+            answer_parts = self.__parse_answer_parts(li_tag, base_folder)
             results.append(answer_parts)
         return results
 
-    def __parse_answer_parts(self, li_tag):
+    def __parse_answer_parts(self, li_tag, base_folder):
         """
-        Parse text + images inside one <li> to produce a list of AnswerPart.
+        Parse text + images inside one <li> to produce a list of Parts.
         """
         subresults = []
         for child in li_tag.children:
@@ -140,14 +115,14 @@ class CardList:
                 # image in answer
                 src = child.get("src", "")
                 decoded = urllib.parse.unquote(src)
-                img_path = os.path.join(self.resources_dir, decoded)
-                subresults.append(AnswerPart("image", img_path))
+                img_path = os.path.join(base_folder, decoded)
+                subresults.append(Part(IMAGE, img_path))
             else:
                 # text
                 t = child.string if child.string else child.get_text(separator=" ")
                 t = self.__clean_string(t)
                 if t:
-                    subresults.append(AnswerPart("text", t))
+                    subresults.append(Part(TEXT, t))
         return subresults
 
     def __parse_correct_answers(self, card_div):
@@ -0,0 +1,73 @@
+# bench_history.py
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results.jsonl")
+REGRESSION_THRESHOLD = 0.2      # 20% worse than the recent median counts as a regression
+RECENT_RUNS = 5
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def load(benchmark, case, path=HISTORY_FILE):
+    """Earlier results of benchmark/case on this machine, oldest first."""
+    if not os.path.exists(path):
+        return []
+    machine = platform.node()
+    runs = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("benchmark") == benchmark and entry.get("case") == case and entry.get("machine") == machine:
+                runs.append(entry)
+    return runs
+
+def record(benchmark, case, metrics, higher_is_better=(), ignore=(), path=HISTORY_FILE):
+    """
+    Append one result to the history file and compare it with the median of
+    the last RECENT_RUNS runs of the same benchmark/case on this machine.
+    Metrics are lower-is-better unless named in higher_is_better; those in
+    ignore (e.g. timings too short to be stable) are stored but not compared.
+    Returns a list of regression messages (empty if none).
+    """
+    previous = load(benchmark, case, path)[-RECENT_RUNS:]
+    regressions = []
+    for name, value in metrics.items():
+        if name in ignore:
+            continue
+        history = [run["metrics"][name] for run in previous if run["metrics"].get(name) is not None]
+        if value is None or not history:
+            continue
+        baseline = statistics.median(history)
+        if not baseline:
+            continue
+        change = (value - baseline) / baseline
+        if name in higher_is_better:
+            change = -change
+        if change > REGRESSION_THRESHOLD:
+            regressions.append(f"{benchmark} [{case}] {name}: {value:.4g} vs median {baseline:.4g} ({100 * change:+.0f}% worse)")
+
+    entry = {
+        "benchmark": benchmark,
+        "case": case,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit(),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "metrics": metrics,
+    }
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    return regressions
@@ -0,0 +1,106 @@
+# bench_parse.py
+
+"""
+Parser benchmark on synthetic exam banks (see exam_generator.py).
+For every size it generates an ExamTopics-style folder and measures
+parse_html_to_json and _classes.CardList, each in a fresh process, reporting
+wall time (best of --repeat runs), peak RSS and questions/s. Results are appended to bench_results.jsonl
+(see bench_history.py) and compared with earlier runs to flag regressions.
+
+    python bench_parse.py --sizes 10 1000 50000
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import bench_history
+from exam_generator import generate_exam_folder
+
+try:
+    import resource
+except ImportError:     # Windows: no peak RSS
+    resource = None
+
+PARSERS = ("parse_html_to_json", "CardList")
+MIN_TIMED_SECONDS = 0.5     # shorter runs are recorded but their timings aren't checked for regressions
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _measure(parser, folder, results):
+    """Child process: run one parser over folder and report its numbers."""
+    from parse_html import parse_html_to_json
+    from _classes import CardList
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        if parser == "parse_html_to_json":
+            output = os.path.join(folder, "bench.json")
+            parse_html_to_json(folder, output, index=False, dedup=False)
+            os.remove(output)
+        else:
+            CardList(folder)
+        seconds = time.perf_counter() - started
+    results.put({"seconds": seconds, "peak_rss_mb": _peak_rss_mb()})
+
+def measure(parser, folder, questions, repeat=3):
+    """Best wall time and highest peak RSS over repeat fresh processes."""
+    # spawn, not fork: the child must not inherit the generator's memory
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        results = context.Queue()
+        child = context.Process(target=_measure, args=(parser, folder, results))
+        child.start()
+        runs.append(results.get())
+        child.join()
+    seconds = min(run["seconds"] for run in runs)
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": max(rss) if rss else None,
+        "questions_per_second": questions / seconds if seconds else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parsers on synthetic exam banks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 50000], help="questions per exam bank")
+    parser.add_argument("--cards-per-page", type=int, default=10)
+    parser.add_argument("--image-rate", type=float, default=0.1)
+    parser.add_argument("--parsers", nargs="+", choices=PARSERS, default=list(PARSERS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest counts")
+    parser.add_argument("--no-record", action="store_true", help=f"don't append to {bench_history.HISTORY_FILE}")
+    args = parser.parse_args()
+
+    regressions = []
+    print(f"{'parser':<20} {'questions':>9} {'seconds':>9} {'peak MB':>8} {'q/s':>9}")
+    for size in args.sizes:
+        folder = tempfile.mkdtemp(prefix="exam_bench_")
+        try:
+            generate_exam_folder(folder, size, cards_per_page=args.cards_per_page, image_rate=args.image_rate)
+            for name in args.parsers:
+                result = measure(name, folder, size, args.repeat)
+                rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "n/a"
+                print(f"{name:<20} {size:>9} {result['seconds']:>9.2f} {rss:>8} {result['questions_per_second']:>9.0f}")
+                if not args.no_record:
+                    case = f"questions={size},cards_per_page={args.cards_per_page},image_rate={args.image_rate}"
+                    unstable = ("seconds", "questions_per_second") if result["seconds"] < MIN_TIMED_SECONDS else ()
+                    regressions += bench_history.record(name, case, result, higher_is_better=("questions_per_second",),
+                                                        ignore=unstable)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    for message in regressions:
+        print(f"REGRESSION: {message}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
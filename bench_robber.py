@@ -0,0 +1,145 @@
+# bench_robber.py
+
+"""
+Scraper throughput benchmark against the local mock ExamTopics server.
+Runs start_scanning over an ID range and then start_downloading over what
+was found, and reports pages/s, requests per found page and CPU per page.
+Nothing touches the network: the mock server runs in a child process, so
+the CPU figures are the scraper's alone.
+
+    python bench_robber.py --max-id 3000 --density 0.05 --latency 0.02
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import bench_history
+from mock_examtopics import MockSite, MockExamTopicsServer
+
+def _serve(site_args, server_args, url_queue, stop_event):
+    with MockExamTopicsServer(MockSite(**site_args), **server_args) as mock:
+        url_queue.put(mock.url_template)
+        stop_event.wait()
+
+def run_benchmark(max_id=3000, density=0.05, cluster_size=0, page_kb=60, cards_per_page=1, images=True,
+                  latency=0.0, error_rate=0.0, fetch_workers=4, rewrite_workers=2,
+                  page_compression="gz", prune_pages=True, seed=0):
+    """Run one scan + download against a fresh mock site. Returns a dict of results."""
+    site_args = dict(max_id=max_id, density=density, cluster_size=cluster_size, page_kb=page_kb,
+                     cards_per_page=cards_per_page, images=images, seed=seed)
+    server_args = dict(latency=latency, error_rate=error_rate, seed=seed)
+    expected = len(MockSite(**site_args).ids)
+
+    url_queue = multiprocessing.Queue()
+    stop_server = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(site_args, server_args, url_queue, stop_server), daemon=True)
+    server.start()
+    work_dir = tempfile.mkdtemp(prefix="robber_bench_")
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)      # Robbed/, ErrorLogs.txt and the DB all land in the scratch folder
+    try:
+        from Robber_logic import RobberLogic
+        url_template = url_queue.get(timeout=30)
+        logic = RobberLogic(db_path=os.path.join(work_dir, "bench.db"), cache_dir=os.path.join(work_dir, "cache"),
+                            fetch_workers=fetch_workers, rewrite_workers=rewrite_workers, scan_delay=(0, 0))
+        quiet = lambda message: None
+        try:
+            wall, cpu = time.perf_counter(), time.process_time()
+            requests_made, found = logic.start_scanning(0, quiet, url_template=url_template, end_id=max_id)
+            scan_wall, scan_cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+            wall, cpu = time.perf_counter(), time.process_time()
+            logic.start_downloading("mock", quiet, page_compression=page_compression, prune_pages=prune_pages)
+            download_wall, download_cpu = time.perf_counter() - wall, time.process_time() - cpu
+            written = logic.metrics.total("write.pages")
+            downloaded_bytes = logic.metrics.total("download.bytes")
+        finally:
+            logic.close_connection()
+    finally:
+        os.chdir(old_cwd)
+        stop_server.set()
+        server.join(timeout=10)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "config": dict(site_args, **server_args, fetch_workers=fetch_workers, rewrite_workers=rewrite_workers,
+                       page_compression=page_compression, prune_pages=prune_pages),
+        "scan": {
+            "pages_expected": expected,
+            "pages_found": found,
+            "requests": requests_made,
+            "requests_per_found_page": requests_made / found if found else None,
+            "seconds": scan_wall,
+            "requests_per_second": requests_made / scan_wall if scan_wall else None,
+            "cpu_ms_per_request": 1000 * scan_cpu / requests_made if requests_made else None,
+        },
+        "download": {
+            "pages": written,
+            "seconds": download_wall,
+            "pages_per_second": written / download_wall if download_wall else None,
+            "cpu_ms_per_page": 1000 * download_cpu / written if written else None,
+            "mb_downloaded": downloaded_bytes / 1e6,
+        },
+    }
+
+def format_report(result):
+    scan, download = result["scan"], result["download"]
+    fmt = lambda value, spec: format(value, spec) if value is not None else "n/a"
+    return "\n".join([
+        f"Scan:     found {scan['pages_found']}/{scan['pages_expected']} pages with {scan['requests']} requests "
+        f"({fmt(scan['requests_per_found_page'], '.2f')} per page) in {scan['seconds']:.2f}s, "
+        f"{fmt(scan['requests_per_second'], '.1f')} req/s, {fmt(scan['cpu_ms_per_request'], '.2f')} ms CPU/request",
+        f"Download: {download['pages']} pages in {download['seconds']:.2f}s, "
+        f"{fmt(download['pages_per_second'], '.1f')} pages/s, {fmt(download['cpu_ms_per_page'], '.2f')} ms CPU/page, "
+        f"{download['mb_downloaded']:.1f} MB",
+    ])
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local mock ExamTopics server.")
+    parser.add_argument("--max-id", type=int, default=3000)
+    parser.add_argument("--density", type=float, default=0.05, help="fraction of IDs that exist")
+    parser.add_argument("--cluster-size", type=int, default=0, help="0 spreads pages uniformly")
+    parser.add_argument("--page-kb", type=int, default=60)
+    parser.add_argument("--cards-per-page", type=int, default=1)
+    parser.add_argument("--no-images", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of responses that are 503s")
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--rewrite-workers", type=int, default=2)
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--no-prune", action="store_true")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--no-record", action="store_true", help=f"don't append to {bench_history.HISTORY_FILE}")
+    args = parser.parse_args()
+
+    result = run_benchmark(
+        max_id=args.max_id, density=args.density, cluster_size=args.cluster_size, page_kb=args.page_kb,
+        cards_per_page=args.cards_per_page, images=not args.no_images, latency=args.latency,
+        error_rate=args.error_rate, fetch_workers=args.fetch_workers, rewrite_workers=args.rewrite_workers,
+        page_compression=None if args.no_compress else "gz", prune_pages=not args.no_prune,
+    )
+    print(format_report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    if args.no_record:
+        return 0
+    case = ",".join(f"{key}={value}" for key, value in sorted(result["config"].items()))
+    metrics = {
+        "requests_per_found_page": result["scan"]["requests_per_found_page"],
+        "scan_cpu_ms_per_request": result["scan"]["cpu_ms_per_request"],
+        "download_pages_per_second": result["download"]["pages_per_second"],
+        "download_cpu_ms_per_page": result["download"]["cpu_ms_per_page"],
+    }
+    regressions = bench_history.record("robber", case, metrics, higher_is_better=("download_pages_per_second",))
+    for message in regressions:
+        print(f"REGRESSION: {message}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+# bulk_import.py
+
+"""
+Import questions in bulk into an ExamStore (the editor's working copy) from
+CSV, Markdown or another exam JSON, streamed a batch at a time.
+
+CSV: a header row, then one question per row. Columns (any order, case
+doesn't matter): question, number, image, A, B, C, ... (as many answers as
+needed; "answer_a" works too), A_image, B_image, ..., correct ("A,C" or
+"AC"; "answer" works too) and explanation.
+
+Markdown: one question per heading (headings with nothing under them, like
+section titles, are skipped):
+
+    ## 12
+    Which service streams data in real time?
+    ![](images/streams.png)
+    A. Amazon Kinesis
+    B. Amazon SQS ![](images/sqs.png)
+    Answer: A
+    Explanation: Kinesis Data Streams ...
+
+Images are given by path, relative to the imported file, and base64-encoded
+in a thread pool (file reads dominate). Rows that fail validation, e.g. a
+correct answer "E" on a question with four answers or a missing image file,
+are skipped and listed in the report with their row or line number.
+
+    python cli.py import questions.csv -o exams/new.json
+"""
+
+import base64
+import csv
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from exam_io import ExamStreamReader
+from question_model import TEXT, IMAGE, IMAGE_BASE64
+
+FORMATS = ("csv", "markdown", "json")
+BATCH_SIZE = 500
+
+_IMAGE_REF = re.compile(r"!\[[^\]]*\]\(([^)]+)\)")
+_HEADING = re.compile(r"#{1,6}\s+(.*)")
+_ANSWER = re.compile(r"[-*]?\s*([A-Z])[.)]\s+(.*)")
+_CORRECT = re.compile(r"(?:correct\s+)?answers?\s*:\s*(.*)", re.IGNORECASE)
+_LABEL = re.compile(r"^[A-Z][.)]\s+")
+_EXPLANATION = re.compile(r"explanation\s*:\s*(.*)", re.IGNORECASE)
+
+def _log(update_callback, message):
+    if update_callback:
+        update_callback(message)
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".md", ".markdown", ".txt"):
+        return "markdown"
+    if extension == ".json":
+        return "json"
+    raise ValueError(f"Can't tell the format of {path}; choose from {', '.join(FORMATS)}")
+
+def parse_letters(text):
+    """["A", "C"] from "A,C", "a c" or "AC", in order, without repeats."""
+    letters = []
+    for letter in re.sub(r"[\s,;/]+", "", text.upper()):
+        if letter not in letters:
+            letters.append(letter)
+    return letters
+
+def _question(number, text, images, answers, correct, explanation=""):
+    """A question dict with image parts still given by path (IMAGE), for _encode_images()."""
+    parts = [[TEXT, text]] if text else []
+    parts += [[IMAGE, path] for path in images]
+    question = {
+        "question_number": number,
+        "question_parts": parts,
+        "answers": [[[TEXT, f"{chr(65 + i)}. {_LABEL.sub('', answer_text)}"]] + [[IMAGE, path] for path in answer_images]
+                    for i, (answer_text, answer_images) in enumerate(answers)],
+        "correct_answers": correct,
+    }
+    if explanation:
+        question["explanation"] = explanation
+    return question
+
+def _split_images(text):
+    """(text without ![](path) references, [paths])."""
+    paths = _IMAGE_REF.findall(text)
+    return " ".join(_IMAGE_REF.sub(" ", text).split()), paths
+
+# --- Readers: yield (where, question dict) ---
+
+def read_csv(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        columns = {}
+        for i, name in enumerate(header):
+            name = name.strip().lower()
+            match = re.fullmatch(r"(?:answer[ _]?)?([a-z])(?:[ _](image))?", name)
+            if match:
+                columns[(match.group(1).upper(), match.group(2))] = i
+            else:
+                columns[name] = i
+        if "question" not in columns:
+            raise ValueError(f"{path}: the header has no 'question' column")
+
+        def cell(row, key):
+            i = columns.get(key)
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        letters = sorted(key[0] for key in columns if isinstance(key, tuple) and key[1] is None)
+        for count, row in enumerate(reader, start=1):
+            where = f"line {reader.line_num}"
+            if not any(value.strip() for value in row):
+                continue
+            answers = [(cell(row, (letter, None)), [p for p in [cell(row, (letter, "image"))] if p])
+                       for letter in letters]
+            while answers and not answers[-1][0] and not answers[-1][1]:
+                answers.pop()
+            image = cell(row, "image") or cell(row, "question_image")
+            yield where, _question(cell(row, "number") or cell(row, "question_number") or str(count),
+                                   cell(row, "question"), [image] if image else [], answers,
+                                   parse_letters(cell(row, "correct") or cell(row, "correct_answers") or cell(row, "answer")),
+                                   cell(row, "explanation"))
+
+def read_markdown(path):
+    with open(path, "r", encoding="utf-8") as f:
+        current = None
+        count = 0
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            heading = _HEADING.fullmatch(line)
+            if heading:
+                if current and (current["text"] or current["answers"]):     # Else a section heading
+                    yield current["where"], _finish_markdown(current)
+                count += 1
+                number = re.sub(r"^(?:question|q)\s*#?\s*(?=\d)|:$", "", heading.group(1).strip(), flags=re.IGNORECASE)
+                current = {"where": f"line {line_number}", "number": number or str(count), "text": [],
+                           "answers": [], "correct": None, "explanation": None}
+                continue
+            if current is None or not line:
+                continue
+            answer = _ANSWER.fullmatch(line)
+            correct = _CORRECT.fullmatch(line)
+            explanation = _EXPLANATION.fullmatch(line)
+            if current["explanation"] is not None:
+                current["explanation"].append(line)
+            elif explanation:
+                current["explanation"] = [explanation.group(1)]
+            elif correct:
+                current["correct"] = correct.group(1)
+            elif answer and answer.group(1) == chr(65 + len(current["answers"])):
+                current["answers"].append([answer.group(2)])
+            elif current["answers"]:
+                current["answers"][-1].append(line)     # An answer running over several lines
+            else:
+                current["text"].append(line)
+        if current and (current["text"] or current["answers"]):
+            yield current["where"], _finish_markdown(current)
+
+def _finish_markdown(current):
+    text, images = _split_images("\n".join(current["text"]))
+    answers = [_split_images(" ".join(lines)) for lines in current["answers"]]
+    return _question(current["number"], text, images, answers, parse_letters(current["correct"] or ""),
+                     " ".join(current["explanation"] or ()).strip())
+
+def read_exam(path):
+    with ExamStreamReader(path) as reader:
+        for index, question in enumerate(reader, start=1):
+            yield f"question {index}", question
+
+READERS = {"csv": read_csv, "markdown": read_markdown, "json": read_exam}
+
+# --- Validation and images ---
+
+def validate(question):
+    """What is wrong with a question dict, or None."""
+    if not any(ptype != TEXT or content.strip() for ptype, content in question.get("question_parts") or ()):
+        return "the question has no text"
+    answers = question.get("answers") or []
+    if not answers:
+        return "the question has no answers"
+    for i, answer in enumerate(answers):
+        if not any(ptype != TEXT or _LABEL.sub("", content).strip() for ptype, content in answer):
+            return f"answer {chr(65 + i)} is empty"
+    correct = question.get("correct_answers") or []
+    if not correct:
+        return "no correct answer given"
+    last = chr(64 + len(answers))
+    for letter in correct:
+        if not (len(letter) == 1 and "A" <= letter <= last):
+            return f"correct answer {letter!r} but the question only has answers A-{last}"
+    return None
+
+def _encode(path):
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+def _image_parts(question):
+    for parts in [question["question_parts"], *question["answers"]]:
+        for part in parts:
+            if part[0] == IMAGE:
+                yield part
+
+def _encode_images(questions, base_folder, pool):
+    """
+    Replace the IMAGE (path) parts of questions [(where, question)] by base64
+    ones, reading the files in the pool. Returns {where: error} for questions
+    whose images couldn't be read.
+    """
+    paths = {}
+    for where, question in questions:
+        for part in _image_parts(question):
+            paths.setdefault(os.path.join(base_folder, part[1]), []).append(where)
+    futures = {path: pool.submit(_encode, path) for path in paths}
+    encoded, errors = {}, {}
+    for path, future in futures.items():
+        try:
+            encoded[path] = future.result()
+        except OSError as e:
+            for where in paths[path]:
+                errors.setdefault(where, f"image {os.path.relpath(path, base_folder)}: {e.strerror or e}")
+    for where, question in questions:
+        if where in errors:
+            continue
+        for part in _image_parts(question):
+            part[0], part[1] = IMAGE_BASE64, encoded[os.path.join(base_folder, part[1])]
+    return errors
+
+# --- Import ---
+
+def import_questions(store, path, fmt=None, batch_size=BATCH_SIZE, workers=None, update_callback=None):
+    """
+    Append the questions of path (CSV, Markdown or exam JSON; fmt defaults to
+    the extension's) to store, batch_size at a time. Returns a report dict:
+    rows read, questions imported and [(where, error)] for the rows skipped.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in READERS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+    base_folder = os.path.dirname(os.path.abspath(path))
+    report = {"file": path, "rows": 0, "imported": 0, "errors": []}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batch = []
+        for where, question in READERS[fmt](path):
+            report["rows"] += 1
+            error = validate(question)
+            if error:
+                report["errors"].append((where, error))
+                continue
+            batch.append((where, question))
+            if len(batch) >= batch_size:
+                _import_batch(store, batch, base_folder, pool, report, update_callback)
+                batch = []
+        if batch:
+            _import_batch(store, batch, base_folder, pool, report, update_callback)
+    _log(update_callback, f"Imported {report['imported']} of {report['rows']} question(s) from "
+                          f"{os.path.basename(path)}" + (f", {len(report['errors'])} skipped" if report["errors"] else ""))
+    return report
+
+def _import_batch(store, batch, base_folder, pool, report, update_callback):
+    errors = _encode_images(batch, base_folder, pool)
+    report["errors"].extend(errors.items())
+    report["imported"] += store.import_questions([q for where, q in batch if where not in errors])
+    _log(update_callback, f"{report['imported']} question(s) imported...")
+
+def format_report(report, limit=50):
+    """Human-readable summary of an import_questions() report."""
+    lines = [f"{report['imported']} of {report['rows']} question(s) imported from {os.path.basename(report['file'])}"]
+    for where, error in report["errors"][:limit]:
+        lines.append(f"  {where}: {error}")
+    if len(report["errors"]) > limit:
+        lines.append(f"  ... and {len(report['errors']) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,417 @@
+# cli.py
+
+"""
+Headless ExaMate: everything the menus do that doesn't need a window.
+
+    python cli.py parse "Robbed/AWS Developer" --exams-dir exams
+    python cli.py sample exams/aws.json -n 65 -o exams/aws-65.json
+    python cli.py score exams/aws-65.json answers.csv
+    python cli.py export results/aws-65_results_20250101_120000.json -o report.txt
+    python cli.py search "kinesis data firehose" --exams-dir exams
+    python cli.py dedup exams/clf-c01.json exams/clf-c02.json --policy richest --report dups.json
+    python cli.py dedup-images exams/*.json --dry-run
+    python cli.py merge exams/aws-part1.json exams/aws-part2.json -o exams/aws.json --dedup
+    python cli.py split exams/aws.json --count 500
+    python cli.py import questions.csv notes.md -o exams/my-exam.json
+    python cli.py scrape scan --url-template "https://.../view/{id}-exam-.../" --start 1000 --end 5000
+    python cli.py scrape download "developer associate" --exam exams/dva.json
+
+Only argparse, json, os and sys load at startup; bs4, requests and the
+scraper are imported by the subcommand that needs them, and Tk/PIL never.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+def _log(message):
+    print(message, flush=True)
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# --- parse ---
+
+def cmd_parse(args):
+    from parse_html import parse_html_to_json
+    from page_sources import BUNDLE_SUFFIXES
+    if args.output and len(args.folders) > 1:
+        raise SystemExit("--output only works with a single folder; use --exams-dir for several")
+    for folder in args.folders:
+        name = os.path.basename(os.path.normpath(folder))
+        for suffix in BUNDLE_SUFFIXES:
+            if name.lower().endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        output = args.output or os.path.join(args.exams_dir, f"{name}.json")
+        if os.path.exists(output) and not args.force:
+            _log(f"Skipping {folder}: {output} exists (use --force to overwrite)")
+            continue
+        profile = None
+        if args.profile:
+            from parse_profile import ParseProfile
+            profile = ParseProfile()
+        dedup = False
+        if not args.keep_duplicates:
+            from dedup import Deduplicator
+            dedup = Deduplicator(args.threshold)
+        parse_html_to_json(folder, output, profile=profile, index=True, dedup=dedup)
+        if profile:
+            _log(profile.summary())
+        if dedup:
+            _report_duplicates(dedup.report(), args.dedup_report)
+    return 0
+
+def _report_duplicates(report, path=None):
+    from dedup import format_report
+    _log(format_report(report))
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        _log(f"Cluster report saved to {path}")
+
+# --- dedup ---
+
+def cmd_dedup(args):
+    from dedup import dedup_exams
+    report = dedup_exams(args.exams, policy=args.policy, threshold=args.threshold, across_exams=args.across_exams,
+                         output_folder=args.output_dir, dry_run=args.dry_run)
+    _report_duplicates(report, args.report)
+    return 0
+
+def cmd_dedup_images(args):
+    from image_dedup import dedup_images, format_report
+    report = dedup_images(args.exams, max_distance=args.max_distance, keep=args.keep, workers=args.workers,
+                          output_folder=args.output_dir, dry_run=args.dry_run)
+    _log(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        _log(f"Report saved to {args.report}")
+    return 0
+
+# --- merge / split ---
+
+def cmd_merge(args):
+    from exam_tools import merge_exams
+    dedup = None
+    if args.dedup:
+        from dedup import Deduplicator
+        dedup = Deduplicator(args.threshold)
+    merge_exams(args.exams, args.output, title=args.title, dedup=dedup, policy=args.policy, update_callback=_log)
+    return 0
+
+def cmd_split(args):
+    from exam_tools import split_exam, parse_ranges
+    if args.count:
+        mode, options = "count", {"count": args.count}
+    elif args.ranges:
+        mode, options = "range", {"ranges": parse_ranges(args.ranges)}
+    else:
+        mode, options = "keyword", {"keywords": [k.strip() for k in args.keywords.split(",") if k.strip()]}
+    split_exam(args.exam, args.output_dir, mode, update_callback=_log, **options)
+    return 0
+
+# --- import ---
+
+def cmd_import(args):
+    from bulk_import import import_questions, format_report
+    from exam_store import ExamStore
+    store = ExamStore()
+    try:
+        if args.append and os.path.exists(args.output):
+            store.import_exam(args.output)
+        else:
+            store.title = os.path.splitext(os.path.basename(args.output))[0]
+        skipped = 0
+        for path in args.files:
+            report = import_questions(store, path, fmt=args.format, workers=args.workers)
+            skipped += len(report["errors"])
+            _log(format_report(report))
+        written = store.export(args.output, title=args.title)
+    finally:
+        store.close()
+    _log(f"Wrote {written} question(s) to {args.output}")
+    return 1 if skipped else 0
+
+# --- sample ---
+
+def cmd_sample(args):
+    import random
+    from exam_io import ExamStreamWriter
+    exam = _load_json(args.exam)
+    questions = exam.get("questions", [])
+    rng = random.Random(args.seed)
+    picked = rng.sample(questions, min(args.count, len(questions)))
+    title = exam.get("title", "ParsedExam")
+    with ExamStreamWriter(args.output, title=title) as writer:
+        for question in picked:
+            writer.append(question)
+    _log(f"Wrote {len(picked)} of {len(questions)} question(s) to {args.output}")
+    return 0
+
+# --- score ---
+
+def _letters(picks):
+    """{"A", "C"} from "AC", "a, c" or ["A", "C"]."""
+    if isinstance(picks, list):
+        picks = "".join(picks)
+    return {c.upper() for c in str(picks or "") if c.isalpha()}
+
+def read_answer_sheet(path):
+    """
+    Picks per question number from an answer sheet: a CSV of
+    question_number,letters rows (a header row is skipped) or a JSON object
+    {"<question_number>": "AC" | ["A", "C"]}.
+    """
+    if path.lower().endswith(".json"):
+        sheet = _load_json(path)
+        sheet = sheet.get("answers", sheet)
+        return {str(number).lstrip("#"): _letters(picks) for number, picks in sheet.items()}
+    import csv
+    answers = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 2 or row[0].strip().lower() in ("question", "question_number", "number"):
+                continue
+            answers[row[0].strip().lstrip("#")] = _letters(row[1])
+    return answers
+
+def cmd_score(args):
+    from question_model import load_questions
+    from scoring import build_results, save_results
+    exam = _load_json(args.exam)
+    questions = load_questions(exam.get("questions", []))
+    sheet = read_answer_sheet(args.answers)
+    unknown = set(sheet) - {q.question_number for q in questions}
+    if unknown:
+        _log(f"Warning: answer sheet has {len(unknown)} question number(s) not in the exam: {', '.join(sorted(unknown)[:10])}")
+    picks = [sheet.get(q.question_number, set()) for q in questions]
+    name = args.name or os.path.splitext(os.path.basename(args.exam))[0]
+    results = build_results(name, questions, picks, 0)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        path = args.output
+    else:
+        path = save_results(results, args.results_dir)
+    _log(f"Score: {results['final_score']:.2f} / {results['total_questions']} ({results['percentage']:.1f}%), saved to {path}")
+    return 0
+
+# --- export ---
+
+def cmd_export(args):
+    from scoring import write_results_text, write_results_csv
+    results = _load_json(args.results)
+    fmt = args.format or ("csv" if (args.output or "").lower().endswith(".csv") else "text")
+    write = write_results_csv if fmt == "csv" else write_results_text
+    if args.output:
+        with open(args.output, "w", newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+            write(results, f)
+        _log(f"Results exported to {args.output}")
+    else:
+        write(results, sys.stdout)
+    return 0
+
+# --- search ---
+
+def cmd_search(args):
+    from search_index import SearchIndex
+    index = SearchIndex(args.exams_dir)
+    try:
+        indexed, removed = index.sync()
+        if indexed or removed:
+            _log(f"Index updated: {indexed} exam(s) re-indexed, {removed} removed")
+        hits = index.search(" ".join(args.query), limit=args.limit, exams=args.exam)
+    finally:
+        index.close()
+    if args.json:
+        print(json.dumps(hits, indent=2))
+        return 0
+    for hit in hits:
+        snippet = hit["snippet"].replace("\n", " ")
+        _log(f"{hit['score']:7.2f}  {hit['exam']}  #{hit['question_number']} (index {hit['question_index']})  {snippet}")
+    if not hits:
+        _log("No matches.")
+    return 0
+
+# --- scrape ---
+
+def _robber(args):
+    from Robber_logic import RobberLogic
+    return RobberLogic(db_path=args.db, scan_delay=(args.min_delay, args.max_delay))
+
+def cmd_scrape(args):
+    logic = _robber(args)
+    try:
+        if args.scrape_command == "scan":
+            from Robber_logic import SCAN_URL_TEMPLATE
+            start = args.start if args.start is not None else logic.get_last_scan_id(args.target)
+            logic.start_scanning(start, _log, url_template=args.url_template or SCAN_URL_TEMPLATE,
+                                 target=args.target, end_id=args.end)
+        elif args.scrape_command == "download":
+            logic.start_downloading(args.keyword, _log, exam_path=args.exam, archive_html=not args.no_html,
+                                    offline=args.offline, download_assets=not args.no_images,
+                                    page_compression=args.compress, prune_pages=args.prune)
+        else:
+            return _crawl(logic, args)
+    except KeyboardInterrupt:
+        logic.stop_operation()
+        logic.scheduler.stop_all()
+        _log("Interrupted.")
+        return 130
+    finally:
+        logic.close_connection()
+    return 0
+
+def _crawl(logic, args):
+    """Run saved crawl targets (or all of them) until they finish."""
+    import time
+    names = args.targets or [t["name"] for t in logic.scheduler.targets() if t["status"] != "finished"]
+    if not names:
+        _log("No crawl targets to run.")
+        return 0
+    for name in names:
+        logic.scheduler.start_target(name, _log)
+    while logic.scheduler.any_running():
+        time.sleep(0.5)
+    for target in logic.scheduler.targets():
+        if target["name"] in names:
+            _log(f"{target['name']}: {target['status']}, {target['probes']} requests, {target['hits']} pages")
+    return 0
+
+# --- entry point ---
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="ExaMate without the GUI.")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="-v for info logs, -vv for debug")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("parse", help="parse folders (or bundles) of saved pages into exam JSON")
+    p.add_argument("folders", nargs="+")
+    p.add_argument("-o", "--output", help="output JSON (single folder only)")
+    p.add_argument("--exams-dir", default="exams", help="where <folder name>.json goes (default: exams)")
+    p.add_argument("-f", "--force", action="store_true", help="overwrite existing exams")
+    p.add_argument("--profile", action="store_true", help="print a per-stage timing report")
+    p.add_argument("--keep-duplicates", action="store_true", help="write repeated questions too")
+    p.add_argument("--threshold", type=float, default=0.8, help="near-duplicate similarity, 0-1 (default: 0.8)")
+    p.add_argument("--dedup-report", help="write the duplicate clusters as JSON")
+    p.set_defaults(func=cmd_parse)
+
+    p = sub.add_parser("dedup", help="find and remove duplicate questions in existing exams")
+    p.add_argument("exams", nargs="+")
+    p.add_argument("--policy", choices=("first", "last", "richest"), default="first",
+                   help="copy to keep: first/last seen, or richest (images, explanation, then longest)")
+    p.add_argument("--threshold", type=float, default=0.8, help="near-duplicate similarity, 0-1 (default: 0.8)")
+    p.add_argument("--across-exams", action="store_true",
+                   help="also remove copies found in another exam (default: only report them)")
+    p.add_argument("-o", "--output-dir", help="write the deduplicated exams here instead of in place")
+    p.add_argument("--dry-run", action="store_true", help="only report")
+    p.add_argument("--report", help="write the duplicate clusters as JSON")
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser("dedup-images", help="collapse near-identical images in exams to one copy")
+    p.add_argument("exams", nargs="+")
+    p.add_argument("--max-distance", type=int, default=8, help="perceptual-hash bits (of 256) that may differ")
+    p.add_argument("--keep", choices=("smallest", "largest"), default="smallest",
+                   help="canonical copy: the smallest encoding (default) or the largest picture")
+    p.add_argument("-j", "--workers", type=int, help="hashing processes (default: one per CPU)")
+    p.add_argument("-o", "--output-dir", help="write the exams here instead of in place")
+    p.add_argument("--dry-run", action="store_true", help="only report")
+    p.add_argument("--report", help="write the report as JSON")
+    p.set_defaults(func=cmd_dedup_images)
+
+    p = sub.add_parser("merge", help="merge exams into one, streaming (optionally without duplicates)")
+    p.add_argument("exams", nargs="+")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--title", help="default: the first exam's title")
+    p.add_argument("--dedup", action="store_true", help="leave out questions that repeat an earlier one")
+    p.add_argument("--policy", choices=("first", "last", "richest"), default="first", help="with --dedup: copy to keep")
+    p.add_argument("--threshold", type=float, default=0.8, help="with --dedup: near-duplicate similarity, 0-1")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("split", help="split an exam into smaller exams, streaming")
+    p.add_argument("exam")
+    how = p.add_mutually_exclusive_group(required=True)
+    how.add_argument("--count", type=int, help="questions per exam")
+    how.add_argument("--ranges", help="question-number ranges, e.g. 1-100,101-250")
+    how.add_argument("--keywords", help="one exam per keyword, e.g. lambda,kinesis (first match wins)")
+    p.add_argument("-o", "--output-dir", help="default: next to the exam")
+    p.set_defaults(func=cmd_split)
+
+    p = sub.add_parser("import", help="build an exam from CSV, Markdown or exam JSON files (exits 1 if rows were skipped)")
+    p.add_argument("files", nargs="+")
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--title", help="default: the output's file name, or its title with --append")
+    p.add_argument("--append", action="store_true", help="add to the questions already in the output exam")
+    p.add_argument("--format", choices=("csv", "markdown", "json"), help="default: from each file's extension")
+    p.add_argument("-j", "--workers", type=int, help="image-encoding threads")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("sample", help="write a random subset of an exam as a new exam")
+    p.add_argument("exam")
+    p.add_argument("-n", "--count", type=int, default=10)
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--seed", type=int, help="make the sample reproducible")
+    p.set_defaults(func=cmd_sample)
+
+    p = sub.add_parser("score", help="score an answer sheet (CSV or JSON) against an exam")
+    p.add_argument("exam")
+    p.add_argument("answers")
+    p.add_argument("--name", help="exam name in the results (default: exam file name)")
+    p.add_argument("-o", "--output", help="results JSON (default: a new file in --results-dir)")
+    p.add_argument("--results-dir", default="results")
+    p.set_defaults(func=cmd_score)
+
+    p = sub.add_parser("export", help="export a results file as text or CSV")
+    p.add_argument("results")
+    p.add_argument("-o", "--output", help="default: stdout")
+    p.add_argument("--format", choices=("text", "csv"), help="default: from the output extension, else text")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("search", help="full-text search over the questions of every exam")
+    p.add_argument("query", nargs="+", help='words (all must match), "a phrase" or prefix*')
+    p.add_argument("--exams-dir", default="exams")
+    p.add_argument("--exam", action="append", help="only search this exam file (repeatable)")
+    p.add_argument("-n", "--limit", type=int, default=20)
+    p.add_argument("--json", action="store_true", help="print the hits as JSON")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("scrape", help="run scraper jobs (scan, download, crawl)")
+    p.add_argument("--db", default="RobberDB.db")
+    p.add_argument("--min-delay", type=float, default=1.0, help="seconds between scan probes (lower bound)")
+    p.add_argument("--max-delay", type=float, default=3.0)
+    scrape = p.add_subparsers(dest="scrape_command", required=True)
+    s = scrape.add_parser("scan", help="probe discussion IDs for exam pages")
+    s.add_argument("--url-template", help="discussion URL with an {id} field")
+    s.add_argument("--start", type=int, help="first ID (default: resume the last scan)")
+    s.add_argument("--end", type=int)
+    s.add_argument("--target", default="default", help="bitmap/progress key of this scan")
+    s = scrape.add_parser("download", help="download scanned pages whose title matches a keyword")
+    s.add_argument("keyword")
+    s.add_argument("--exam", help="also build this exam JSON while downloading")
+    s.add_argument("--no-html", action="store_true", help="with --exam: don't keep the raw pages")
+    s.add_argument("--offline", action="store_true", help="replay the response cache only")
+    s.add_argument("--no-images", action="store_true")
+    s.add_argument("--compress", choices=("gz", "xz"))
+    s.add_argument("--prune", action="store_true", help="keep only the question cards of each page")
+    s = scrape.add_parser("crawl", help="run saved crawl targets until they finish")
+    s.add_argument("targets", nargs="*", help="default: every target not finished yet")
+    p.set_defaults(func=cmd_scrape)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.verbose:
+        import logging
+        logging.basicConfig(level=logging.DEBUG if args.verbose > 1 else logging.INFO)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# dedup.py
+
+"""
+Duplicate and near-duplicate question detection.
+
+Exact copies are found by hashing the normalized question and answer text
+(answers sorted, so shuffled options still match); near copies by MinHash
+signatures over word 3-grams, bucketed with LSH so each question is only
+compared with the few earlier questions that share a band, never with the
+whole bank. Candidates are confirmed by the signatures' estimated Jaccard
+similarity against the threshold.
+
+    python cli.py dedup exams/clf-c01.json exams/clf-c02.json --policy richest --report dups.json
+"""
+
+import array
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import unicodedata
+from question_model import Question, IMAGE, IMAGE_BASE64
+
+POLICIES = ("first", "last", "richest")
+POLICY_HELP = {
+    "first": "keep the copy seen first (file and page order)",
+    "last": "keep the copy seen last (e.g. the newest exam version)",
+    "richest": "keep the most complete copy: images, explanation, then text length",
+}
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_WORDS = 3
+_EMPTY = 1 << 40      # Marks a bin no shingle hashed into (above every real value)
+
+logger = logging.getLogger(__name__)
+
+# --- Fingerprints ---
+
+def normalize_text(text):
+    """Lower-case words only: accents, punctuation and spacing don't make a question different."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+def _image_token(content):
+    return "img:" + hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+def _correct_key(question):
+    """The correct answers by content, so shuffled options still match (None without correct answers)."""
+    tokens = []
+    for letter in question.correct_answers:
+        text, image = question.answer_info(letter)
+        tokens.append(normalize_text(text) + (" " + _image_token(image) if image else ""))
+    return "\x1e".join(sorted(tokens)) or None
+
+def question_fingerprint(question):
+    """
+    (exact key, image key, correct key, shingles) of a question dict or
+    Question. The image key identifies its set of images by content and the
+    correct key its correct answers (each None if it has none).
+    """
+    question = Question.from_dict(question)
+    text = normalize_text(question.question_text)
+    images = [_image_token(content) for ptype, content in question.question_parts
+              if ptype in (IMAGE_BASE64, IMAGE)]
+    answers = sorted(normalize_text(answer) for answer in question.answer_texts)
+    answers += sorted(_image_token(image) for image in question.answer_images if image)
+    correct_key = _correct_key(question)
+    key = hashlib.blake2b("\x1f".join([text, *images, "", *answers, "", correct_key or ""]).encode(),
+                          digest_size=16).digest()
+    image_tokens = sorted(images + [token for token in answers if token.startswith("img:")])
+    image_key = " ".join(image_tokens) or None
+    shingles = set(images)
+    for chunk in (text, *answers):
+        words = chunk.split()
+        if len(words) <= SHINGLE_WORDS:
+            if words:
+                shingles.add(chunk)
+            continue
+        shingles.update(" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+    return key, image_key, correct_key, shingles
+
+class MinHasher:
+    """
+    MinHash signatures of shingle sets by one-permutation hashing: each
+    shingle is hashed once and the hash picks one of num_perm bins (low bits)
+    and a value (high bits); a bin keeps its minimum. Bins left empty borrow
+    the next filled bin's value, offset by the distance ("rotation"
+    densification), so short questions still compare bin by bin. One hash
+    per shingle instead of num_perm keeps this several times faster than
+    classic MinHash in pure Python, with the same estimator.
+    """
+    def __init__(self, num_perm=64, seed=1):
+        if num_perm & (num_perm - 1):
+            raise ValueError("num_perm must be a power of two")
+        self.num_perm = num_perm
+        self.bits = num_perm.bit_length() - 1
+        self.salt = random.Random(seed).randbytes(16)
+
+    def signature(self, shingles):
+        k, bits, salt = self.num_perm, self.bits, self.salt
+        bins = [_EMPTY] * k
+        for shingle in shingles:
+            h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4, salt=salt).digest(), "little")
+            b, v = h & (k - 1), h >> bits
+            if v < bins[b]:
+                bins[b] = v
+        if not shingles:
+            return array.array("I", [0xFFFFFFFF] * k)
+        if _EMPTY in bins:
+            filled = bins[:]
+            nxt = None
+            for i in range(2 * k - 1, -1, -1):     # Walk right to left twice so the last bins can wrap around
+                if filled[i % k] != _EMPTY:
+                    nxt = i
+                elif i < k and nxt is not None:
+                    bins[i] = filled[nxt % k] + ((nxt - i) << 32 - bits)
+        return array.array("I", bins)     # Offsets stay below 2**32: a filled bin is < k away
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+# --- Clustering ---
+
+class Deduplicator:
+    """
+    Groups questions into clusters of copies as they are added, in order.
+    The first question of a cluster is its representative: only
+    representatives are stored in the LSH buckets, so memory grows with the
+    number of distinct questions. Near copies must have the same images
+    (or one of them none, e.g. an image that failed to download), so "Refer
+    to the exhibit" questions with different exhibits stay apart, and the
+    same correct answers (or one of them none), so "MOST"/"LEAST" variants
+    of a question stay apart too. add() tells the caller at once whether a
+    question repeats an earlier one, which is what parse-time dedup needs;
+    keep() picks each cluster's survivor by policy once everything was added.
+
+    With the defaults (64 permutations, 16 bands of 4) a pair at similarity
+    0.8 shares a band with probability > 0.999; at 0.3 under 0.13.
+    """
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=64, bands=16, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.exact = {}         # exact key -> representative id
+        self.buckets = [{} for _ in range(bands)]   # band bytes -> representative id(s)
+        self.signatures = {}    # representative id -> (signature, image key, correct key)
+        self.items = []         # per id: [cluster id, source, index, question number, richness, similarity, exact]
+        self.cluster_sizes = {}
+
+    def add(self, question, source=None, index=None):
+        """
+        Record a question; returns the id of the earlier question it copies,
+        or None if it is new. source/index say where it came from in reports.
+        """
+        question = Question.from_dict(question)
+        item_id = len(self.items)
+        key, image_key, correct_key, shingles = question_fingerprint(question)
+        match, score, exact = self.exact.get(key), 1.0, True
+        if match is None:
+            exact = False
+            signature = self.hasher.signature(shingles)
+            match, score = self._near_match(signature, image_key, correct_key)
+            if match is None:
+                self.exact[key] = item_id
+                self.signatures[item_id] = (signature, image_key, correct_key)
+                self._bucket(item_id, signature)
+        cluster = item_id if match is None else self.items[match][0]
+        self.items.append([cluster, source, item_id if index is None else index, question.question_number,
+                           richness(question), score, exact])
+        self.cluster_sizes[cluster] = self.cluster_sizes.get(cluster, 0) + 1
+        return match
+
+    def _bands(self, signature):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows].tobytes()
+
+    def _near_match(self, signature, image_key, correct_key):
+        best, best_score = None, 0.0
+        seen = set()
+        for band, key in self._bands(signature):
+            found = self.buckets[band].get(key)
+            if found is None:
+                continue
+            for candidate in (found if isinstance(found, list) else (found,)):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                other, other_images, other_correct = self.signatures[candidate]
+                if image_key and other_images and image_key != other_images:
+                    continue
+                if correct_key and other_correct and correct_key != other_correct:
+                    continue
+                score = similarity(signature, other)
+                if score >= self.threshold and score > best_score:
+                    best, best_score = candidate, score
+        return best, best_score
+
+    def _bucket(self, item_id, signature):
+        for band, key in self._bands(signature):
+            bucket = self.buckets[band]
+            found = bucket.get(key)
+            if found is None:
+                bucket[key] = item_id           # A bare id until a second representative shares the band
+            elif isinstance(found, list):
+                found.append(item_id)
+            else:
+                bucket[key] = [found, item_id]
+
+    @property
+    def duplicates(self):
+        return len(self.items) - len(self.cluster_sizes)
+
+    def clusters(self):
+        """Lists of ids of the questions that have copies, each in add() order."""
+        members = {}
+        for item_id, item in enumerate(self.items):
+            if self.cluster_sizes[item[0]] > 1:
+                members.setdefault(item[0], []).append(item_id)
+        return list(members.values())
+
+    def keep(self, policy="first", across_sources=True):
+        """
+        Ids to keep under policy: one per cluster, or with across_sources=False
+        one per cluster and source (copies in other exams are only reported).
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}; choose from {', '.join(POLICIES)}")
+        kept = set(range(len(self.items)))
+        for members in self.clusters():
+            groups = {}
+            for item_id in members:
+                groups.setdefault(None if across_sources else self.items[item_id][1], []).append(item_id)
+            for group in groups.values():
+                if policy == "first":
+                    survivor = group[0]
+                elif policy == "last":
+                    survivor = group[-1]
+                else:
+                    survivor = max(group, key=lambda i: (self.items[i][4], -i))
+                kept.difference_update(i for i in group if i != survivor)
+        return kept
+
+    def report(self, kept=None, policy="first"):
+        """JSON-ready summary of what was found, with every cluster's members."""
+        if kept is None:
+            kept = set(range(len(self.items)))
+            kept.difference_update(i for members in self.clusters() for i in members[1:])
+        clusters = []
+        for members in self.clusters():
+            rows = []
+            for item_id in members:
+                _, source, index, number, _, score, exact = self.items[item_id]
+                rows.append({"source": source, "index": index, "question_number": number,
+                             "similarity": round(score, 3), "exact": exact, "kept": item_id in kept})
+            rows[0]["similarity"], rows[0]["exact"] = 1.0, True     # The representative itself
+            clusters.append({
+                "kind": "exact" if all(row["exact"] for row in rows) else "near",
+                "sources": sorted({str(row["source"]) for row in rows}),
+                "members": rows,
+            })
+        return {
+            "policy": policy,
+            "threshold": self.threshold,
+            "questions": len(self.items),
+            "distinct": len(self.cluster_sizes),
+            "removed": len(self.items) - len(kept),
+            "clusters": clusters,
+        }
+
+def richness(question):
+    """How complete a copy is, for the "richest" policy: images, extra keys, text length."""
+    images = sum(1 for ptype, _ in question.question_parts if ptype in (IMAGE_BASE64, IMAGE))
+    images += sum(1 for image in question.answer_images if image)
+    return (images, len(question.extra or ()), len(question.question_text) + sum(map(len, question.answer_texts)))
+
+def format_report(report, limit=20):
+    """Human-readable summary of a report(), listing up to limit clusters."""
+    lines = [f"{report['questions']} question(s), {report['distinct']} distinct, "
+             f"{len(report['clusters'])} cluster(s) of copies, {report['removed']} removed "
+             f"(policy {report['policy']}, threshold {report['threshold']})"]
+    for cluster in report["clusters"][:limit]:
+        members = ", ".join(f"{m['source']}#{m['question_number']}"
+                            + ("" if m["exact"] else f" ({m['similarity']:.2f})") + ("*" if m["kept"] else "")
+                            for m in cluster["members"])
+        lines.append(f"  [{cluster['kind']}] {members}")
+    if len(report["clusters"]) > limit:
+        lines.append(f"  ... {len(report['clusters']) - limit} more")
+    return "\n".join(lines)
+
+# --- Standalone pass over exam files ---
+
+def dedup_exams(exam_paths, policy="first", threshold=DEFAULT_THRESHOLD, across_exams=False,
+                output_folder=None, dry_run=False):
+    """
+    Find copies within (and across) exam files and rewrite each affected exam
+    without the dropped ones, into output_folder or in place. Each exam is
+    loaded once to fingerprint and once more only if it changes. Copies in
+    different exams are removed only with across_exams; otherwise they are
+    just reported. Returns the report() dict.
+    """
+    from exam_io import ExamStreamWriter
+    dedup = Deduplicator(threshold)
+    ranges = []
+    for path in exam_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            questions = json.load(f).get("questions", [])
+        first = len(dedup.items)
+        source = os.path.basename(path)
+        for index, question in enumerate(questions):
+            dedup.add(question, source, index)
+        ranges.append((path, first, len(dedup.items)))
+    kept = dedup.keep(policy, across_sources=across_exams)
+    report = dedup.report(kept, policy)
+    for path, first, end in ranges:
+        drop = {item_id - first for item_id in range(first, end) if item_id not in kept}
+        output = os.path.join(output_folder, os.path.basename(path)) if output_folder else path
+        if dry_run or (not drop and output == path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            exam = json.load(f)
+        with ExamStreamWriter(output, title=exam.get("title", "ParsedExam")) as writer:
+            for index, question in enumerate(exam.get("questions", [])):
+                if index not in drop:
+                    writer.append(question)
+        logger.info("%s: removed %d of %d question(s)", output, len(drop), end - first)
+    return report
@@ -1,37 +1,171 @@
 # editor.py
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-import json
+import tkinter.font as tkfont
 import base64
 import os
+import threading
+from PIL import ImageTk
+from image_cache import thumbnail
+from question_model import Question, TEXT, IMAGE_BASE64, replace_text
+from exam_store import ExamStore
+import bulk_import
+
+FILTER_DELAY_MS = 250   # Filter once typing pauses, not on every key
+WORKER_POLL_MS = 200    # How often the list catches up with an exam being loaded or imported
+QUESTION_THUMBNAIL = (240, 120)
+ANSWER_THUMBNAIL = (96, 48)
+DEFAULT_ANSWERS = 4     # Answer rows of a new question
+MAX_ANSWERS = 26        # A-Z
 
 """
 A simple "Exam Editor" to create an exam from scratch and save to .json (with base64 images).
 This implementation now includes rich text support and a responsive UI.
 """
 
+class VirtualList(tk.Frame):
+    """
+    A list of any length that only holds the rows in view: fetch(offset, limit)
+    returns [(key, text)] for a window of rows and count() the total. Scrolling
+    fetches the new window, and refresh() rewrites only the lines that changed.
+    """
+    def __init__(self, parent, fetch, count, font=("Segoe UI",11), on_activate=None):
+        super().__init__(parent)
+        self.fetch = fetch
+        self.count = count
+        self.on_activate = on_activate
+        self.line_height = tkfont.Font(font=font).metrics("linespace") + 1
+        self.offset = 0
+        self.total = 0
+        self.keys = []
+        self.texts = []
+        self.selected = None    # Key of the selected row, kept while it scrolls out of view
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.listbox = tk.Listbox(self, font=font, activestyle="none", exportselection=False)
+        self.listbox.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.listbox.bind("<Configure>", lambda e: self.refresh(recount=False))
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<Double-Button-1>", lambda e: self.on_activate and self.on_activate())
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1) or "break")
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-1) or "break")
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(1) or "break")
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1) or "break")
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1) or "break")
+        self.listbox.bind("<Prior>", lambda e: self.scroll(-self.page_size()) or "break")
+        self.listbox.bind("<Next>", lambda e: self.scroll(self.page_size()) or "break")
+
+    def page_size(self):
+        return max(1, self.listbox.winfo_height() // self.line_height)
+
+    def refresh(self, recount=True):
+        """Re-read the rows in view; recount after an edit or a new filter, not for a scroll."""
+        if recount:
+            self.total = self.count()
+        size = self.page_size()
+        self.offset = max(0, min(self.offset, self.total - size))
+        rows = self.fetch(self.offset, size)
+        keys = [key for key, _ in rows]
+        texts = [text for _, text in rows]
+        for i, text in enumerate(texts):
+            if i >= len(self.texts):
+                self.listbox.insert(tk.END, text)
+            elif self.texts[i] != text:
+                self.listbox.delete(i)
+                self.listbox.insert(i, text)
+        if len(self.texts) > len(texts):
+            self.listbox.delete(len(texts), tk.END)
+        self.keys, self.texts = keys, texts
+        self.listbox.selection_clear(0, tk.END)
+        if self.selected in self.keys:
+            self.listbox.selection_set(self.keys.index(self.selected))
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + size) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, action, amount, what=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * self.total)
+            self.refresh(recount=False)
+        else:
+            self.scroll(int(amount) * (self.page_size() if what == "pages" else 1))
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.refresh(recount=False)
+
+    def show(self, row):
+        """Scroll so the row-th row (0-based) is in view."""
+        size = self.page_size()
+        if not self.offset <= row < self.offset + size:
+            self.offset = max(0, row - size // 2)
+        self.refresh(recount=False)
+
+    def on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection and selection[0] < len(self.keys):
+            self.selected = self.keys[selection[0]]
+
+    def move_selection(self, step):
+        if self.selected in self.keys:
+            row = self.offset + self.keys.index(self.selected) + step
+        else:
+            row = self.offset
+        row = max(0, min(row, self.total - 1))
+        self.show(row)
+        if 0 <= row - self.offset < len(self.keys):
+            self.selected = self.keys[row - self.offset]
+            self.refresh(recount=False)
+
 class EditorWindow(tk.Toplevel):
-    def __init__(self, parent, existing_exam=None, exam_path=None):
+    """
+    Edit an exam of any size. Questions live in an ExamStore, so the list
+    shows only the rows in view, the filter box searches the store's
+    full-text index as you type, and every add/edit/delete is written to the
+    working copy at once; "Save" exports the exam JSON from it.
+    """
+    def __init__(self, parent, existing_exam=None, exam_path=None, store=None):
         super().__init__(parent)
         self.title("ExaMate - Exam Editor")
         self.geometry("800x700")  # Increased size for better layout
         self.minsize(700, 600)     # Minimum size for responsiveness
 
         self.exam_path = exam_path  # Path to existing exam
-        self.questions = existing_exam.get("questions", []) if existing_exam else []  # List of question dicts
+        self.worker_thread = None
+        self.worker_status = ""
+        self.worker_job = None
+        reload_needed = False
+        if store is None:
+            if exam_path and os.path.exists(exam_path):
+                # Only the working copy is opened here; if the exam file changed, it is re-imported in the background
+                store = ExamStore.working_copy(exam_path)
+                reload_needed = not store.is_current(exam_path)
+            else:
+                store = ExamStore()
+                if existing_exam:
+                    store.title = existing_exam.get("title", store.title)
+                    store.import_questions(existing_exam.get("questions", []))
+        self.store = store
+        self.query = ""
+        self.filter_job = None
 
         tk.Label(self, text="Exam Editor", font=("Segoe UI",16,"bold")).pack(pady=10)
 
         # Frame for adding questions and listing existing ones
         frame = tk.Frame(self)
         frame.pack(pady=5, padx=10, fill="both", expand=True)
-        frame.grid_rowconfigure(1, weight=1)
+        frame.grid_rowconfigure(2, weight=1)
         frame.grid_columnconfigure(0, weight=1)
 
         # Buttons for adding, editing, deleting questions
         btn_frame = tk.Frame(frame)
         btn_frame.grid(row=0, column=0, sticky="ew", pady=5)
-        btn_frame.grid_columnconfigure((0,1,2), weight=1)
+        btn_frame.grid_columnconfigure((0,1,2,3), weight=1)
 
         add_btn = tk.Button(btn_frame, text="Add Question", command=self.add_question)
         add_btn.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
@@ -42,87 +176,195 @@ class EditorWindow(tk.Toplevel):
         delete_btn = tk.Button(btn_frame, text="Delete Selected Question", command=self.delete_selected_question)
         delete_btn.grid(row=0, column=2, padx=5, pady=5, sticky="ew")
 
-        # Listbox to display questions
-        self.questions_listbox = tk.Listbox(frame, font=("Segoe UI",11))
-        self.questions_listbox.grid(row=1, column=0, sticky="nsew", pady=5)
-        self.refresh_questions_listbox()
-
-        # Scrollbar for the listbox
-        list_scroll = tk.Scrollbar(frame, orient="vertical", command=self.questions_listbox.yview)
-        list_scroll.grid(row=1, column=1, sticky="ns")
-        self.questions_listbox.config(yscrollcommand=list_scroll.set)
+        import_btn = tk.Button(btn_frame, text="Import Questions...", command=self.import_questions)
+        import_btn.grid(row=0, column=3, padx=5, pady=5, sticky="ew")
+        self.edit_buttons = [add_btn, edit_btn, delete_btn, import_btn]
+
+        # Filter box, applied a moment after typing stops
+        filter_frame = tk.Frame(frame)
+        filter_frame.grid(row=1, column=0, sticky="ew", pady=5)
+        filter_frame.grid_columnconfigure(1, weight=1)
+        tk.Label(filter_frame, text="Filter:", font=("Segoe UI",11)).grid(row=0, column=0, padx=5)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+        tk.Entry(filter_frame, textvariable=self.filter_var, font=("Segoe UI",11)).grid(row=0, column=1, sticky="ew", padx=5)
+        self.status_label = tk.Label(filter_frame, font=("Segoe UI",10), fg="gray")
+        self.status_label.grid(row=0, column=2, padx=5)
+
+        # Only the questions in view are read from the store
+        self.questions_list = VirtualList(frame, self.fetch_rows, self.count_rows, on_activate=self.edit_selected_question)
+        self.questions_list.grid(row=2, column=0, sticky="nsew", pady=5)
 
         # Buttons for saving and closing
         save_btn = tk.Button(frame, text="Save Exam to JSON", font=("Segoe UI",12), command=self.save_exam)
-        save_btn.grid(row=2, column=0, pady=5, sticky="ew")
+        save_btn.grid(row=3, column=0, pady=5, sticky="ew")
+        self.edit_buttons.append(save_btn)
 
-        close_btn = tk.Button(frame, text="Close Editor", font=("Segoe UI",12), command=self.destroy)
-        close_btn.grid(row=3, column=0, pady=5, sticky="ew")
+        close_btn = tk.Button(frame, text="Close Editor", font=("Segoe UI",12), command=self.close_editor)
+        close_btn.grid(row=4, column=0, pady=5, sticky="ew")
+        self.protocol("WM_DELETE_WINDOW", self.close_editor)
+
+        self.refresh_questions_listbox()
+        if reload_needed and self.store.changes:
+            # Reloading would drop the edits left by the last session, so ask first
+            if messagebox.askyesno(
+                    "Exam Changed",
+                    f"{os.path.basename(exam_path)} changed since the last editing session, which left "
+                    f"{self.store.changes} unsaved change(s).\n\nLoad the changed file and discard them?\n"
+                    "(No keeps editing them; saving then overwrites the file.)", parent=self):
+                self.run_in_background("Loading", lambda worker_store: worker_store.reload(exam_path))
+        elif reload_needed:
+            self.run_in_background("Loading", lambda worker_store: worker_store.reload(exam_path))
+        elif self.store.changes and not self.store.temporary:
+            messagebox.showinfo("Unsaved Changes", f"Restored {self.store.changes} unsaved change(s) "
+                                "from the last editing session.", parent=self)
+
+    # --- Background work ---
+
+    def run_in_background(self, status, work, on_done=None):
+        """
+        Run work(store) on a thread, over a connection of its own to the
+        working copy, with editing disabled; the list fills in as the work
+        commits its batches. on_done(result) then runs on the Tk thread.
+        """
+        outcome = {}
+
+        def run():
+            worker_store = ExamStore(self.store.db_path)
+            try:
+                outcome["result"] = work(worker_store)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                worker_store.close()
+        for button in self.edit_buttons:
+            button.config(state="disabled")
+        self.worker_status = status
+        self.worker_thread = threading.Thread(target=run, daemon=True)
+        self.worker_thread.start()
+        self.worker_job = self.after(WORKER_POLL_MS, self.check_worker, outcome, on_done)
+
+    def check_worker(self, outcome, on_done):
+        self.worker_job = None
+        self.refresh_questions_listbox()
+        if self.worker_thread.is_alive():
+            self.worker_job = self.after(WORKER_POLL_MS, self.check_worker, outcome, on_done)
+            return
+        self.worker_thread = None
+        for button in self.edit_buttons:
+            button.config(state="normal")
+        self.refresh_questions_listbox()
+        if "error" in outcome:
+            messagebox.showerror("Error", f"{self.worker_status} failed.\n{outcome['error']}", parent=self)
+        elif on_done:
+            on_done(outcome["result"])
+
+    # --- List ---
+
+    def fetch_rows(self, offset, limit):
+        return [(qid, f"Q{idx}: #{number}  {summary}" + (f"  [{images} image(s)]" if images else ""))
+                for qid, idx, number, summary, images in self.store.rows(offset, limit, self.query)]
+
+    def count_rows(self):
+        return self.store.count(self.query)
 
     def refresh_questions_listbox(self):
-        self.questions_listbox.delete(0, tk.END)
-        for idx, q in enumerate(self.questions, start=1):
-            qnum = q.get("question_number", "?")
-            self.questions_listbox.insert(tk.END, f"Q{idx}: #{qnum}")
+        self.questions_list.refresh()
+        shown, total = self.questions_list.total, self.store.count()
+        status = f"{shown} of {total} questions" if self.query else f"{total} questions"
+        if self.worker_thread:
+            status = f"{self.worker_status}... {status}"
+        elif self.store.changes:
+            status += f", {self.store.changes} unsaved change(s)"
+        self.status_label.config(text=status)
+
+    def schedule_filter(self):
+        if self.filter_job:
+            self.after_cancel(self.filter_job)
+        self.filter_job = self.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self.filter_job = None
+        self.query = self.filter_var.get().strip()
+        self.questions_list.offset = 0
+        self.refresh_questions_listbox()
+
+    def selected_question_id(self):
+        return self.questions_list.selected if self.questions_list.selected in self.questions_list.keys else None
+
+    # --- Editing ---
 
     def add_question(self):
         # Open a dialog to input question details
         dialog = QuestionEditorDialog(self)
         self.wait_window(dialog)
         if dialog.result:
-            self.questions.append(dialog.result)
+            question_id = self.store.add(dialog.result)
+            self.questions_list.selected = question_id
             self.refresh_questions_listbox()
+            row = self.store.row_of(question_id, self.query)
+            if row is not None:
+                self.questions_list.show(row)
             messagebox.showinfo("Success", "Question added successfully!")
 
     def edit_selected_question(self):
-        selected = self.questions_listbox.curselection()
-        if not selected:
+        if self.worker_thread:
+            return  # Double-click while the exam is still loading
+        question_id = self.selected_question_id()
+        if question_id is None:
             messagebox.showinfo("No Selection", "Please select a question to edit.")
             return
-        index = selected[0]
-        question = self.questions[index]
+        question = self.store.get(question_id)
 
         # Open a dialog with existing question data
         dialog = QuestionEditorDialog(self, existing_question=question)
         self.wait_window(dialog)
         if dialog.result:
-            self.questions[index] = dialog.result
+            self.store.update(question_id, dialog.result)
             self.refresh_questions_listbox()
             messagebox.showinfo("Success", "Question updated successfully!")
 
     def delete_selected_question(self):
-        selected = self.questions_listbox.curselection()
-        if not selected:
+        question_id = self.selected_question_id()
+        if question_id is None:
             messagebox.showinfo("No Selection", "Please select a question to delete.")
             return
-        index = selected[0]
-        confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete Question {index+1}?")
+        number = self.store.get(question_id).question_number
+        confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete Question #{number}?")
         if confirm:
-            del self.questions[index]
+            self.store.delete(question_id)
+            self.questions_list.selected = None
             self.refresh_questions_listbox()
             messagebox.showinfo("Deleted", "Question deleted successfully!")
 
+    def import_questions(self):
+        path = filedialog.askopenfilename(
+            title="Import Questions",
+            filetypes=[("CSV, Markdown or Exam JSON", "*.csv *.md *.markdown *.txt *.json"), ("All Files", "*.*")],
+            parent=self
+        )
+        if not path:
+            return
+        self.run_in_background("Importing", lambda worker_store: bulk_import.import_questions(worker_store, path),
+                                self.show_import_report)
+
+    def show_import_report(self, report):
+        self.questions_list.show(self.questions_list.total - 1)
+        show = messagebox.showwarning if report["errors"] else messagebox.showinfo
+        show("Import", bulk_import.format_report(report, limit=15), parent=self)
+
+    # --- Saving ---
+
     def save_exam(self):
-        if not self.questions:
+        if not self.store.count():
             messagebox.showerror("Error", "No questions to save.")
             return
-        exam_title = simpledialog.askstring("Exam Title", "Enter the exam title:", initialvalue="Untitled Exam")
+        exam_title = simpledialog.askstring("Exam Title", "Enter the exam title:", initialvalue=self.store.title)
         if not exam_title:
             exam_title = "Untitled Exam"
-        data = {
-            "title": exam_title,
-            "questions": self.questions
-        }
 
-        if self.exam_path:
-            # Overwrite existing exam
-            try:
-                with open(self.exam_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                messagebox.showinfo("Success", f"Exam saved to {self.exam_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save exam.\n{e}")
-        else:
+        save_path = self.exam_path
+        if not save_path:
             # Save as new exam
             save_path = filedialog.asksaveasfilename(
                 title="Save Exam as JSON",
@@ -131,12 +373,31 @@ class EditorWindow(tk.Toplevel):
             )
             if not save_path:
                 return
-            try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-                messagebox.showinfo("Success", f"Exam saved to {save_path}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save exam.\n{e}")
+        try:
+            self.store.export(save_path, exam_title, index=True)
+            self.exam_path = save_path
+            self.refresh_questions_listbox()
+            messagebox.showinfo("Success", f"Exam saved to {save_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save exam.\n{e}")
+
+    def close_editor(self):
+        # The worker has its own connection to the working copy: its files can't go while it runs
+        if self.worker_thread:
+            messagebox.showinfo("Please Wait", f"{self.worker_status} is still running. "
+                                "Close the editor once it has finished.", parent=self)
+            return
+        # A new exam's working copy is temporary; an existing exam's keeps unsaved edits for next time
+        if self.store.temporary and self.store.changes and not messagebox.askyesno(
+                "Unsaved Changes", "Close the editor and discard the unsaved questions?", parent=self):
+            return
+        if self.worker_job:
+            self.after_cancel(self.worker_job)
+        if self.filter_job:
+            self.after_cancel(self.filter_job)
+        # With nothing left to save the working copy is just a copy of the file: remove it
+        self.store.close(delete=not self.store.changes)
+        self.destroy()
 
 class QuestionEditorDialog(tk.Toplevel):
     """
@@ -149,7 +410,12 @@ class QuestionEditorDialog(tk.Toplevel):
         self.geometry("700x800")  # Increased size for better layout
         self.minsize(600, 700)     # Minimum size for responsiveness
 
-        self.result = None  # To store the question data
+        self.result = None  # The edited Question
+        self.extra = existing_question.extra if existing_question else None
+        # Parts as loaded: saved back unchanged, or with just their text replaced, unless images change
+        self.question_parts = existing_question.question_parts if existing_question else ()
+        self.question_text = existing_question.question_text.strip() if existing_question else ""
+        self.question_images_changed = False
 
         # Frame for all widgets
         frame = tk.Frame(self)
@@ -161,126 +427,175 @@ class QuestionEditorDialog(tk.Toplevel):
         tk.Label(frame, text="Question Number:", font=("Segoe UI",11)).grid(row=0, column=0, sticky="w", pady=5)
         self.qnum_var = tk.StringVar()
         if existing_question:
-            self.qnum_var.set(existing_question.get("question_number", ""))
+            self.qnum_var.set(existing_question.question_number)
         tk.Entry(frame, textvariable=self.qnum_var, width=10, font=("Segoe UI",11)).grid(row=0, column=1, sticky="w", pady=5)
 
         # Question Text with Rich Text Support
         tk.Label(frame, text="Question Text (Use Markdown for rich text):", font=("Segoe UI",11)).grid(row=1, column=0, sticky="nw", pady=5)
         self.qtext_box = tk.Text(frame, height=10, wrap="word", font=("Segoe UI",11))
         if existing_question:
-            # Combine question parts text
-            qtext = " ".join([part[1] for part in existing_question.get("question_parts", []) if part[0] == "text"])
-            self.qtext_box.insert("1.0", qtext)
+            self.qtext_box.insert("1.0", existing_question.question_text)
         self.qtext_box.grid(row=1, column=1, sticky="nsew", pady=5)
 
-        # Button to attach image to question
-        img_btn = tk.Button(frame, text="Attach Image to Question", command=self.attach_question_image)
-        img_btn.grid(row=2, column=1, sticky="w", pady=5)
-
+        # Question images: every image part is kept, in order; Attach adds one more
+        img_frame = tk.Frame(frame)
+        img_frame.grid(row=2, column=1, sticky="w", pady=5)
+        tk.Button(img_frame, text="Attach Image to Question", command=self.attach_question_image).grid(row=0, column=0, sticky="w")
+        tk.Button(img_frame, text="Remove Images", command=self.clear_question_images).grid(row=0, column=1, padx=5)
+        self.question_previews = tk.Frame(img_frame)
+        self.question_previews.grid(row=1, column=0, columnspan=2, sticky="w")
+        self.question_images = []   # (part type, content) of each image part
         if existing_question:
-            # If there's an image, indicate it
-            for part in existing_question.get("question_parts", []):
-                if part[0] == "image_base64":
-                    self.question_image = part[1]
-                    messagebox.showinfo("Image Attached", "An image is already attached to this question.")
-
-        # Answers Section
-        tk.Label(frame, text="Answers:", font=("Segoe UI",11,"bold")).grid(row=3, column=0, sticky="nw", pady=5)
+            self.question_images = [(ptype, content) for ptype, content in existing_question.question_parts if ptype != TEXT]
+        self.show_question_images()
+
+        # Answers Section: one row per answer, as many as the question has
+        answers_header = tk.Frame(frame)
+        answers_header.grid(row=3, column=0, columnspan=2, sticky="ew", pady=5)
+        tk.Label(answers_header, text="Answers:", font=("Segoe UI",11,"bold")).pack(side="left")
+        tk.Button(answers_header, text="Remove Last Answer", command=self.remove_answer).pack(side="right")
+        tk.Button(answers_header, text="Add Answer", command=self.add_answer).pack(side="right", padx=5)
+        self.answers_frame = tk.Frame(frame)
+        self.answers_frame.grid(row=4, column=0, columnspan=2, sticky="ew")
+        self.answers_frame.grid_columnconfigure(1, weight=1)
         self.answers = []
-        for i in range(4):
-            ans_frame = tk.Frame(frame)
-            ans_frame.grid(row=4+i, column=0, columnspan=2, sticky="ew", pady=2)
-            ans_frame.grid_columnconfigure(1, weight=1)
-
-            tk.Label(ans_frame, text=f"Answer {chr(65+i)}:", font=("Segoe UI",11)).grid(row=0, column=0, sticky="w")
-            ans_entry = tk.Entry(ans_frame, font=("Segoe UI",11))
-            if existing_question:
-                if i < len(existing_question.get("answers", [])):
-                    ans_text = " ".join([part[1] for part in existing_question["answers"][i] if part[0] == "text"])
-                    ans_entry.insert(0, ans_text)
-            ans_entry.grid(row=0, column=1, sticky="ew", padx=5)
-
-            img_btn_ans = tk.Button(ans_frame, text="Attach Image", command=lambda idx=i: self.attach_answer_image(idx))
-            img_btn_ans.grid(row=0, column=2, padx=5)
-
-            self.answers.append({
-                "text_var": ans_entry,
-                "image_data": None  # To store base64 image data
-            })
-
-            if existing_question:
-                # Load existing answer images if any
-                if i < len(existing_question.get("answers", [])):
-                    for part in existing_question["answers"][i]:
-                        if part[0] == "image_base64":
-                            self.answers[i]["image_data"] = part[1]
-                            messagebox.showinfo("Image Attached", f"An image is already attached to Answer {chr(65+i)}.")
+        if existing_question:
+            for text, parts in zip(existing_question.answer_texts, existing_question.answers):
+                self.add_answer(text, parts)
+        else:
+            for _ in range(DEFAULT_ANSWERS):
+                self.add_answer()
 
         # Correct Answers Entry
-        tk.Label(frame, text="Correct Answer(s) (e.g., A,C):", font=("Segoe UI",11)).grid(row=8, column=0, sticky="w", pady=5)
+        tk.Label(frame, text="Correct Answer(s) (e.g., A,C):", font=("Segoe UI",11)).grid(row=5, column=0, sticky="w", pady=5)
         self.correct_var = tk.StringVar()
         if existing_question:
-            self.correct_var.set(",".join(existing_question.get("correct_answers", [])))
-        tk.Entry(frame, textvariable=self.correct_var, font=("Segoe UI",11)).grid(row=8, column=1, sticky="w", pady=5)
+            self.correct_var.set(",".join(existing_question.correct_answers))
+        tk.Entry(frame, textvariable=self.correct_var, font=("Segoe UI",11)).grid(row=5, column=1, sticky="w", pady=5)
 
         # Save Question Button
         save_btn = tk.Button(frame, text="Save Question", font=("Segoe UI",12), command=self.save_question)
-        save_btn.grid(row=9, column=1, sticky="e", pady=10)
+        save_btn.grid(row=6, column=1, sticky="e", pady=10)
 
-    def attach_question_image(self):
-        path = filedialog.askopenfilename(
-            title="Select Image for Question",
-            filetypes=[("Image Files", "*.png *.jpg *.jpeg *.gif")]
-        )
-        if not path:
+    def add_answer(self, text="", parts=()):
+        index = len(self.answers)
+        if index >= MAX_ANSWERS:
             return
-        try:
-            with open(path, "rb") as img_file:
-                encoded = base64.b64encode(img_file.read()).decode("utf-8")
-            self.question_image = encoded
-            messagebox.showinfo("Success", "Image attached to question.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to attach image.\n{e}")
+        label = tk.Label(self.answers_frame, text=f"Answer {chr(65+index)}:", font=("Segoe UI",11))
+        label.grid(row=index, column=0, sticky="w", pady=2)
+        entry = tk.Entry(self.answers_frame, font=("Segoe UI",11))
+        entry.insert(0, text)
+        entry.grid(row=index, column=1, sticky="ew", padx=5, pady=2)
+        button = tk.Button(self.answers_frame, text="Attach Image", command=lambda: self.attach_answer_image(index))
+        button.grid(row=index, column=2, padx=5, pady=2)
+        preview = tk.Label(self.answers_frame, fg="gray")
+        preview.grid(row=index, column=3, padx=5, pady=2)
+        self.answers.append({
+            "entry": entry,
+            "parts": parts,             # as loaded, see edited_parts
+            "text": text,
+            "images": [(ptype, content) for ptype, content in parts if ptype != TEXT],
+            "images_changed": False,
+            "preview": preview,
+            "widgets": (label, entry, button, preview),
+        })
+        self.show_answer_images(index)
+
+    def remove_answer(self):
+        if len(self.answers) <= 1:
+            return
+        for widget in self.answers.pop()["widgets"]:
+            widget.destroy()
+
+    def attach_question_image(self):
+        encoded = self.choose_image("Select Image for Question")
+        if encoded:
+            self.question_images.append((IMAGE_BASE64, encoded))
+            self.question_images_changed = True
+            self.show_question_images()
+
+    def clear_question_images(self):
+        self.question_images = []
+        self.question_images_changed = True
+        self.show_question_images()
 
     def attach_answer_image(self, index):
+        encoded = self.choose_image(f"Select Image for Answer {chr(65+index)}")
+        if encoded:
+            self.answers[index]["images"] = [(IMAGE_BASE64, encoded)]
+            self.answers[index]["images_changed"] = True
+            self.show_answer_images(index)
+
+    def choose_image(self, title):
+        """Base64 of an image file the user picks, or None."""
         path = filedialog.askopenfilename(
-            title=f"Select Image for Answer {chr(65+index)}",
+            title=title,
             filetypes=[("Image Files", "*.png *.jpg *.jpeg *.gif")]
         )
         if not path:
-            return
+            return None
         try:
             with open(path, "rb") as img_file:
-                encoded = base64.b64encode(img_file.read()).decode("utf-8")
-            self.answers[index]["image_data"] = encoded
-            messagebox.showinfo("Success", f"Image attached to Answer {chr(65+index)}.")
+                return base64.b64encode(img_file.read()).decode("utf-8")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to attach image.\n{e}")
+            return None
+
+    def show_question_images(self):
+        for label in self.question_previews.winfo_children():
+            label.destroy()
+        for i, (ptype, content) in enumerate(self.question_images):
+            label = tk.Label(self.question_previews, fg="gray")
+            label.grid(row=0, column=i, padx=(0, 10))
+            self.show_thumbnail(label, content if ptype == IMAGE_BASE64 else None, QUESTION_THUMBNAIL)
+
+    def show_answer_images(self, index):
+        answer = self.answers[index]
+        preview = answer["preview"]
+        if not answer["images"]:
+            preview.config(image="", text="")
+            return
+        ptype, content = answer["images"][0]
+        self.show_thumbnail(preview, content if ptype == IMAGE_BASE64 else None, ANSWER_THUMBNAIL)
+        if len(answer["images"]) > 1:
+            preview.config(text=f"+{len(answer['images']) - 1}", compound="left")
+
+    def show_thumbnail(self, label, image_base64, max_size):
+        """Show an attached image in label, shrunk to max_size (decoded once, see image_cache)."""
+        try:
+            photo = ImageTk.PhotoImage(thumbnail(image_base64, max_size))
+        except Exception:
+            label.config(image="", text="[image attached]")
+            return
+        label.config(image=photo, text="")
+        label.image = photo  # Keep a reference
+
+    @staticmethod
+    def edited_parts(parts, shown_text, text, images):
+        """
+        parts after editing. Untouched if the text is unchanged, with the text
+        replaced around the images otherwise, so a text/image/text question keeps
+        its layout; rebuilt as text + images only once the user changed images.
+        """
+        if images is not None:
+            return [(TEXT, text)] + images
+        if text == shown_text:
+            return parts
+        return replace_text(parts, text)
 
     def save_question(self):
         qnum = self.qnum_var.get().strip()
         qtext = self.qtext_box.get("1.0", "end").strip()
-        correct = [x.strip().upper() for x in self.correct_var.get().split(",") if x.strip()]
-        if not qtext or not correct:
-            messagebox.showerror("Error", "Question text and correct answers are required.")
+        correct = bulk_import.parse_letters(self.correct_var.get())
+        question_parts = self.edited_parts(self.question_parts, self.question_text, qtext,
+                                           self.question_images if self.question_images_changed else None)
+        answers = [self.edited_parts(ans["parts"], ans["text"], ans["entry"].get().strip(),
+                                     ans["images"] if ans["images_changed"] else None)
+                   for ans in self.answers]
+        question = Question(qnum, question_parts, answers, correct, self.extra)
+        error = bulk_import.validate(question.to_dict())
+        if error:
+            messagebox.showerror("Error", f"Can't save the question: {error}.", parent=self)
             return
-        # Build question_parts with rich text
-        question_parts = [("text", qtext)]
-        if hasattr(self, 'question_image'):
-            question_parts.append(("image_base64", self.question_image))
-        # Build answers with rich text
-        answers = []
-        for ans in self.answers:
-            parts = [("text", ans["text_var"].get().strip())]
-            if ans["image_data"]:
-                parts.append(("image_base64", ans["image_data"]))
-            answers.append(parts)
-        # Build question object
-        qobj = {
-            "question_number": qnum if qnum else "0",
-            "question_parts": question_parts,
-            "answers": answers,
-            "correct_answers": correct
-        }
-        self.result = qobj
+        self.result = question
         self.destroy()
@@ -0,0 +1,107 @@
+# exam_generator.py
+
+import os
+import random
+import struct
+import zlib
+
+WORDS = ("instance bucket policy region latency replica cluster function queue stream table cache "
+         "gateway subnet role encryption snapshot endpoint volume certificate pipeline").split()
+
+def make_png(width, height, seed=0):
+    """A valid RGB PNG of the given size with noisy pixels (so it doesn't compress to nothing)."""
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def card_html(number, rng, answers=4, multi_answer_rate=0.2, vote_bar_rate=0.5, image_rate=0.1,
+              question_words=60, answer_words=20):
+    """One ExamTopics-style exam-question-card. Returns (html, image names it references)."""
+    letters = "ABCDEFGHIJ"[:answers]
+    picks = 2 if answers > 3 and rng.random() < multi_answer_rate else 1
+    correct = sorted(rng.sample(letters, picks))
+    images = []
+
+    question_image = ""
+    if rng.random() < image_rate:
+        images.append(f"q{number}.png")
+        question_image = f'<br><img src="images/q{number}.png">'
+    items = []
+    for letter in letters:
+        answer_image = ""
+        if rng.random() < image_rate / answers:
+            images.append(f"q{number}{letter}.png")
+            answer_image = f'<img src="images/q{number}{letter}.png">'
+        badge = ' <span class="badge badge-success most-voted-answer-badge">Most Voted</span>' if letter in correct else ""
+        css = "multi-choice-item correct-hidden" if letter in correct else "multi-choice-item"
+        items.append(f'<li class="{css}"><span class="multi-choice-letter">{letter}.</span> '
+                     f'{sentence(rng, answer_words)}{answer_image}{badge}</li>')
+
+    answer_key = "".join(correct)
+    if rng.random() < vote_bar_rate:
+        votes = (f'<div class="vote-bar progress-bar bg-primary" style="width: 90%">{answer_key} '
+                 f'{rng.randint(55, 99)}%</div>')
+    else:
+        votes = f'<span class="correct-answer">{answer_key}</span>'
+    html = (
+        f'<div class="card exam-question-card">\n'
+        f'<div class="card-header text-white bg-primary">Question #{number} <span class="question-title-topic">Topic 1</span></div>\n'
+        f'<div class="card-body question-body">\n'
+        f'<p class="card-text">{sentence(rng, question_words)}{question_image}</p>\n'
+        f'<div class="question-choices-container"><ul>\n' + "\n".join(items) + '\n</ul></div>\n'
+        f'<p class="card-text question-answer bg-light white-text">Correct Answer: {votes}</p>\n'
+        f'</div>\n</div>\n'
+    )
+    return html, images
+
+def generate_exam_folder(folder, questions=1000, cards_per_page=10, answers=4, multi_answer_rate=0.2,
+                         vote_bar_rate=0.5, image_rate=0.1, image_size=(64, 48), seed=0):
+    """
+    Write a folder of ExamTopics-style pages (cards_per_page questions each)
+    plus the images they reference under folder/images, the way the pages of
+    a saved exam look. Everything derives from seed. Returns the file count.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(folder, "images"), exist_ok=True)
+    files = 0
+    for page_no, first in enumerate(range(1, questions + 1, cards_per_page), start=1):
+        cards = []
+        for number in range(first, min(first + cards_per_page, questions + 1)):
+            html, images = card_html(number, rng, answers, multi_answer_rate, vote_bar_rate, image_rate)
+            cards.append(html)
+            for name in images:
+                with open(os.path.join(folder, "images", name), "wb") as fh:
+                    fh.write(make_png(*image_size, seed=number))
+                files += 1
+        page = (
+            f"<!DOCTYPE html>\n<html><head><title>Synthetic Exam Certified page {page_no} - ExamTopics</title>"
+            f"<script>window.dataLayer = [];</script></head>\n<body><nav>Home | Exams</nav>\n"
+            f'<div class="questions-container">\n{"".join(cards)}</div>\n</body></html>\n'
+        )
+        with open(os.path.join(folder, f"page-{page_no:05d}.html"), "w", encoding="utf-8") as fh:
+            fh.write(page)
+        files += 1
+    return files
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a synthetic ExamTopics-style HTML exam folder.")
+    parser.add_argument("folder")
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--cards-per-page", type=int, default=10)
+    parser.add_argument("--answers", type=int, default=4)
+    parser.add_argument("--multi-answer-rate", type=float, default=0.2)
+    parser.add_argument("--vote-bar-rate", type=float, default=0.5)
+    parser.add_argument("--image-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    count = generate_exam_folder(args.folder, args.questions, args.cards_per_page, args.answers,
+                                 args.multi_answer_rate, args.vote_bar_rate, args.image_rate, seed=args.seed)
+    print(f"Wrote {count} files to {args.folder}")
@@ -0,0 +1,182 @@
+# exam_io.py
+
+import os
+import json
+import textwrap
+from question_model import Question
+
+class ExamStreamWriter:
+    """
+    Writes an exam JSON one question at a time, so callers never have to hold
+    the whole question list in memory. Output matches json.dump(indent=2).
+    The file is built as '<path>.part' and renamed into place on close(),
+    so readers never see a half-written exam.
+    """
+    def __init__(self, output_json_path, title="ParsedExam"):
+        self.path = output_json_path
+        self.tmp_path = output_json_path + ".part"
+        self.count = 0
+        folder = os.path.dirname(output_json_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._fh = open(self.tmp_path, "w", encoding="utf-8")
+        self._fh.write("{\n")
+        self._fh.write(f'  "title": {json.dumps(title)},\n')
+        self._fh.write('  "questions": [')
+
+    def append(self, question):
+        """Append one question (a dict or a question_model.Question) to the exam."""
+        if isinstance(question, Question):
+            question = question.to_dict()
+        self._fh.write(",\n" if self.count else "\n")
+        self._fh.write(textwrap.indent(json.dumps(question, indent=2), "    "))
+        self._fh.flush()
+        self.count += 1
+
+    @property
+    def closed(self):
+        return self._fh.closed
+
+    def close(self):
+        """Finish the JSON document and move it to its final path."""
+        if self._fh.closed:
+            return
+        self._fh.write("\n  ]\n}" if self.count else "]\n}")
+        self._fh.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """Drop the partial output, leaving any existing exam untouched."""
+        if not self._fh.closed:
+            self._fh.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+class ExamStreamReader:
+    """
+    Reads an exam JSON one question at a time, without loading the file.
+    Top-level keys before "questions" (the title, which ExamStreamWriter and
+    json.dump both write first) are in .meta as soon as the reader is open;
+    keys after it once the questions were read. Any valid exam JSON works,
+    whatever its indentation.
+
+        with ExamStreamReader("exams/aws.json") as reader:
+            for question in reader:     # question dicts, in file order
+                ...
+    """
+    CHUNK = 1 << 16
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = {}
+        self._fh = open(path, "r", encoding="utf-8")
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        self._in_questions = False
+        try:
+            if self._next_char() != "{":
+                raise ValueError(f"{path}: an exam must be a JSON object")
+            self._pos += 1
+            self._read_keys()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def title(self):
+        return self.meta.get("title", "ParsedExam")
+
+    def __iter__(self):
+        if not self._in_questions:
+            return
+        while True:
+            char = self._next_char()
+            if char == "]":
+                self._pos += 1
+                self._in_questions = False
+                self._read_keys()
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            yield self._value()
+
+    # --- Tokenizing ---
+
+    def _more(self, at_least=CHUNK):
+        """Read at least at_least more characters (fewer at the end of the file)."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        chunk = self._fh.read(max(at_least, self.CHUNK))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf += chunk
+        return True
+
+    def _next_char(self):
+        """The next non-whitespace character, without consuming it ("" at the end of the file)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._more():
+                return self._buf[self._pos:self._pos + 1]
+
+    def _value(self):
+        """Decode the JSON value at the current position, reading as much of the file as it needs."""
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete: read as much again as is buffered, so a large question costs O(size) overall
+                if not self._more(len(self._buf) - self._pos):
+                    raise
+                continue
+            if end == len(self._buf) and self._more():
+                continue    # A number or literal may go on in the next chunk
+            self._pos = end
+            return value
+
+    def _read_keys(self):
+        """Read top-level keys into meta up to "questions" (or the end of the object)."""
+        while True:
+            char = self._next_char()
+            if char == ",":
+                self._pos += 1
+                continue
+            if char == "}" or not char:
+                return
+            key = self._value()
+            if self._next_char() != ":":
+                raise ValueError(f"{self.path}: expected ':' after {key!r}")
+            self._pos += 1
+            if key == "questions" and self._next_char() == "[":
+                self._pos += 1
+                self._in_questions = True
+                return
+            self.meta[key] = self._value()
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,293 @@
+# exam_store.py
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from exam_io import ExamStreamReader, ExamStreamWriter
+from question_model import Question
+from search_index import question_entry, match_expression, update_index_for
+
+EDIT_FOLDER = ".edit"       # Working copies of exams being edited, next to the exams
+SUMMARY_LENGTH = 120
+
+logger = logging.getLogger(__name__)
+
+def filter_expression(query):
+    """
+    FTS5 expression for an as-you-type filter: like search_index.match_expression,
+    but the last word also matches longer words ("kine" finds "kinesis").
+    """
+    query = query.strip()
+    if query and not query.endswith(('"', "*")) and re.search(r"\w$", query):
+        query += "*"
+    return match_expression(query)
+
+class ExamStore:
+    """
+    An exam being edited, one SQLite row per question. Every edit is its own
+    small transaction touching only that question (and its search-index
+    row), so the working copy is always consistent and nothing is rewritten
+    wholesale; export() streams the rows back out as exam JSON, atomically.
+
+    Lists read only numbers and summaries, a page at a time; the full
+    question (images included) is read by get() when it is opened.
+    Positions stay 0..n-1, so a row's place in the exam needs no counting.
+    """
+    def __init__(self, db_path=None):
+        self.temporary = db_path is None
+        if self.temporary:
+            handle, db_path = tempfile.mkstemp(prefix="examate-edit-", suffix=".db")
+            os.close(handle)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            position INTEGER NOT NULL,
+            number TEXT,
+            summary TEXT,
+            images INTEGER,
+            data TEXT NOT NULL          -- the question's exam-JSON dict
+        );
+        CREATE INDEX IF NOT EXISTS questions_position ON questions (position);
+        CREATE VIRTUAL TABLE IF NOT EXISTS question_fts USING fts5(body, tokenize = 'porter unicode61');
+        """)
+
+    @classmethod
+    def working_copy(cls, exam_path):
+        """The working copy of exam_path, kept in EDIT_FOLDER next to it, as it is (see is_current)."""
+        folder = os.path.join(os.path.dirname(os.path.abspath(exam_path)), EDIT_FOLDER)
+        os.makedirs(folder, exist_ok=True)
+        return cls(os.path.join(folder, os.path.basename(exam_path) + ".db"))
+
+    @classmethod
+    def open_exam(cls, exam_path):
+        """
+        The working copy of exam_path, reused while the exam file is unchanged
+        (keeping unsaved edits) and re-imported when the file changed since.
+        """
+        store = cls.working_copy(exam_path)
+        if not store.is_current(exam_path):
+            store.reload(exam_path)
+        return store
+
+    def is_current(self, exam_path):
+        """Whether the store holds exam_path as last imported or saved (plus any edits since)."""
+        stat = os.stat(exam_path)
+        return self.meta("source_mtime") == stat.st_mtime and self.meta("source_size") == stat.st_size
+
+    def reload(self, exam_path, batch_size=500):
+        """Replace the contents with exam_path's, streamed in; each batch is visible to readers as it commits."""
+        if self.changes:
+            logger.warning("Discarding %d unsaved edit(s) of %s: the exam file changed since", self.changes, exam_path)
+        self.clear()
+        count = self.import_exam(exam_path, batch_size)
+        self.mark_saved(exam_path)
+        return count
+
+    # --- Metadata ---
+
+    def meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def title(self):
+        return self.meta("title", "Untitled Exam")
+
+    @title.setter
+    def title(self, value):
+        with self.conn:
+            self.set_meta("title", value)
+
+    @property
+    def changes(self):
+        """Edits since the exam was imported or last exported."""
+        return self.meta("changes", 0)
+
+    def _changed(self, count=1):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES ('changes', ?) "
+                          "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value", (count,))
+
+    def mark_saved(self, exam_path):
+        stat = os.stat(exam_path)
+        with self.conn:
+            self.set_meta("changes", 0)
+            self.set_meta("source_mtime", stat.st_mtime)
+            self.set_meta("source_size", stat.st_size)
+
+    # --- Loading ---
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM questions")
+            self.conn.execute("DELETE FROM question_fts")
+            self.conn.execute("DELETE FROM meta")
+
+    def import_questions(self, questions, batch_size=500):
+        """Append question dicts or Questions, committing every batch_size. Returns how many."""
+        if isinstance(questions, (list, tuple)) and not questions:
+            return 0
+        position = self._next_position()
+        batch = []
+        count = 0
+        for question in questions:
+            batch.append(self._row(Question.from_dict(question)))
+            if len(batch) >= batch_size:
+                count += self._insert_batch(batch, position + count)
+                batch = []
+        if batch:
+            count += self._insert_batch(batch, position + count)
+        return count
+
+    def import_exam(self, exam_path, batch_size=500):
+        """Stream an exam file's questions in (see import_questions); takes its title."""
+        with ExamStreamReader(exam_path) as reader:
+            with self.conn:
+                self.set_meta("title", reader.title)
+            return self.import_questions(reader, batch_size)
+
+    def _insert_batch(self, rows, position):
+        with self.conn:
+            first = self._next_id()
+            self.conn.executemany(
+                "INSERT INTO questions (id, position, number, summary, images, data) VALUES (?, ?, ?, ?, ?, ?)",
+                ((first + i, position + i, number, summary, images, data)
+                 for i, (number, summary, images, data, _) in enumerate(rows)))
+            self.conn.executemany("INSERT INTO question_fts (rowid, body) VALUES (?, ?)",
+                                  ((first + i, body) for i, (*_, body) in enumerate(rows)))
+            self._changed(len(rows))
+        return len(rows)
+
+    def _row(self, question):
+        images = sum(1 for ptype, _ in question.question_parts if ptype != "text")
+        images += sum(1 for image in question.answer_images if image)
+        summary = " ".join(question.question_text.split())[:SUMMARY_LENGTH]
+        return (question.question_number, summary, images, json.dumps(question.to_dict()),
+                question_entry(question)[1])
+
+    def _next_id(self):
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM questions").fetchone()[0]
+
+    def _next_position(self):
+        return self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM questions").fetchone()[0]
+
+    # --- Reading ---
+
+    def _where(self, query):
+        expression = filter_expression(query) if query else None
+        if expression is None:
+            return "", ()
+        return " WHERE id IN (SELECT rowid FROM question_fts WHERE question_fts MATCH ?)", (expression,)
+
+    def count(self, query=None):
+        where, args = self._where(query)
+        return self.conn.execute("SELECT COUNT(*) FROM questions" + where, args).fetchone()[0]
+
+    def rows(self, offset=0, limit=50, query=None):
+        """
+        (id, index, number, summary, images) of the questions in exam order,
+        index being the 1-based place in the whole exam, filtered by query.
+        """
+        where, args = self._where(query)
+        return self.conn.execute("SELECT id, position + 1, number, summary, images FROM questions" + where
+                                 + " ORDER BY position LIMIT ? OFFSET ?", (*args, limit, offset)).fetchall()
+
+    def row_of(self, question_id, query=None):
+        """0-based row of a question in the (filtered) list, or None if it isn't in it."""
+        where, args = self._where(query)
+        row = self.conn.execute("SELECT position FROM questions WHERE id = ?", (question_id,)).fetchone()
+        if row is None or not where:
+            return row and row[0]
+        if not self.conn.execute("SELECT 1 FROM question_fts WHERE rowid = ? AND question_fts MATCH ?",
+                                 (question_id, *args)).fetchone():
+            return None
+        return self.conn.execute("SELECT COUNT(*) FROM questions" + where + " AND position < ?",
+                                 (*args, row[0])).fetchone()[0]
+
+    def get(self, question_id):
+        row = self.conn.execute("SELECT data FROM questions WHERE id = ?", (question_id,)).fetchone()
+        if row is None:
+            raise KeyError(question_id)
+        return Question.from_dict(json.loads(row[0]))
+
+    def __iter__(self):
+        """Every question as a dict, in exam order, read a batch at a time."""
+        last = -1
+        while True:
+            batch = self.conn.execute("SELECT position, data FROM questions WHERE position > ? "
+                                      "ORDER BY position LIMIT 200", (last,)).fetchall()
+            if not batch:
+                return
+            for last, data in batch:
+                yield json.loads(data)
+
+    # --- Editing ---
+
+    def add(self, question):
+        """Append a question; returns its id."""
+        number, summary, images, data, body = self._row(Question.from_dict(question))
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO questions (position, number, summary, images, data) VALUES (?, ?, ?, ?, ?)",
+                (self._next_position(), number, summary, images, data))
+            self.conn.execute("INSERT INTO question_fts (rowid, body) VALUES (?, ?)", (cursor.lastrowid, body))
+            self._changed()
+        return cursor.lastrowid
+
+    def update(self, question_id, question):
+        number, summary, images, data, body = self._row(Question.from_dict(question))
+        with self.conn:
+            self.conn.execute("UPDATE questions SET number = ?, summary = ?, images = ?, data = ? WHERE id = ?",
+                              (number, summary, images, data, question_id))
+            self.conn.execute("UPDATE question_fts SET body = ? WHERE rowid = ?", (body, question_id))
+            self._changed()
+
+    def delete(self, question_id):
+        row = self.conn.execute("SELECT position FROM questions WHERE id = ?", (question_id,)).fetchone()
+        if row is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM questions WHERE id = ?", (question_id,))
+            self.conn.execute("UPDATE questions SET position = position - 1 WHERE position > ?", row)
+            self.conn.execute("DELETE FROM question_fts WHERE rowid = ?", (question_id,))
+            self._changed()
+
+    # --- Saving ---
+
+    def export(self, exam_path, title=None, index=True):
+        """
+        Write the exam JSON (atomically, see ExamStreamWriter), streaming the
+        questions out of the store. Returns how many were written.
+        """
+        if title is not None:
+            self.title = title
+        with ExamStreamWriter(exam_path, title=self.title) as writer:
+            for question in self:
+                writer.append(question)
+        if index:
+            entries = self.conn.execute("SELECT q.number, f.body FROM questions q JOIN question_fts f "
+                                        "ON f.rowid = q.id ORDER BY q.position").fetchall()
+            update_index_for(exam_path, entries)
+        self.mark_saved(exam_path)
+        return writer.count
+
+    def close(self, delete=False):
+        """Close the store; delete=True (always the case for a temporary one) also removes its files."""
+        self.conn.close()
+        if delete or self.temporary:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+            folder = os.path.dirname(self.db_path)
+            if os.path.basename(folder) == EDIT_FOLDER and not os.listdir(folder):
+                os.rmdir(folder)
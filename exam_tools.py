@@ -0,0 +1,168 @@
+# exam_tools.py
+
+"""
+Merge several exams into one, or split one into smaller exams, streaming
+questions from file to file (exam_io) so only one question is in memory at
+a time whatever the size of the exams.
+
+    python cli.py merge exams/aws-part1.json exams/aws-part2.json -o exams/aws.json --dedup
+    python cli.py split exams/aws.json --count 500
+    python cli.py split exams/aws.json --ranges 1-100,101-250
+    python cli.py split exams/aws.json --keywords lambda,kinesis
+"""
+
+import os
+import re
+from exam_io import ExamStreamReader, ExamStreamWriter
+from search_index import question_entry, update_index_for
+
+SPLIT_MODES = ("count", "range", "keyword")
+
+def _log(update_callback, message):
+    if update_callback:
+        update_callback(message)
+
+# --- Merge ---
+
+def merge_exams(exam_paths, output_path, title=None, dedup=None, policy="first", index=True, update_callback=None):
+    """
+    Write the questions of exam_paths, in order, into one exam at output_path.
+    dedup: None/False keeps every question; True or a dedup.Deduplicator
+    drops copies, keeping one per cluster by policy ("first" streams in one
+    pass, "last" and "richest" read the inputs twice). title defaults to the
+    first input's. Returns (questions written, duplicates dropped).
+    """
+    if any(os.path.abspath(path) == os.path.abspath(output_path) for path in exam_paths):
+        raise ValueError("The merged exam must not overwrite one of its inputs")
+    if dedup is True:
+        from dedup import Deduplicator
+        dedup = Deduplicator()
+    keep = None
+    if dedup and policy != "first":
+        for path in exam_paths:
+            with ExamStreamReader(path) as reader:
+                for question_index, question in enumerate(reader):
+                    dedup.add(question, os.path.basename(path), question_index)
+        keep = dedup.keep(policy)
+    if title is None:
+        with ExamStreamReader(exam_paths[0]) as reader:
+            title = reader.title
+
+    entries = [] if index else None
+    written = dropped = item_id = 0
+    with ExamStreamWriter(output_path, title=title) as writer:
+        for path in exam_paths:
+            count = 0
+            with ExamStreamReader(path) as reader:
+                for question_index, question in enumerate(reader):
+                    if keep is not None:
+                        duplicate = item_id not in keep
+                    else:
+                        duplicate = bool(dedup) and dedup.add(question, os.path.basename(path), question_index) is not None
+                    item_id += 1
+                    if duplicate:
+                        dropped += 1
+                        continue
+                    writer.append(question)
+                    if index:
+                        entries.append(question_entry(question))
+                    count += 1
+            written += count
+            _log(update_callback, f"{os.path.basename(path)}: {count} question(s) merged")
+    if index:
+        update_index_for(output_path, entries)
+    _log(update_callback, f"Merged {written} question(s) into {output_path}"
+                          + (f", {dropped} duplicate(s) left out" if dropped else ""))
+    return written, dropped
+
+# --- Split ---
+
+def parse_ranges(text):
+    """[(1, 100), (101, 250), (300, 300)] from "1-100, 101-250, 300"."""
+    ranges = []
+    for item in filter(None, (item.strip() for item in text.split(","))):
+        match = re.fullmatch(r"(\d+)\s*(?:-\s*(\d+))?", item)
+        if not match:
+            raise ValueError(f"Not a question-number range: {item!r} (use e.g. 1-100)")
+        first, last = int(match.group(1)), int(match.group(2) or match.group(1))
+        if last < first:
+            raise ValueError(f"Range {item!r} ends before it starts")
+        ranges.append((first, last))
+    if not ranges:
+        raise ValueError("No ranges given")
+    return ranges
+
+def _question_number(question):
+    match = re.match(r"\s*#?(\d+)", str(question.get("question_number", "")))
+    return int(match.group(1)) if match else None
+
+def _file_label(text):
+    return re.sub(r"[^\w\-]+", "_", text).strip("_") or "part"
+
+def split_exam(exam_path, output_folder=None, mode="count", count=None, ranges=None, keywords=None,
+               index=True, update_callback=None):
+    """
+    Split an exam into several, streaming each question to the exam it belongs in:
+      count:   consecutive chunks of count questions (<name>-part01.json, ...)
+      range:   one exam per (first, last) question-number range (<name>-q1-100.json)
+      keyword: one exam per keyword, for questions whose question or answer
+               text contains it; the first matching keyword wins (<name>-lambda.json)
+    Questions outside every range or keyword go to <name>-other.json. Outputs
+    go to output_folder (default: next to the exam). Returns [(path, questions)].
+    """
+    if mode not in SPLIT_MODES:
+        raise ValueError(f"Unknown split mode {mode!r}; choose from {', '.join(SPLIT_MODES)}")
+    if mode == "count" and not (count and count > 0):
+        raise ValueError("Splitting by count needs a positive count")
+    if mode == "range" and not ranges:
+        raise ValueError("Splitting by range needs at least one range")
+    if mode == "keyword" and not keywords:
+        raise ValueError("Splitting by keyword needs at least one keyword")
+    stem = os.path.splitext(os.path.basename(exam_path))[0]
+    output_folder = output_folder or os.path.dirname(exam_path)
+    patterns = [(keyword, re.compile(r"(?<!\w)" + re.escape(keyword) + r"(?!\w)", re.IGNORECASE))
+                for keyword in keywords or ()]
+
+    outputs = {}        # label -> [writer, entries]
+    order = []
+    with ExamStreamReader(exam_path) as reader:
+        try:
+            for question_index, question in enumerate(reader):
+                entry = question_entry(question)
+                if mode == "count":
+                    label = f"part{question_index // count + 1:02d}"
+                    if question_index % count == 0 and order:
+                        _finish(outputs[order[-1]], index)  # Only one chunk is open at a time
+                elif mode == "range":
+                    number = _question_number(question)
+                    label = next((f"q{first}-{last}" for first, last in ranges
+                                  if number is not None and first <= number <= last), "other")
+                else:
+                    label = next((_file_label(keyword) for keyword, pattern in patterns
+                                  if pattern.search(entry[1])), "other")
+                if label not in outputs:
+                    path = os.path.join(output_folder, f"{stem}-{label}.json")
+                    outputs[label] = [ExamStreamWriter(path, title=f"{reader.title} - {label}"), []]
+                    order.append(label)
+                writer, entries = outputs[label]
+                writer.append(question)
+                entries.append(entry)
+        except BaseException:
+            for writer, _ in outputs.values():
+                writer.abort()
+            raise
+    for label in order:
+        _finish(outputs[label], index)
+    results = [(outputs[label][0].path, outputs[label][0].count) for label in order]
+    for path, questions in results:
+        _log(update_callback, f"{os.path.basename(path)}: {questions} question(s)")
+    return results
+
+def _finish(output, index):
+    writer, entries = output
+    if writer.closed:
+        return
+    writer.close()
+    if index:
+        update_index_for(writer.path, entries)
+    output[1] = None    # The index entries of a finished part aren't needed any more
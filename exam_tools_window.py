@@ -0,0 +1,131 @@
+# exam_tools_window.py
+
+import os
+import threading
+import tkinter as tk
+from collections import deque
+from tkinter import ttk, messagebox
+from exam_tools import merge_exams, split_exam, parse_ranges
+
+class ExamToolsWindow(tk.Toplevel):
+    """
+    Merge exams from the exams folder into one, or split one into smaller
+    exams. The work runs on a background thread; its messages are shown in
+    the log below as they arrive.
+    """
+    def __init__(self, parent, exams_folder="./exams", on_done=None):
+        super().__init__(parent)
+        self.exams_folder = exams_folder
+        self.on_done = on_done
+        self.worker_thread = None
+        self.messages = deque()
+        self.title("ExaMate - Merge / Split Exams")
+        self.geometry("620x560")
+        exams = sorted(f for f in os.listdir(exams_folder) if f.lower().endswith(".json"))
+
+        # --- Merge ---
+        merge = tk.LabelFrame(self, text="Merge", font=("Segoe UI", 11, "bold"))
+        merge.pack(fill="x", padx=10, pady=5)
+        tk.Label(merge, text="Exams to merge (in list order):").grid(row=0, column=0, columnspan=2, sticky="w")
+        self.merge_list = tk.Listbox(merge, selectmode="multiple", height=6, exportselection=False)
+        self.merge_list.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5)
+        for name in exams:
+            self.merge_list.insert("end", name)
+        merge.grid_columnconfigure(1, weight=1)
+        tk.Label(merge, text="Output file:").grid(row=2, column=0, sticky="w", pady=5)
+        self.merge_output = tk.StringVar(value="merged.json")
+        tk.Entry(merge, textvariable=self.merge_output).grid(row=2, column=1, sticky="ew", padx=5)
+        self.merge_dedup = tk.BooleanVar(value=True)
+        tk.Checkbutton(merge, text="Leave out duplicate questions", variable=self.merge_dedup).grid(row=3, column=0, sticky="w")
+        self.merge_button = tk.Button(merge, text="Merge", width=12, command=self.run_merge)
+        self.merge_button.grid(row=3, column=1, sticky="e", padx=5, pady=5)
+
+        # --- Split ---
+        split = tk.LabelFrame(self, text="Split", font=("Segoe UI", 11, "bold"))
+        split.pack(fill="x", padx=10, pady=5)
+        split.grid_columnconfigure(1, weight=1)
+        tk.Label(split, text="Exam:").grid(row=0, column=0, sticky="w")
+        self.split_exam = tk.StringVar(value=exams[0] if exams else "")
+        ttk.Combobox(split, textvariable=self.split_exam, values=exams, state="readonly").grid(row=0, column=1, sticky="ew", padx=5)
+        self.split_mode = tk.StringVar(value="count")
+        modes = tk.Frame(split)
+        modes.grid(row=1, column=0, columnspan=2, sticky="w", pady=5)
+        for value, text in (("count", "Questions per exam"), ("range", "Number ranges (1-100,101-250)"),
+                            ("keyword", "Keywords (lambda,kinesis)")):
+            tk.Radiobutton(modes, text=text, variable=self.split_mode, value=value).pack(side="left")
+        tk.Label(split, text="Value:").grid(row=2, column=0, sticky="w")
+        self.split_value = tk.StringVar(value="100")
+        tk.Entry(split, textvariable=self.split_value).grid(row=2, column=1, sticky="ew", padx=5)
+        self.split_button = tk.Button(split, text="Split", width=12, command=self.run_split)
+        self.split_button.grid(row=3, column=1, sticky="e", padx=5, pady=5)
+
+        self.log = tk.Text(self, height=8, state="disabled", font=("Consolas", 9))
+        self.log.pack(fill="both", expand=True, padx=10, pady=5)
+
+    def run_merge(self):
+        selected = [self.merge_list.get(i) for i in self.merge_list.curselection()]
+        output = self.merge_output.get().strip()
+        if len(selected) < 2:
+            messagebox.showinfo("Merge", "Select at least two exams.", parent=self)
+            return
+        if not output:
+            messagebox.showinfo("Merge", "Enter an output file name.", parent=self)
+            return
+        if not output.lower().endswith(".json"):
+            output += ".json"
+        output_path = os.path.join(self.exams_folder, output)
+        if os.path.exists(output_path) and not messagebox.askyesno(
+                "Overwrite Existing", f"'{output}' already exists. Overwrite it?", parent=self):
+            return
+        paths = [os.path.join(self.exams_folder, name) for name in selected]
+        self.start(merge_exams, paths, output_path, dedup=self.merge_dedup.get() or None)
+
+    def run_split(self):
+        exam = self.split_exam.get()
+        if not exam:
+            messagebox.showinfo("Split", "Pick an exam to split.", parent=self)
+            return
+        mode, value = self.split_mode.get(), self.split_value.get().strip()
+        try:
+            if mode == "count":
+                options = {"count": int(value)}
+            elif mode == "range":
+                options = {"ranges": parse_ranges(value)}
+            else:
+                options = {"keywords": [k.strip() for k in value.split(",") if k.strip()]}
+        except ValueError as e:
+            messagebox.showerror("Split", f"Invalid value.\n{e}", parent=self)
+            return
+        self.start(split_exam, os.path.join(self.exams_folder, exam), None, mode, **options)
+
+    def start(self, target, *args, **kwargs):
+        if self.worker_thread and self.worker_thread.is_alive():
+            return
+
+        def work():
+            try:
+                target(*args, update_callback=self.messages.append, **kwargs)
+            except (OSError, ValueError) as e:
+                self.messages.append(f"Error: {e}")
+        self.merge_button.config(state="disabled")
+        self.split_button.config(state="disabled")
+        self.worker_thread = threading.Thread(target=work, daemon=True)
+        self.worker_thread.start()
+        self.check_thread()
+
+    def check_thread(self):
+        lines = []
+        while self.messages:
+            lines.append(self.messages.popleft())
+        if lines:
+            self.log.config(state="normal")
+            self.log.insert("end", "\n".join(lines) + "\n")
+            self.log.see("end")
+            self.log.config(state="disabled")
+        if self.worker_thread.is_alive() or self.messages:
+            self.after(100, self.check_thread)
+            return
+        self.merge_button.config(state="normal")
+        self.split_button.config(state="normal")
+        if self.on_done:
+            self.on_done()
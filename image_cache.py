@@ -0,0 +1,20 @@
+# image_cache.py
+
+import base64
+import io
+from functools import lru_cache
+from PIL import Image
+
+CACHE_SIZE = 128    # thumbnails; a few MB for typical exam images
+
+@lru_cache(maxsize=CACHE_SIZE)
+def thumbnail(image_base64, max_size):
+    """
+    The base64 image decoded and shrunk to fit max_size (width, height).
+    Shared by the quiz and results windows: an image used by several
+    questions (see image_dedup), or shown twice in the results, is decoded
+    once. Callers must not modify the returned image.
+    """
+    image = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+    image.thumbnail(max_size)
+    return image
@@ -0,0 +1,225 @@
+# image_dedup.py
+
+"""
+Perceptual-hash deduplication of the base64 images in exam files.
+
+The same diagram often ends up in an exam several times: re-saved at another
+resolution, as JPEG instead of PNG, or simply attached again. Every unique
+image gets a difference hash (dHash: a 16x16 grid of "is the next pixel
+brighter" bits, which survives resizing and re-encoding). Images whose
+hashes differ in at most max_distance bits and whose aspect ratios match
+are compared once more pixel by pixel at the smaller one's size, which
+tells a re-encoded copy (no strongly changed pixels, even from a quality-30
+JPEG) from the same diagram with a label or value changed (a dozen or
+more), something a 16x16 hash can't see. Confirmed matches are collapsed
+to one canonical copy. Hashing runs in a process pool.
+
+Exam JSON has no way to reference an image, so "one copy" means every
+question of a group carries the same base64 string afterwards: the bytes
+saved are the difference between each replaced variant and the canonical
+one, and identical strings share one entry in image_cache.
+
+    python cli.py dedup-images exams/*.json --dry-run
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from question_model import IMAGE_BASE64
+
+HASH_SIZE = 16                  # 16x16 = 256-bit hashes
+DEFAULT_MAX_DISTANCE = 8        # bits out of 256; resizes and re-encodes of a diagram differ by 0-6
+ASPECT_TOLERANCE = 0.05
+PIXEL_CHANGE = 128              # grayscale difference that counts as a changed pixel
+MAX_CHANGED_PIXELS = 4
+KEEP = ("smallest", "largest")
+MIN_PARALLEL = 32               # below this many images a pool costs more than it saves
+
+logger = logging.getLogger(__name__)
+
+def dhash(image_bytes, hash_size=HASH_SIZE):
+    """(difference hash as an int, width, height) of an encoded image."""
+    from PIL import Image
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        width, height = image.size
+        image.draft("L", (8 * hash_size, 8 * hash_size))    # JPEGs decode straight to a small grayscale
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS, reducing_gap=3.0)
+        pixels = small.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        start = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[start + col] < pixels[start + col + 1])
+    return bits, width, height
+
+def _image_info(image_base64):
+    """Pool worker: dhash() of a base64 image, or None if it doesn't decode (e.g. "NOT_FOUND")."""
+    try:
+        return dhash(base64.b64decode(image_base64, validate=True))
+    except Exception:
+        return None
+
+def same_picture(image_bytes, other_bytes):
+    """Whether two encoded images show the same picture, compared at the smaller one's size."""
+    from PIL import Image, ImageChops
+    with Image.open(io.BytesIO(image_bytes)) as a, Image.open(io.BytesIO(other_bytes)) as b:
+        size = min(a.size, b.size, key=lambda s: s[0] * s[1])
+        a, b = (im.convert("L") if im.size == size else im.convert("L").resize(size, Image.LANCZOS) for im in (a, b))
+        changed = sum(ImageChops.difference(a, b).histogram()[PIXEL_CHANGE:])
+    return changed <= MAX_CHANGED_PIXELS
+
+def hash_images(images, workers=None):
+    """_image_info() of every base64 string in images, in order, in parallel when worth it."""
+    if len(images) < MIN_PARALLEL or workers == 1:
+        return [_image_info(image) for image in images]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_image_info, images, chunksize=8))
+
+def _digest(image_base64):
+    return hashlib.blake2b(image_base64.encode(), digest_size=16).digest()
+
+def group_similar(infos, max_distance=DEFAULT_MAX_DISTANCE, verify=None):
+    """
+    Groups (lists of indexes into infos) of near-identical images. Each image
+    joins the first earlier group whose first image is within max_distance
+    bits (and passes verify(i, first), if given), so a chain of small
+    differences can't merge two distinct diagrams. Hashes are split into max_distance + 1 chunks: two hashes that close
+    agree on at least one chunk, so only images sharing a chunk are compared.
+    """
+    chunks = max_distance + 1
+    width = -(-HASH_SIZE * HASH_SIZE // chunks)
+    mask = (1 << width) - 1
+    buckets = {}        # (chunk, value) -> indexes of group representatives
+    groups = {}         # representative -> members
+    for i, info in enumerate(infos):
+        if info is None:
+            continue
+        value, w, h = info
+        keys = [(chunk, (value >> (chunk * width)) & mask) for chunk in range(chunks)]
+        match = None
+        for key in keys:
+            for j in buckets.get(key, ()):
+                other, ow, oh = infos[j]
+                if bin(value ^ other).count("1") <= max_distance and \
+                        abs(w / h - ow / oh) <= ASPECT_TOLERANCE * max(w / h, ow / oh) and \
+                        (verify is None or verify(i, j)):
+                    match = j
+                    break
+            if match is not None:
+                break
+        if match is None:
+            groups[i] = [i]
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+        else:
+            groups[match].append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+def _image_parts(question):
+    for parts in [question.get("question_parts", []), *question.get("answers", [])]:
+        for part in parts:
+            if part[0] == IMAGE_BASE64:
+                yield part
+
+def dedup_images(exam_paths, max_distance=DEFAULT_MAX_DISTANCE, keep="smallest", workers=None,
+                 output_folder=None, dry_run=False):
+    """
+    Collapse near-identical images across exam_paths to one canonical copy
+    per group (the smallest encoding, or the largest picture with
+    keep="largest") and rewrite the exams that change, into output_folder
+    or in place. Unique images are held in memory once while the exams are
+    scanned. Returns a report dict with per-exam and total bytes saved.
+    """
+    from exam_io import ExamStreamWriter
+    if keep not in KEEP:
+        raise ValueError(f"Unknown keep {keep!r}; choose from {', '.join(KEEP)}")
+    unique = {}         # digest -> base64 string
+    uses = {}           # digest -> occurrences across all exams
+    for path in exam_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            questions = json.load(f).get("questions", [])
+        for question in questions:
+            for part in _image_parts(question):
+                digest = _digest(part[1])
+                unique.setdefault(digest, part[1])
+                uses[digest] = uses.get(digest, 0) + 1
+    digests = list(unique)
+    infos = hash_images([unique[d] for d in digests], workers)
+
+    replace = {}        # digest of a variant -> canonical base64 string
+    groups = []
+
+    def verify(i, j):
+        try:
+            return same_picture(base64.b64decode(unique[digests[i]]), base64.b64decode(unique[digests[j]]))
+        except Exception:
+            return False
+
+    for members in group_similar(infos, max_distance, verify):
+        if keep == "smallest":
+            canonical = min(members, key=lambda i: (len(unique[digests[i]]), i))
+        else:
+            canonical = max(members, key=lambda i: (infos[i][1] * infos[i][2], -len(unique[digests[i]]), -i))
+        for i in members:
+            if i != canonical:
+                replace[digests[i]] = unique[digests[canonical]]
+        groups.append({
+            "images": len(members),
+            "uses": sum(uses[digests[i]] for i in members),
+            "sizes": sorted(f"{infos[i][1]}x{infos[i][2]}" for i in members),
+            "canonical": f"{infos[canonical][1]}x{infos[canonical][2]}",
+            "bytes_saved": sum((len(unique[digests[i]]) - len(unique[digests[canonical]])) * uses[digests[i]]
+                               for i in members if i != canonical),
+        })
+    report = {
+        "images": sum(uses.values()),
+        "unique": len(unique),
+        "undecodable": sum(1 for info in infos if info is None),
+        "groups": groups,
+        "replaced": sum(uses[d] for d in replace),
+        "bytes_saved": sum(group["bytes_saved"] for group in groups),
+        "exams": [],
+    }
+    del unique
+
+    for path in exam_paths:
+        output = os.path.join(output_folder, os.path.basename(path)) if output_folder else path
+        with open(path, "r", encoding="utf-8") as f:
+            exam = json.load(f)
+        saved = replaced = 0
+        for question in exam.get("questions", []):
+            for part in _image_parts(question):
+                canonical = replace.get(_digest(part[1]))
+                if canonical is not None:
+                    saved += len(part[1]) - len(canonical)
+                    replaced += 1
+                    part[1] = canonical
+        report["exams"].append({"exam": os.path.basename(path), "replaced": replaced, "bytes_saved": saved})
+        if dry_run or (not replaced and output == path):
+            continue
+        with ExamStreamWriter(output, title=exam.get("title", "ParsedExam")) as writer:
+            for question in exam.get("questions", []):
+                writer.append(question)
+        logger.info("%s: %d image(s) replaced, %d bytes saved", output, replaced, saved)
+    return report
+
+def format_report(report, limit=20):
+    """Human-readable summary of a dedup_images() report."""
+    lines = [f"{report['images']} image(s), {report['unique']} unique, {len(report['groups'])} group(s) of "
+             f"near-identical images, {report['replaced']} replaced, {_size(report['bytes_saved'])} saved"]
+    if report["undecodable"]:
+        lines.append(f"  {report['undecodable']} image(s) could not be decoded and were left alone")
+    for group in sorted(report["groups"], key=lambda g: -g["bytes_saved"])[:limit]:
+        lines.append(f"  {group['images']} variants ({', '.join(group['sizes'])}) used {group['uses']}x"
+                     f" -> {group['canonical']}, {_size(group['bytes_saved'])}")
+    for exam in report["exams"]:
+        if exam["replaced"]:
+            lines.append(f"  {exam['exam']}: {exam['replaced']} replaced, {_size(exam['bytes_saved'])}")
+    return "\n".join(lines)
+
+def _size(nbytes):
+    return f"{nbytes / 1024:.1f} KB" if abs(nbytes) < 1024 * 1024 else f"{nbytes / (1024 * 1024):.1f} MB"
@@ -2,13 +2,12 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import os, json, random, re, time, base64
-from parse_html import parse_html_to_json
-from editor import EditorWindow
-from quizgui import QuizGUI
-from results import ResultsWindow  # Ensure you have this class implemented
-from utils import clean_answer_text, clean_string  # Import necessary helper functions
-from Robber_GUI import RobberGUI
+import os, json, random, threading, importlib
+
+# The parser (bs4), quiz/results/editor (Pillow) and the scraper (requests and
+# its DB) are imported by the menu action that first needs them, so the menu
+# is drawn without waiting for any of them.
+PREWARM_MODULES = ("quizgui",)  # Imported in the background once the menu is up
 
 """
 Main menu for ExaMate:
@@ -22,7 +21,7 @@ class MainMenu:
     def __init__(self, master):
         self.master = master
         self.master.title("ExaMate - Main Menu")
-        self.master.geometry("600x450")  # Increased height to accommodate new buttons
+        self.master.geometry("600x550")  # Increased height to accommodate new buttons
 
         # Ensure 'exams' and 'results' folders exist
         self.exams_folder = "./exams"
@@ -71,12 +70,53 @@ class MainMenu:
         load_results_btn = tk.Button(frame_buttons, text="Load Results File", font=("Segoe UI", 12), width=20, command=self.load_results)
         load_results_btn.grid(row=1, column=1, padx=10, pady=5)
 
+        # Button to search questions across all exams
+        search_btn = tk.Button(frame_buttons, text="Search Questions", font=("Segoe UI", 12), width=20, command=self.open_search)
+        search_btn.grid(row=2, column=0, padx=10, pady=5)
+
+        # Button to merge or split exams
+        tools_btn = tk.Button(frame_buttons, text="Merge / Split Exams", font=("Segoe UI", 12), width=20, command=self.open_exam_tools)
+        tools_btn.grid(row=2, column=1, padx=10, pady=5)
+
+        # Button to edit the selected exam
+        edit_btn = tk.Button(frame_buttons, text="Edit Selected Exam", font=("Segoe UI", 12), width=20, command=self.edit_exam)
+        edit_btn.grid(row=3, column=0, columnspan=2, padx=10, pady=5)
+
         # Button to open the Robber GUI
         robber_btn = tk.Button(frame_buttons, text="Exam Topics Scraper", font=("Segoe UI", 12, "italic"), width=25, command=self.open_robber_gui)
-        robber_btn.grid(row=2, column=0, columnspan=2, padx=10, pady=15)
+        robber_btn.grid(row=4, column=0, columnspan=2, padx=10, pady=15)
+
+        self.master.after_idle(self.prewarm)
+
+    def prewarm(self):
+        """Import what the next click most likely needs while the user is still choosing."""
+        def load():
+            for name in PREWARM_MODULES:
+                try:
+                    importlib.import_module(name)
+                except Exception:
+                    pass  # The menu action will import it again and report the error
+        threading.Thread(target=load, daemon=True).start()
+
+    def open_search(self):
+        """Open the full-text search over every exam in the exams folder."""
+        from search_window import SearchWindow
+        try:
+            search_window = SearchWindow(self.master, self.exams_folder, self.results_folder)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open the search index.\n{e}")
+            return
+        search_window.focus()
+
+    def open_exam_tools(self):
+        """Open the merge / split tools for the exams folder."""
+        from exam_tools_window import ExamToolsWindow
+        tools_window = ExamToolsWindow(self.master, self.exams_folder, on_done=self.refresh_exams)
+        tools_window.focus()
 
     def open_robber_gui(self):
         """Open or close the Robber GUI for scraping exam topics."""
+        from Robber_GUI import RobberGUI
         # If the window instance exists and its Toplevel widget is open, close it.
         if self.robber_window and self.robber_window.top.winfo_exists():
             self.robber_window.top.destroy()
@@ -105,6 +145,7 @@ class MainMenu:
 
     def start_quiz(self):
         """Start the quiz with the selected exam."""
+        from quizgui import QuizGUI
         exam_file = self.exam_var.get().strip()
         if not exam_file:
             messagebox.showwarning("No Exam Selected", "Please select an exam from the dropdown.")
@@ -158,13 +199,35 @@ class MainMenu:
 
     def create_new_exam(self):
         """Open the editor to create a new exam."""
+        from editor import EditorWindow
         editor = EditorWindow(self.master)
         self.master.wait_window(editor)
         # After editor is closed, refresh the exams list
         self.refresh_exams()
 
+    def edit_exam(self):
+        """Open the selected exam in the editor."""
+        from editor import EditorWindow
+        exam_file = self.exam_var.get().strip()
+        if not exam_file:
+            messagebox.showwarning("No Exam Selected", "Please select an exam from the dropdown.")
+            return
+        exam_path = os.path.join(self.exams_folder, exam_file)
+        if not os.path.isfile(exam_path):
+            messagebox.showerror("Error", f"File not found: {exam_path}")
+            return
+        try:
+            editor = EditorWindow(self.master, exam_path=exam_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open the exam for editing.\n{e}")
+            return
+        self.master.wait_window(editor)
+        self.refresh_exams()
+
     def parse_html(self):
         """Parse selected HTML folder to JSON and save in exams folder."""
+        from parse_html import parse_html_to_json
+        from dedup import Deduplicator
         # Prompt user to select the folder containing HTML files
         input_folder = filedialog.askdirectory(title="Select Folder Containing HTML Files")
         if not input_folder:
@@ -182,9 +245,11 @@ class MainMenu:
                 return
 
         try:
-            # Parse HTML to JSON
-            parse_html_to_json(input_folder, output_json_path)
-            messagebox.showinfo("Success", f"Parsed HTML files from '{input_folder}' and saved to '{output_json_path}'.")
+            # Parse HTML to JSON, leaving out questions that repeat an earlier one
+            dedup = Deduplicator()
+            parse_html_to_json(input_folder, output_json_path, index=True, dedup=dedup)
+            skipped = f"\n{dedup.duplicates} duplicate question(s) were left out." if dedup.duplicates else ""
+            messagebox.showinfo("Success", f"Parsed HTML files from '{input_folder}' and saved to '{output_json_path}'.{skipped}")
             # Refresh the exams list
             self.refresh_exams()
         except Exception as e:
@@ -192,6 +257,7 @@ class MainMenu:
 
     def load_results(self):
         """Load and display a results file."""
+        from results import ResultsWindow
         # Open a dialog to select a results JSON file
         file_selected = filedialog.askopenfilename(
             title="Select Results JSON File",
@@ -0,0 +1,156 @@
+# mock_examtopics.py
+
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 1x1 transparent PNG served for every question image
+PIXEL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+class MockSite:
+    """
+    The synthetic discussion pages served by MockExamTopicsServer.
+    IDs 0..max_id exist with probability density; with cluster_size > 0 they
+    come in clusters of about that many IDs (like real exams), otherwise they
+    are spread uniformly. Everything derives from seed, so runs are repeatable.
+    """
+    def __init__(self, max_id=5000, density=0.05, cluster_size=0, page_kb=60, cards_per_page=1,
+                 images=True, seed=0):
+        self.max_id = max_id
+        self.page_kb = page_kb
+        self.cards_per_page = cards_per_page
+        self.images = images
+        rng = random.Random(seed)
+        if cluster_size:
+            self.ids = set()
+            while len(self.ids) < density * max_id:
+                start = rng.randrange(max_id)
+                self.ids.update(i for i in range(start, min(start + cluster_size, max_id + 1)) if rng.random() < 0.8)
+        else:
+            self.ids = {i for i in range(max_id + 1) if rng.random() < density}
+
+    def page(self, id_):
+        """HTML of discussion id_, or None if it doesn't exist."""
+        if id_ not in self.ids:
+            return None
+        rng = random.Random(id_)
+        cards = []
+        for n in range(self.cards_per_page):
+            correct = rng.randrange(4)
+            image = f'<img src="/assets/{id_}-{n}.png">' if self.images else ""
+            answers = "".join(
+                f'<li class="multi-choice-item{" correct-hidden" if i == correct else ""}">{letter}. Option {letter} for {id_}</li>'
+                for i, letter in enumerate("ABCD")
+            )
+            cards.append(
+                f'<div class="card exam-question-card">'
+                f'<div class="card-header text-white bg-primary">Question #{id_} Topic 1</div>'
+                f'<div class="card-body"><p class="card-text">Synthetic question {id_}.{n} {image}</p>'
+                f'<ul>{answers}</ul>'
+                f'<p class="card-text question-answer bg-light white-text"><span class="correct-answer">{"ABCD"[correct]}</span></p>'
+                f'</div></div>'
+            )
+        # Discussion thread and scripts pad the page to roughly page_kb, like the real site
+        comment = '<div class="comment-body">Selected answer looks right to me, see the docs.</div>'
+        padding = comment * max(0, self.page_kb * 1024 // len(comment))
+        return (
+            f"<html><head><title>Exam Mock Certified {id_ % 7} topic 1 question {id_} discussion - ExamTopics</title>"
+            f"<script>var tracking = {id_};</script></head>"
+            f"<body><nav>Home | Exams</nav>{''.join(cards)}<div class=\"discussion-container\">{padding}</div></body></html>"
+        )
+
+
+class MockExamTopicsServer:
+    """
+    Local stand-in for examtopics.com, for offline tests and benchmarks.
+    Serves MockSite pages at /discussions/mock/view/<id>-<slug>/ (404 for missing
+    IDs) and their images under /assets/. Every response waits latency seconds
+    (+/- jitter) and fails with a 503 with probability error_rate. ETag /
+    If-None-Match is honoured so cached re-downloads get 304s.
+    """
+    def __init__(self, site=None, latency=0.0, jitter=0.5, error_rate=0.0, host="127.0.0.1", port=0, seed=0):
+        self.site = site or MockSite()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url_template(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/discussions/mock/view/{{id}}-exam-mock-certified-topic-1/"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests += 1
+                    fail = server.rng.random() < server.error_rate
+                    delay = server.latency * (1 + server.jitter * (2 * server.rng.random() - 1))
+                if delay > 0:
+                    time.sleep(delay)
+                if fail:
+                    return self._send(503, b"Service Unavailable", "text/plain")
+                match = re.match(r"^/discussions/mock/view/(\d+)-", self.path)
+                if match:
+                    html = server.site.page(int(match.group(1)))
+                    if html is None:
+                        return self._send(404, b"Not Found", "text/plain")
+                    return self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+                if self.path.startswith("/assets/"):
+                    return self._send(200, PIXEL_PNG, "image/png")
+                self._send(404, b"Not Found", "text/plain")
+
+            def _send(self, status, body, content_type):
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+if __name__ == "__main__":
+    with MockExamTopicsServer(port=8765) as mock:
+        print(f"Serving {len(mock.site.ids)} mock discussions at {mock.url_template}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,150 @@
+# page_sources.py
+
+import os
+import gzip
+import lzma
+import tarfile
+import zipfile
+from collections import namedtuple
+
+PAGE_SUFFIXES = (".html", ".htm")
+# Per-file compression of saved pages: page.html.gz / page.html.xz
+PAGE_CODECS = {".gz": gzip.open, ".xz": lzma.open}
+BUNDLE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.xz", ".txz")
+
+# One saved page. Images in it resolve against base_folder; image_loader(path) -> bytes
+# reads them (None means plain files on disk).
+Page = namedtuple("Page", "name html base_folder image_loader")
+
+def page_stem(name):
+    """name without its .gz / .xz suffix: page.html.gz -> page.html"""
+    for suffix in PAGE_CODECS:
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def is_page_name(name):
+    """True for page.html / page.htm, optionally compressed as .gz or .xz."""
+    return page_stem(name).lower().endswith(PAGE_SUFFIXES)
+
+def is_bundle_name(name):
+    return name.lower().endswith(BUNDLE_SUFFIXES)
+
+def decode_page(name, data):
+    """Page text from raw file bytes, decompressing .gz / .xz by name."""
+    lowered = name.lower()
+    if lowered.endswith(".gz"):
+        data = gzip.decompress(data)
+    elif lowered.endswith(".xz"):
+        data = lzma.decompress(data)
+    return data.decode("utf-8")
+
+def read_page_file(path):
+    opener = PAGE_CODECS.get(os.path.splitext(path)[1].lower(), open)
+    with opener(path, "rb") as fh:
+        return fh.read().decode("utf-8")
+
+def write_page_file(path, html, compression=None):
+    """
+    Write html to path, or to path + ".gz"/".xz" when compression is "gz"/"xz".
+    Returns the path actually written.
+    """
+    if compression:
+        path = f"{path}.{compression}"
+    opener = PAGE_CODECS.get(os.path.splitext(path)[1].lower(), open)
+    with opener(path, "wb") as fh:
+        fh.write(html.encode("utf-8"))
+    return path
+
+def iter_pages(path):
+    """
+    Yield a Page for every saved page in path, which is either a folder or a
+    single bundle. A folder yields its .html/.htm files, their .gz/.xz versions
+    and every page inside .zip/.tar bundles next to them. Bundles are read in
+    place, never extracted; images inside them are read through image_loader.
+    A page saved both plain and compressed (foo.html and foo.html.gz) is read
+    once, from the newest of its files.
+    """
+    if os.path.isfile(path) and is_bundle_name(path):
+        yield from _iter_bundle(path)
+        return
+    names = sorted(name for name in os.listdir(path) if os.path.isfile(os.path.join(path, name)))
+    newest = {}
+    for name in names:
+        if is_page_name(name):
+            stem = page_stem(name)
+            mtime = os.path.getmtime(os.path.join(path, name))
+            if stem not in newest or mtime > newest[stem][0]:
+                newest[stem] = (mtime, name)
+    for name in names:
+        full_path = os.path.join(path, name)
+        if is_page_name(name):
+            if newest[page_stem(name)][1] != name:
+                continue
+            yield Page(name, read_page_file(full_path), path, None)
+        elif is_bundle_name(name):
+            yield from _iter_bundle(full_path)
+
+def _iter_bundle(bundle_path):
+    if bundle_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(bundle_path) as archive:
+            members = {info.filename: info for info in archive.infolist() if not info.is_dir()}
+            read_member = lambda name: archive.read(members[name]) if name in members else None
+            for name in members:
+                if is_page_name(name):
+                    yield _bundle_page(bundle_path, name, read_member)
+    else:
+        with tarfile.open(bundle_path, "r:*") as archive:
+            members = {info.name: info for info in archive.getmembers() if info.isfile()}
+
+            def read_member(name):
+                if name not in members:
+                    return None
+                with archive.extractfile(members[name]) as fh:
+                    return fh.read()
+            for name in members:
+                if is_page_name(name):
+                    yield _bundle_page(bundle_path, name, read_member)
+
+def _bundle_page(bundle_path, member_name, read_member):
+    # base_folder is a virtual path: <bundle>/<folder of the page inside it>
+    base_folder = os.path.join(bundle_path, *member_name.split("/")[:-1])
+
+    def image_loader(image_path):
+        relative = os.path.relpath(os.path.normpath(image_path), bundle_path)
+        if not relative.startswith(os.pardir):
+            data = read_member(relative.replace(os.sep, "/"))
+            if data is not None:
+                return data
+        # Not in the bundle (e.g. a shared Robbed/_assets image): try the disk
+        image_path = os.path.normpath(image_path)
+        if not os.path.exists(image_path):
+            return None
+        with open(image_path, "rb") as fh:
+            return fh.read()
+
+    return Page(member_name, decode_page(member_name, read_member(member_name)), base_folder, image_loader)
+
+def compress_saved_pages(root="Robbed", compression="gz"):
+    """
+    Compress every plain .html/.htm page under root in place (page.html -> page.html.gz).
+    Returns (pages compressed, bytes before, bytes after).
+    """
+    count = before = after = 0
+    for folder, _, files in os.walk(root):
+        for name in files:
+            if not name.lower().endswith(PAGE_SUFFIXES):
+                continue
+            path = os.path.join(folder, name)
+            tmp_path = write_page_file(path + ".part", read_page_file(path), compression)
+            final_path = f"{path}.{compression}"
+            os.replace(tmp_path, final_path)
+            count += 1
+            before += os.path.getsize(path)
+            after += os.path.getsize(final_path)
+            os.remove(path)
+    return count, before, after
+
+if __name__ == "__main__":
+    pages, size_before, size_after = compress_saved_pages()
+    print(f"Compressed {pages} page(s): {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
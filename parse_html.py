@@ -2,60 +2,138 @@
 
 import os
 import re
+import time
 import base64
+import logging
+from contextlib import nullcontext
+from contextvars import ContextVar
 from bs4 import BeautifulSoup
 import urllib.parse
 import json
 from utils import clean_answer_text, clean_string  # Importing helper functions
+from exam_io import ExamStreamWriter
+from page_sources import iter_pages
+from question_model import Question
+from search_index import question_entry, update_index_for
+from dedup import Deduplicator
 
-def parse_html_to_json(input_html_folder, output_json_path):
+logger = logging.getLogger(__name__)
+
+# ParseProfile of the parse running in this context, if it is being profiled
+_profile = ContextVar("parse_profile", default=None)
+
+def _stage(name, nbytes=0):
+    profile = _profile.get()
+    return profile.stage(name, nbytes) if profile else nullcontext()
+
+def parse_html_to_json(input_html_folder, output_json_path, profile=None, index=False, dedup=False):
     """
     Parse .html / .htm files in input_html_folder,
     build an 'exam' structure, and save as .json with base64-encoded images.
     Each question includes question text, images, answers, and correct answers.
+    Questions are streamed to disk as they are parsed.
+    Compressed pages (.html.gz / .html.xz) and .zip / .tar bundles of pages are
+    read in place; input_html_folder may also be a single bundle.
+    profile: an optional parse_profile.ParseProfile that records time, calls
+    and bytes per stage (read, soup, query, clean, images, write) and per file.
+    index: also update the search index of the output folder (see search_index);
+    the app and the CLI pass True when writing into the exams folder.
+    dedup: drop questions that repeat (or nearly repeat) an earlier one, keeping
+    the first copy; True for a default dedup.Deduplicator, or pass one to read
+    its report() afterwards (the app and the CLI do). False writes every card.
     """
-    # Collect 'questions' as a list
-    questions = []
-    # Find all .html or .htm files
-    html_files = [f for f in os.listdir(input_html_folder) if f.lower().endswith((".html", ".htm"))]
-    
-    for file in html_files:
-        fullpath = os.path.join(input_html_folder, file)
-        with open(fullpath, "r", encoding="utf-8") as fh:
-            soup = BeautifulSoup(fh.read(), "html.parser")
-            card_divs = soup.find_all("div", attrs={"class": "card exam-question-card"})
-            
-            for div in card_divs:
-                # Parse question number
-                qnum = parse_question_number(div)
-                # Parse question text + images
-                q_parts = parse_question_parts(div, input_html_folder)
-                # Parse answers
-                ans_list = parse_answers(div, input_html_folder)
-                # Parse correct answers
-                corr = parse_correct_answers(div)
-                # Build question dict
-                question_obj = {
-                    "question_number": qnum if qnum else "0",
-                    "question_parts": encode_parts_to_base64(q_parts),
-                    "answers": [encode_parts_to_base64(a) for a in ans_list],
-                    "correct_answers": corr
-                }
-                questions.append(question_obj)
-
-    # Build the final exam structure
-    exam_data = {
-        "title": "ParsedExam",
-        "questions": questions
-    }
-    # Write to .json
-    with open(output_json_path, "w", encoding="utf-8") as f:
-        json.dump(exam_data, f, indent=2)
-    
+    entries = [] if index else None
+    if dedup is True:
+        dedup = Deduplicator()
+    dropped = 0
+    token = _profile.set(profile)
+    try:
+        with ExamStreamWriter(output_json_path, title="ParsedExam") as writer:
+            pages = iter_pages(input_html_folder)
+            while True:
+                started = time.perf_counter()
+                page = next(pages, None)
+                if page is None:
+                    break
+                if profile:
+                    profile.begin_file(page.name, len(page.html), started)
+                    profile.add("read", time.perf_counter() - started, len(page.html))
+                with _stage("soup", len(page.html)):
+                    soup = BeautifulSoup(page.html, "html.parser")
+                questions = parse_cards_from_soup(soup, page.base_folder, image_loader=page.image_loader)
+                if dedup:
+                    with _stage("dedup"):
+                        unique = [q for q in questions if dedup.add(q, page.name) is None]
+                    dropped += len(questions) - len(unique)
+                    questions = unique
+                with _stage("write"):
+                    for question_obj in questions:
+                        writer.append(question_obj)
+                if index:
+                    entries.extend(question_entry(q) for q in questions)
+                if profile:
+                    profile.end_file(len(questions))
+    finally:
+        _profile.reset(token)
+        if profile:
+            profile.finish()
+
+    if dropped:
+        logger.info("Dropped %d duplicate question(s) from %s", dropped, input_html_folder)
+    if index:
+        update_index_for(output_json_path, entries)
     print(f"Parsing completed. JSON saved to {output_json_path}")
 
+def parse_cards_from_soup(soup, base_folder, image_loader=None):
+    """
+    Extract every exam-question-card in an already parsed page.
+    Returns a list of question_model.Question ready to be written into an exam.
+    image_loader(path_or_url) -> bytes is used for images (default: read local files).
+    """
+    questions = []
+    with _stage("query"):
+        card_divs = soup.find_all("div", attrs={"class": "card exam-question-card"})
+    for div in card_divs:
+        # Parse question number
+        qnum = parse_question_number(div)
+        # Parse question text + images
+        q_parts = parse_question_parts(div, base_folder)
+        # Parse answers
+        ans_list = parse_answers(div, base_folder)
+        # Parse correct answers
+        corr = parse_correct_answers(div)
+        questions.append(Question(
+            qnum,
+            encode_parts_to_base64(q_parts, image_loader),
+            [encode_parts_to_base64(a, image_loader) for a in ans_list],
+            corr,
+        ))
+    return questions
+
+def prune_soup(soup):
+    """
+    Reduce a page to what the parsers use: its title and the exam-question-card
+    blocks (with their images), dropping scripts, styles, navigation and the
+    discussion thread. The cards are moved out of soup into a new soup,
+    which is returned; None if the page has no cards.
+    """
+    card_divs = soup.find_all("div", attrs={"class": "card exam-question-card"})
+    if not card_divs:
+        return None
+    pruned = BeautifulSoup("<html><head><meta charset=\"utf-8\"></head><body></body></html>", "html.parser")
+    if soup.title and soup.title.string:
+        title = pruned.new_tag("title")
+        title.string = soup.title.string
+        pruned.head.append(title)
+    for div in card_divs:
+        for tag in div.find_all(["script", "style", "noscript"]):
+            tag.decompose()
+        pruned.body.append(div.extract())
+    return pruned
+
 def parse_question_number(card_div):
-    header = card_div.find("div", attrs={"class": "card-header text-white bg-primary"})
+    with _stage("query"):
+        header = card_div.find("div", attrs={"class": "card-header text-white bg-primary"})
     if not header:
         return "0"
     raw = header.get_text(strip=True)
@@ -70,26 +148,32 @@ def parse_question_parts(card_div, base_folder):
     Return a list of tuples: e.g. [("text","some text..."), ("image","...")]
     """
     results = []
-    p_tag = card_div.find("p", attrs={"class": "card-text"})
+    with _stage("query"):
+        p_tag = card_div.find("p", attrs={"class": "card-text"})
     if not p_tag:
         return results  # No question text at all
 
     for child in p_tag.children:
         if hasattr(child, "name") and child.name == "img":
             # It's an <img>
-            src = child.get("src", "")
-            decoded = urllib.parse.unquote(src)
-            img_path = os.path.join(base_folder, decoded)
+            img_path = resolve_image_src(child.get("src", ""), base_folder)
             results.append(("image", img_path))
         else:
             # It's text or something else
             txt = child.string if child.string else child.get_text(separator=" ")
-            txt = clean_string(txt)
+            with _stage("clean"):
+                txt = clean_string(txt)
             if txt:
                 # Note: We do not clean here as these are question parts, not answers
                 results.append(("text", txt))
     return results
 
+def resolve_image_src(src, base_folder):
+    """ Absolute http(s) URLs are kept as-is, anything else is relative to base_folder. """
+    if src.startswith(("http://", "https://")):
+        return src
+    return os.path.join(base_folder, urllib.parse.unquote(src))
+
 def combine_text(parts):
     """ Combine text parts for a simpler 'question' string. """
     texts = [p[1] for p in parts if p[0] == "text"]
@@ -102,7 +186,8 @@ def parse_answers(card_div, base_folder):
     Return a list of answer-part-lists, e.g. [ [("text","stuff"), ...], [("text","more"), ("image","...")] ]
     """
     results = []
-    li_items = card_div.find_all("li", attrs={"class": "multi-choice-item"})
+    with _stage("query"):
+        li_items = card_div.find_all("li", attrs={"class": "multi-choice-item"})
     for li_tag in li_items:
         answer_parts = parse_answer_parts(li_tag, base_folder)
         results.append(answer_parts)
@@ -119,20 +204,20 @@ def parse_answer_parts(li_tag, base_folder):
     for child in li_tag.children:
         if hasattr(child, "name") and child.name == "img":
             # Image in answer
-            src = child.get("src", "")
-            decoded = urllib.parse.unquote(src)
-            img_path = os.path.join(base_folder, decoded)
+            img_path = resolve_image_src(child.get("src", ""), base_folder)
             subresults.append(("image", img_path))
         else:
             # Text
             t = child.string if child.string else child.get_text(separator=" ")
-            t = clean_string(t)
+            with _stage("clean"):
+                t = clean_string(t)
             if t:
                 full_text += t + ' '
 
     if full_text:
         # Clean the combined text to remove redundant labels
-        cleaned_text = clean_answer_text(full_text.strip())
+        with _stage("clean"):
+            cleaned_text = clean_answer_text(full_text.strip())
         subresults.insert(0, ("text", cleaned_text))  # Insert as the first text part
 
     return subresults
@@ -141,23 +226,24 @@ def parse_correct_answers(card_div):
     """
     Return a list of letters for correct answers based on 'correct' class in <li>.
     """
-    correct_lis = card_div.find_all("li", attrs={"class": re.compile(r"multi-choice-item.*correct")})
+    with _stage("query"):
+        correct_lis = card_div.find_all("li", attrs={"class": re.compile(r"multi-choice-item.*correct")})
     correct_letters = []
-    print(f"Found {len(correct_lis)} correct answer(s).")
+    logger.debug("Found %d correct answer(s).", len(correct_lis))
     for li in correct_lis:
         text = li.get_text(strip=True)
-        print(f"Processing correct answer text: '{text}'")
+        logger.debug("Processing correct answer text: '%s'", text)
         # Extract all letters before dots at the start
         # e.g., "A. A. Create..." should extract "A"
         match = re.match(r'^([A-Z])\.', text)
         if match:
             letter = match.group(1)
-            print(f"Extracted correct answer: '{letter}'")
+            logger.debug("Extracted correct answer: '%s'", letter)
             correct_letters.append(letter)
         else:
-            print(f"Warning: Unable to extract correct answer from text: '{text}'")
+            logger.warning("Unable to extract correct answer from text: '%s'", text)
     if not correct_letters:
-        print("Warning: No correct answers found for a question.")
+        logger.warning("No correct answers found for a question.")
     return correct_letters
 
 def clean_string(text):
@@ -172,30 +258,44 @@ def clean_string(text):
     text = text.encode("ascii", errors="ignore").decode()
     return text
 
-def encode_parts_to_base64(parts):
+def encode_parts_to_base64(parts, image_loader=None):
     """
     Convert e.g. ("image", "/some/path.jpg") -> ("image_base64", <b64string>)
     or ("text","some text") -> ("text","some text")
+    image_loader(content) -> bytes replaces reading from the local disk; it
+    returns None when the image does not exist.
     """
     encoded = []
     for (ptype, content) in parts:
         if ptype == "image":
-            if os.path.exists(content):
-                try:
-                    with open(content, "rb") as imgf:
-                        bdata = base64.b64encode(imgf.read()).decode("utf-8")
-                    encoded.append(("image_base64", bdata))
-                except Exception as e:
-                    # Error reading file
-                    print(f"Error encoding image {content}: {e}")
-                    encoded.append(("image_base64", "ERROR"))
-            else:
-                print(f"Image not found: {content}")
+            if image_loader is None and not os.path.exists(content):
+                logger.warning("Image not found: %s", content)
+                encoded.append(("image_base64", "NOT_FOUND"))
+                continue
+            started = time.perf_counter()
+            try:
+                bdata = image_loader(content) if image_loader else read_local_image(content)
+            except Exception as e:
+                # Error reading file
+                logger.warning("Error encoding image %s: %s", content, e)
+                encoded.append(("image_base64", "ERROR"))
+                continue
+            if bdata is None:
+                logger.warning("Image not found: %s", content)
                 encoded.append(("image_base64", "NOT_FOUND"))
+            else:
+                encoded.append(("image_base64", base64.b64encode(bdata).decode("utf-8")))
+                profile = _profile.get()
+                if profile:
+                    profile.add("images", time.perf_counter() - started, len(bdata))
         else:
             encoded.append((ptype, content))
     return encoded
 
+def read_local_image(path):
+    with open(path, "rb") as imgf:
+        return imgf.read()
+
 if __name__ == "__main__":
     # Example usage:
     input_folder = "../res/AWS Developer"  # Path to your actual HTML files folder
@@ -205,4 +305,4 @@ if __name__ == "__main__":
     # Name the JSON after the input folder
     folder_name = os.path.basename(os.path.normpath(input_folder))
     output_json = os.path.join(output_folder, f"{folder_name}.json")
-    parse_html_to_json(input_folder, output_json)
+    parse_html_to_json(input_folder, output_json, index=True, dedup=True)
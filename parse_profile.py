@@ -0,0 +1,135 @@
+# parse_profile.py
+
+import json
+import time
+from contextlib import contextmanager
+
+STAGES = ("read", "soup", "query", "clean", "images", "dedup", "write")
+STAGE_HELP = {
+    "read": "reading (and decompressing) page files",
+    "soup": "BeautifulSoup construction",
+    "query": "find/find_all queries on the cards",
+    "clean": "clean_string / clean_answer_text regex work",
+    "images": "loading and base64-encoding images",
+    "dedup": "fingerprinting questions and looking up earlier copies",
+    "write": "serializing questions to the output JSON",
+    "other": "everything else (walking the card tree, get_text)",
+}
+
+class ParseProfile:
+    """
+    Wall time, call counts and bytes per parse stage, overall and per source file.
+    Pass one to parse_html_to_json(profile=...); afterwards report() gives the
+    numbers as a dict and summary() as readable text.
+    """
+    def __init__(self):
+        self.totals = {}        # stage -> [seconds, calls, bytes]
+        self.files = []         # one dict per source file, in parse order
+        self.current = None
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @contextmanager
+    def stage(self, name, nbytes=0):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, nbytes)
+
+    def add(self, name, seconds, nbytes=0):
+        for stages in (self.totals, self.current["stages"] if self.current else None):
+            if stages is None:
+                continue
+            entry = stages.setdefault(name, [0.0, 0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+            entry[2] += nbytes
+
+    def begin_file(self, name, nbytes, started=None):
+        """Start attributing stages to file name; started is when reading it began."""
+        self.current = {"file": name, "bytes": nbytes, "questions": 0, "seconds": 0.0, "stages": {},
+                        "_started": started if started is not None else time.perf_counter()}
+        self.files.append(self.current)
+
+    def end_file(self, questions):
+        self.current["questions"] = questions
+        self.current["seconds"] = time.perf_counter() - self.current.pop("_started")
+        self.current = None
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @staticmethod
+    def _stage_rows(stages, total_seconds):
+        rows = {name: {"seconds": s, "calls": c, "bytes": b} for name, (s, c, b) in stages.items()}
+        accounted = sum(s for s, _, _ in stages.values())
+        rows["other"] = {"seconds": max(0.0, total_seconds - accounted), "calls": 0, "bytes": 0}
+        return rows
+
+    def report(self):
+        """Structured report: totals per stage plus the same breakdown for every file."""
+        total = (self.finished or time.perf_counter()) - self.started
+        files = []
+        for entry in self.files:
+            files.append({
+                "file": entry["file"],
+                "bytes": entry["bytes"],
+                "questions": entry["questions"],
+                "seconds": entry["seconds"],
+                "stages": self._stage_rows(entry["stages"], entry["seconds"]),
+            })
+        return {
+            "seconds": total,
+            "files": len(self.files),
+            "bytes": sum(entry["bytes"] for entry in self.files),
+            "questions": sum(entry["questions"] for entry in self.files),
+            "stages": self._stage_rows(self.totals, total),
+            "per_file": files,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.report(), fh, indent=2)
+
+    def summary(self, slowest=5):
+        report = self.report()
+        total = report["seconds"] or 1e-9
+        lines = [
+            f"Parsed {report['questions']} question(s) from {report['files']} file(s) "
+            f"({report['bytes'] / 1e6:.1f} MB) in {report['seconds']:.2f}s",
+            f"{'stage':<8} {'seconds':>9} {'share':>6} {'calls':>9} {'MB':>8}  ",
+        ]
+        for name in STAGES + ("other",):
+            row = report["stages"].get(name)
+            if not row:
+                continue
+            lines.append(
+                f"{name:<8} {row['seconds']:>9.3f} {100 * row['seconds'] / total:>5.1f}% {row['calls']:>9} "
+                f"{row['bytes'] / 1e6:>8.2f}  {STAGE_HELP[name]}"
+            )
+        files = sorted(report["per_file"], key=lambda entry: entry["seconds"], reverse=True)[:slowest]
+        if files:
+            lines.append("Slowest file(s):")
+            for entry in files:
+                top = max(entry["stages"].items(), key=lambda item: item[1]["seconds"])[0]
+                lines.append(f"  {entry['seconds']:.3f}s  {entry['questions']:>4} q  {entry['file']} (mostly {top})")
+        return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+    from parse_html import parse_html_to_json
+
+    parser = argparse.ArgumentParser(description="Profile parse_html_to_json on a folder of saved pages.")
+    parser.add_argument("folder")
+    parser.add_argument("--json", help="write the structured report to this file")
+    args = parser.parse_args()
+
+    profile = ParseProfile()
+    with tempfile.TemporaryDirectory() as scratch:
+        parse_html_to_json(args.folder, os.path.join(scratch, "profiled.json"), profile=profile)
+    print(profile.summary())
+    if args.json:
+        profile.save(args.json)
@@ -0,0 +1,121 @@
+# question_model.py
+
+import sys
+from collections import namedtuple
+from utils import clean_answer_text
+
+# Part types, interned so the millions of parts in a large bank share three strings
+TEXT = sys.intern("text")
+IMAGE = sys.intern("image")                 # image path / URL, before encoding (CardList)
+IMAGE_BASE64 = sys.intern("image_base64")
+_PART_TYPES = {name: name for name in (TEXT, IMAGE, IMAGE_BASE64)}
+
+# One piece of a question or answer: ("text", "..."), ("image_base64", "<b64>"), ...
+# A tuple, so it unpacks and serializes like the [ptype, content] pairs in exam JSON.
+Part = namedtuple("Part", "ptype content")
+
+def make_part(ptype, content):
+    return Part(_PART_TYPES.get(ptype) or sys.intern(ptype), content)
+
+def make_parts(parts):
+    return tuple(make_part(ptype, content) for ptype, content in parts)
+
+def _is_image(ptype):
+    return ptype == IMAGE_BASE64 or ptype == IMAGE
+
+class Question:
+    """
+    One exam question as used by the parsers, the quiz, the results window and
+    the editor. Parts are immutable tuples; the values every view needs
+    (cleaned answer text, first image per answer, question text, max picks)
+    are computed once here instead of on every render.
+    """
+    __slots__ = ("question_number", "question_parts", "answers", "correct_answers", "extra",
+                 "question_text", "answer_texts", "answer_images", "max_picks")
+
+    def __init__(self, question_number, question_parts=(), answers=(), correct_answers=(), extra=None):
+        self.question_number = str(question_number) if question_number else "0"
+        self.question_parts = make_parts(question_parts)
+        self.answers = tuple(make_parts(parts) for parts in answers)
+        self.correct_answers = tuple(correct_answers)
+        self.extra = extra or None      # other keys of the question dict (e.g. "explanation"), kept on save
+
+        self.question_text = " ".join(content for ptype, content in self.question_parts if ptype == TEXT)
+        texts, images = [], []
+        for parts in self.answers:
+            texts.append(clean_answer_text(" ".join(content for ptype, content in parts if ptype == TEXT).strip()))
+            images.append(next((content for ptype, content in parts if _is_image(ptype)), None))
+        self.answer_texts = tuple(texts)
+        self.answer_images = tuple(images)
+        self.max_picks = len(self.correct_answers) or 1
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Question from an exam-JSON question dict (or return a Question as is)."""
+        if isinstance(data, cls):
+            return data
+        extra = {key: value for key, value in data.items()
+                 if key not in ("question_number", "question_parts", "answers", "correct_answers")}
+        return cls(data.get("question_number"), data.get("question_parts", ()), data.get("answers", ()),
+                   data.get("correct_answers", ()), extra)
+
+    def to_dict(self):
+        """The exam-JSON form of the question."""
+        data = {
+            "question_number": self.question_number,
+            "question_parts": self.question_parts,
+            "answers": self.answers,
+            "correct_answers": self.correct_answers,
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def explanation(self):
+        return self.extra.get("explanation", "") if self.extra else ""
+
+    def answer_info(self, letter):
+        """(cleaned text, first image or None) of the answer with this letter."""
+        index = ord(letter.upper()) - ord("A")
+        if 0 <= index < len(self.answers):
+            return self.answer_texts[index], self.answer_images[index]
+        return "[Unknown]", None
+
+    def score(self, picks):
+        """Points for a set of picked letters: the fraction of correct answers picked."""
+        if not self.correct_answers:
+            return 0.0
+        return len(set(picks) & set(self.correct_answers)) / len(self.correct_answers)
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Question(#{self.question_number}, {len(self.answers)} answers, correct={list(self.correct_answers)})"
+
+def replace_text(parts, text):
+    """
+    parts with their text replaced by text, images kept where they are: the
+    first text part takes text and later ones are dropped (a question without
+    text gets it in front).
+    """
+    replaced, placed = [], False
+    for ptype, content in parts:
+        if ptype == TEXT:
+            if not placed:
+                replaced.append(make_part(TEXT, text))
+                placed = True
+        else:
+            replaced.append(make_part(ptype, content))
+    if not placed:
+        replaced.insert(0, make_part(TEXT, text))
+    return replaced
+
+def load_questions(question_dicts):
+    """Questions of an exam JSON (exam_data["questions"]) as Question objects."""
+    return [Question.from_dict(data) for data in question_dicts]
@@ -2,21 +2,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
-import os
-import base64
-import json
-from datetime import datetime
-from PIL import Image, ImageTk
-import io
+from PIL import ImageTk
 from results import ResultsWindow
-from utils import format_hms, clean_answer_text
+from utils import format_hms
+from question_model import TEXT, IMAGE_BASE64, load_questions
+from scoring import build_results, ResultsSaver
+from image_cache import thumbnail
 
 class QuizGUI(tk.Toplevel):
     def __init__(self, parent, exam_data, json_filename=None, exam_name=None, results_folder=None):
         super().__init__(parent)
         self.parent = parent
         self.exam_data = exam_data
-        self.questions = exam_data.get("questions", [])
+        self.questions = load_questions(exam_data.get("questions", []))
         self.num_questions = len(self.questions)
         self.json_filename = json_filename
         self.exam_name = exam_name or "Untitled Exam"
@@ -177,7 +175,7 @@ class QuizGUI(tk.Toplevel):
 
         # Get current question data
         qobj = self.questions[index]
-        question_number = qobj.get("question_number", index+1)
+        question_number = qobj.question_number
         
         # Header
         header = tk.Label(self.q_container, 
@@ -186,19 +184,15 @@ class QuizGUI(tk.Toplevel):
         header.pack(anchor="w", pady=(0, 15))
 
         # Question content
-        for part in qobj.get("question_parts", []):
-            ptype, content = part[0], part[1]
-            if ptype == "text":
+        for ptype, content in qobj.question_parts:
+            if ptype == TEXT:
                 lbl = tk.Label(self.q_container, text=content, 
                              wraplength=700, justify="left",
                              font=("Segoe UI", 11))
                 lbl.pack(anchor="w", pady=2)
-            elif ptype == "image_base64":
+            elif ptype == IMAGE_BASE64:
                 try:
-                    image_data = base64.b64decode(content)
-                    image = Image.open(io.BytesIO(image_data))
-                    image.thumbnail((600, 400))
-                    photo = ImageTk.PhotoImage(image)
+                    photo = ImageTk.PhotoImage(thumbnail(content, (600, 400)))
                     self.question_image_refs.append(photo)
                     lbl = tk.Label(self.q_container, image=photo)
                     lbl.pack(anchor="w", pady=5)
@@ -210,10 +204,7 @@ class QuizGUI(tk.Toplevel):
         answers_frame = tk.Frame(self.q_container)
         answers_frame.pack(anchor="w", fill="x", pady=10)
         
-        correct_answers = qobj.get("correct_answers", [])
-        max_picks = len(correct_answers) if correct_answers else 1
-        
-        for ans_idx, answer_parts in enumerate(qobj.get("answers", [])):
+        for ans_idx, answer_parts in enumerate(qobj.answers):
             answer_frame = tk.Frame(answers_frame)
             answer_frame.pack(anchor="w", fill="x", pady=3)
             
@@ -226,23 +217,18 @@ class QuizGUI(tk.Toplevel):
             self.check_vars.append(var)
             self.checkboxes.append(cb)
 
-            # Answer content
+            # Answer content: the cleaned text, then any images
             col = 1
             row = 0
-            for part in answer_parts:
-                ptype, content = part[0], part[1]
-                if ptype == "text":
-                    cleaned_text = clean_answer_text(content)
-                    lbl = tk.Label(answer_frame, text=cleaned_text, 
-                                 wraplength=600, justify="left",
-                                 font=("Segoe UI", 11))
-                    lbl.grid(row=row, column=col, sticky="w", padx=5)
-                elif ptype == "image_base64":
+            if qobj.answer_texts[ans_idx]:
+                lbl = tk.Label(answer_frame, text=qobj.answer_texts[ans_idx],
+                             wraplength=600, justify="left",
+                             font=("Segoe UI", 11))
+                lbl.grid(row=row, column=col, sticky="w", padx=5)
+            for ptype, content in answer_parts:
+                if ptype == IMAGE_BASE64:
                     try:
-                        image_data = base64.b64decode(content)
-                        image = Image.open(io.BytesIO(image_data))
-                        image.thumbnail((400, 300))
-                        photo = ImageTk.PhotoImage(image)
+                        photo = ImageTk.PhotoImage(thumbnail(content, (400, 300)))
                         self.answer_image_refs.append(photo)
                         lbl = tk.Label(answer_frame, image=photo)
                         row += 1
@@ -252,16 +238,13 @@ class QuizGUI(tk.Toplevel):
                         row += 1
                         err.grid(row=row, column=col, sticky="w", padx=25)
 
-        self.enforce_checkbox_limit(max_picks)
+        self.enforce_checkbox_limit(qobj.max_picks)
         self.update_navigation()
         self.q_canvas.yview_moveto(0.0)
 
     def on_answer_toggle(self, ans_idx):
         self.store_current_picks()
-        qobj = self.questions[self.current_question_index]
-        correct_answers = qobj.get("correct_answers", [])
-        max_picks = len(correct_answers) if correct_answers else 1
-        self.enforce_checkbox_limit(max_picks)
+        self.enforce_checkbox_limit(self.questions[self.current_question_index].max_picks)
         self.update_navigation()
 
     def enforce_checkbox_limit(self, max_picks):
@@ -309,9 +292,7 @@ class QuizGUI(tk.Toplevel):
             # Enable interactions
             for widget in [self.prev_btn, self.next_btn] + self.nav_buttons:
                 widget.config(state="normal")
-            qobj = self.questions[self.current_question_index]
-            correct_answers = qobj.get("correct_answers", [])
-            self.enforce_checkbox_limit(len(correct_answers) if correct_answers else 1)
+            self.enforce_checkbox_limit(self.questions[self.current_question_index].max_picks)
             
         self.update_timer()
 
@@ -333,36 +314,12 @@ class QuizGUI(tk.Toplevel):
         self.timer_running = False
         total_time = time.time() - self.start_time - self.accumulated_pause
         
-        # Calculate score
-        total_points = 0.0
-        for i, q in enumerate(self.questions):
-            correct = set(q.get("correct_answers", []))
-            user = self.user_answers[i]
-            if correct:
-                total_points += len(user & correct) / len(correct)
-        
-        percentage = (total_points / self.num_questions) * 100 if self.num_questions else 0
-        
-        # Prepare results data
-        results_data = {
-            "exam_name": self.exam_name,
-            "final_score": total_points,
-            "total_questions": self.num_questions,
-            "percentage": percentage,
-            "elapsed_time": format_hms(total_time),
-            "user_answers": [sorted(ans) for ans in self.user_answers],
-            "questions": self.questions
-        }
-        
-        # Save results
-        os.makedirs(self.results_folder, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.exam_name}_results_{timestamp}.json"
-        with open(os.path.join(self.results_folder, filename), "w") as f:
-            json.dump(results_data, f, indent=2)
-            
+        # Score, then save in the background while the results are shown
+        results_data = build_results(self.exam_name, self.questions, self.user_answers, total_time)
+        saver = ResultsSaver(results_data, self.results_folder)
+
         # Show results window
-        ResultsWindow(self.parent, results_data)
+        ResultsWindow(self.parent, results_data, saver=saver)
         self.destroy()
 
     def global_on_mousewheel(self, event):
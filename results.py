@@ -1,18 +1,24 @@
 # results.py
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter.scrolledtext import ScrolledText  # Using ScrolledText for better scrolling
-from utils import combine_text_for_display, clean_answer_text  # Ensure clean_answer_text is imported
-import base64
-from PIL import Image, ImageTk
-import io
+from question_model import TEXT, IMAGE_BASE64, load_questions
+from scoring import question_status, write_results_text
+from image_cache import thumbnail
+from PIL import ImageTk
+
+STATUS_TAGS = {"Correct": "status_correct", "Partially Correct": "status_partially_correct"}
+SAVE_POLL_MS = 200
 
 class ResultsWindow(tk.Toplevel):
-    def __init__(self, parent, results_data):
+    def __init__(self, parent, results_data, saver=None):
         super().__init__(parent)
         self.parent = parent
         self.results_data = results_data
+        self.saver = saver  # scoring.ResultsSaver still writing the results file, if any
+        self.questions = load_questions(results_data.get("questions", []))
         self.images = []  # To keep references to images
 
         self.title("Quiz Results")
@@ -40,6 +46,13 @@ class ResultsWindow(tk.Toplevel):
         save_btn = tk.Button(summary_frame, text="Save Results", font=("Segoe UI", 12), command=self.save_results)
         save_btn.grid(row=5, column=0, columnspan=2, pady=10)
 
+        # Progress of the automatic save
+        self.save_status = tk.Label(summary_frame, font=("Segoe UI", 10), fg="gray")
+        self.save_status.grid(row=6, column=0, columnspan=2)
+        if self.saver:
+            self.save_status.config(text="Saving results...")
+            self.after(SAVE_POLL_MS, self.check_saver)
+
         # Detailed Results Label
         tk.Label(self, text="Detailed Results:", font=("Segoe UI", 14, "bold")).grid(row=1, column=0, sticky="w", padx=10)
 
@@ -80,14 +93,14 @@ class ResultsWindow(tk.Toplevel):
 
     def populate_detailed_results(self):
         self.text_area.config(state="normal")
-        for idx, question in enumerate(self.results_data.get("questions", []), 1):
+        for idx, question in enumerate(self.questions, 1):
             # Insert Question Number and Text with Inline Images
             q_label = f"Q{idx}: "
             self.text_area.insert("end", q_label, "question")
-            for ptype, content in question.get("question_parts", []):
-                if ptype == "text":
+            for ptype, content in question.question_parts:
+                if ptype == TEXT:
                     self.text_area.insert("end", content + " ", "question")
-                elif ptype == "image_base64":
+                elif ptype == IMAGE_BASE64:
                     try:
                         image = self.decode_image(content)
                         self.text_area.insert("end", "\n", "")  # Line break before image
@@ -101,11 +114,10 @@ class ResultsWindow(tk.Toplevel):
             # Insert User's Answers with Color-Coding
             self.text_area.insert("end", "Your Answer(s):\n", "user_answer_label")
             user_picks = set(self.results_data.get("user_answers", [])[idx-1])
-            correct_answers = set(question.get("correct_answers", []))
+            correct_answers = set(question.correct_answers)
             if user_picks:
                 for letter in sorted(user_picks):
-                    ans_info = self.get_answer_info(question, letter)
-                    ans_text = ans_info["text"]
+                    ans_text, ans_image = question.answer_info(letter)
                     full_text = f"{letter}. {ans_text}\n"
                     if letter in correct_answers:
                         self.text_area.insert("end", full_text, "user_correct")
@@ -113,9 +125,9 @@ class ResultsWindow(tk.Toplevel):
                         self.text_area.insert("end", full_text, "user_incorrect")
                     
                     # Insert image if exists
-                    if ans_info["image"]:
+                    if ans_image:
                         try:
-                            image = self.decode_image(ans_info["image"])
+                            image = self.decode_image(ans_image)
                             self.text_area.insert("end", "\n", "")  # Line break before image
                             self.text_area.image_create("end", image=image)
                             self.images.append(image)  # Keep a reference
@@ -130,15 +142,14 @@ class ResultsWindow(tk.Toplevel):
             self.text_area.insert("end", "Correct Answer(s):\n", "correct_answer_label")
             if correct_answers:
                 for letter in sorted(correct_answers):
-                    ans_info = self.get_answer_info(question, letter)
-                    ans_text = ans_info["text"]
+                    ans_text, ans_image = question.answer_info(letter)
                     full_text = f"{letter}. {ans_text}\n"
                     self.text_area.insert("end", full_text, "correct_answer_text")
                     
                     # Insert image if exists
-                    if ans_info["image"]:
+                    if ans_image:
                         try:
-                            image = self.decode_image(ans_info["image"])
+                            image = self.decode_image(ans_image)
                             self.text_area.insert("end", "\n", "")  # Line break before image
                             self.text_area.image_create("end", image=image)
                             self.images.append(image)  # Keep a reference
@@ -150,53 +161,31 @@ class ResultsWindow(tk.Toplevel):
             self.text_area.insert("end", "\n")  # Add space after correct answers
 
             # Determine and Insert Status
-            if not correct_answers:
-                status = "No correct answer provided."
-                status_tag = "status_incorrect"
-            elif user_picks == correct_answers:
-                status = "Correct"
-                status_tag = "status_correct"
-            elif user_picks & correct_answers:
-                status = "Partially Correct"
-                status_tag = "status_partially_correct"
-            else:
-                status = "Incorrect"
-                status_tag = "status_incorrect"
+            status = question_status(question, user_picks)
+            status_tag = STATUS_TAGS.get(status, "status_incorrect")
             self.text_area.insert("end", f"Status: {status}\n\n", status_tag)
 
             # Insert Explanation if Available
-            explanation = question.get("explanation", "")
+            explanation = question.explanation
             if explanation:
                 self.text_area.insert("end", "Explanation:\n", "explanation_label")
                 self.text_area.insert("end", f"{explanation}\n\n", "explanation_text")
 
         self.text_area.config(state="disabled")
 
-    def get_answer_info(self, question, letter):
-        """Retrieve answer text and image based on the letter."""
-        answers = question.get("answers", [])
-        ans_index = ord(letter.upper()) - ord('A')
-        if 0 <= ans_index < len(answers):
-            ans_parts = answers[ans_index]
-            ans_text = ""
-            ans_image = None
-            for ptype, content in ans_parts:
-                if ptype == "text":
-                    ans_text += content + " "
-                elif ptype == "image_base64":
-                    ans_image = content
-            ans_text = ans_text.strip()
-            ans_text = clean_answer_text(ans_text)
-            return {"text": ans_text, "image": ans_image}
-        else:
-            return {"text": "[Unknown]", "image": None}
-
     def decode_image(self, image_base64):
         """Decode base64 image data and return a PhotoImage object."""
-        bdata = base64.b64decode(image_base64)
-        im = Image.open(io.BytesIO(bdata))
-        im.thumbnail((400, 300))  # Resize for better fit
-        return ImageTk.PhotoImage(im)
+        return ImageTk.PhotoImage(thumbnail(image_base64, (400, 300)))  # Resized for better fit
+
+    def check_saver(self):
+        if not self.winfo_exists():
+            return
+        if not self.saver.done:
+            self.after(SAVE_POLL_MS, self.check_saver)
+        elif self.saver.error:
+            self.save_status.config(text=f"Could not save the results: {self.saver.error}", fg="red")
+        else:
+            self.save_status.config(text=f"Results saved to {os.path.basename(self.saver.path)}")
 
     def save_results(self):
         """Allow the user to save the results manually."""
@@ -211,70 +200,7 @@ class ResultsWindow(tk.Toplevel):
 
         try:
             with open(file_path, "w", encoding="utf-8") as f:
-                # Write summary
-                f.write("Quiz Results\n")
-                f.write(f"Exam: {self.results_data.get('exam_name', 'N/A')}\n")
-                f.write(f"Score: {self.results_data.get('final_score', 0)} / {self.results_data.get('total_questions', 0)}\n")
-                f.write(f"Percentage: {self.results_data.get('percentage', 0)}%\n")
-                f.write(f"Elapsed Time: {self.results_data.get('elapsed_time', '00:00:00')}\n\n")
-                
-                # Write detailed results
-                f.write("Detailed Results:\n")
-                for idx, question in enumerate(self.results_data.get("questions", []), 1):
-                    # Write Question
-                    q_text = combine_text_for_display(question.get("question_parts", []))
-                    f.write(f"Q{idx}: {q_text}\n")
-                    
-                    # Indicate image if exists
-                    for ptype, content in question.get("question_parts", []):
-                        if ptype == "image_base64":
-                            # Images are not included in text files
-                            f.write("[Image]\n")
-
-                    # Write User's Answers
-                    f.write("Your Answer(s):\n")
-                    user_picks = set(self.results_data.get("user_answers", [])[idx-1])
-                    correct_answers = set(question.get("correct_answers", []))
-                    if user_picks:
-                        for letter in sorted(user_picks):
-                            ans_info = self.get_answer_info(question, letter)
-                            ans_text = ans_info["text"]
-                            f.write(f"{letter}. {ans_text}\n")
-                            # Indicate image if exists
-                            if ans_info["image"]:
-                                f.write("[Image]\n")
-                    else:
-                        f.write("No answer selected.\n")
-                    
-                    # Write Correct Answers
-                    f.write("Correct Answer(s):\n")
-                    if correct_answers:
-                        for letter in sorted(correct_answers):
-                            ans_info = self.get_answer_info(question, letter)
-                            ans_text = ans_info["text"]
-                            f.write(f"{letter}. {ans_text}\n")
-                            # Indicate image if exists
-                            if ans_info["image"]:
-                                f.write("[Image]\n")
-                    else:
-                        f.write("N/A\n")
-                    
-                    # Write Status
-                    if not correct_answers:
-                        status = "No correct answer provided."
-                    elif user_picks == correct_answers:
-                        status = "Correct"
-                    elif user_picks & correct_answers:
-                        status = "Partially Correct"
-                    else:
-                        status = "Incorrect"
-                    f.write(f"Status: {status}\n\n")
-
-                    # Write Explanation if Available
-                    explanation = question.get("explanation", "")
-                    if explanation:
-                        f.write("Explanation:\n")
-                        f.write(f"{explanation}\n\n")
+                write_results_text(self.results_data, f)
             messagebox.showinfo("Success", f"Results successfully saved to {file_path}.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save results.\n{e}")
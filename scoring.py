@@ -0,0 +1,136 @@
+# scoring.py
+
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from utils import format_hms, combine_text_for_display
+from question_model import IMAGE_BASE64, load_questions
+
+def question_status(question, picks):
+    """Status line of one answered question, as shown in the results."""
+    picks, correct = set(picks), set(question.correct_answers)
+    if not correct:
+        return "No correct answer provided."
+    if picks == correct:
+        return "Correct"
+    if picks & correct:
+        return "Partially Correct"
+    return "Incorrect"
+
+def build_results(exam_name, questions, user_answers, elapsed_seconds):
+    """
+    The results dict QuizGUI saves and ResultsWindow shows, for Questions and
+    the set of letters picked for each. A question scores the fraction of its
+    correct answers that were picked.
+    """
+    total_points = sum(q.score(picks) for q, picks in zip(questions, user_answers))
+    return {
+        "exam_name": exam_name,
+        "final_score": total_points,
+        "total_questions": len(questions),
+        "percentage": (total_points / len(questions)) * 100 if questions else 0,
+        "elapsed_time": format_hms(elapsed_seconds),
+        "user_answers": [sorted(picks) for picks in user_answers],
+        "questions": [q.to_dict() for q in questions],
+    }
+
+def write_results_text(results_data, fh):
+    """Plain-text report of a results dict (images become [Image] markers)."""
+    fh.write("Quiz Results\n")
+    fh.write(f"Exam: {results_data.get('exam_name', 'N/A')}\n")
+    fh.write(f"Score: {results_data.get('final_score', 0)} / {results_data.get('total_questions', 0)}\n")
+    fh.write(f"Percentage: {results_data.get('percentage', 0)}%\n")
+    fh.write(f"Elapsed Time: {results_data.get('elapsed_time', '00:00:00')}\n\n")
+
+    fh.write("Detailed Results:\n")
+    user_answers = results_data.get("user_answers", [])
+    for idx, question in enumerate(load_questions(results_data.get("questions", [])), 1):
+        fh.write(f"Q{idx}: {combine_text_for_display(question.question_parts)}\n")
+        for ptype, content in question.question_parts:
+            if ptype == IMAGE_BASE64:
+                fh.write("[Image]\n")
+
+        user_picks = set(user_answers[idx-1]) if idx <= len(user_answers) else set()
+        fh.write("Your Answer(s):\n")
+        if user_picks:
+            _write_answers(fh, question, user_picks)
+        else:
+            fh.write("No answer selected.\n")
+
+        fh.write("Correct Answer(s):\n")
+        if question.correct_answers:
+            _write_answers(fh, question, question.correct_answers)
+        else:
+            fh.write("N/A\n")
+
+        fh.write(f"Status: {question_status(question, user_picks)}\n\n")
+        if question.explanation:
+            fh.write("Explanation:\n")
+            fh.write(f"{question.explanation}\n\n")
+
+def _write_answers(fh, question, letters):
+    for letter in sorted(letters):
+        ans_text, ans_image = question.answer_info(letter)
+        fh.write(f"{letter}. {ans_text}\n")
+        if ans_image:
+            fh.write("[Image]\n")
+
+def write_results_csv(results_data, fh):
+    """One row per question: number, picks, correct answers, status and points."""
+    writer = csv.writer(fh)
+    writer.writerow(["index", "question_number", "your_answers", "correct_answers", "status", "points"])
+    user_answers = results_data.get("user_answers", [])
+    for idx, question in enumerate(load_questions(results_data.get("questions", [])), 1):
+        picks = user_answers[idx-1] if idx <= len(user_answers) else []
+        writer.writerow([idx, question.question_number, "".join(sorted(picks)), "".join(question.correct_answers),
+                         question_status(question, picks), round(question.score(picks), 4)])
+
+def save_results(results_data, results_folder):
+    """
+    Save a results dict as <exam>_results_<timestamp>.json in results_folder.
+    Returns the path. The file is written as '<path>.part' and renamed into
+    place, so a crash mid-write never leaves a truncated results file.
+    """
+    os.makedirs(results_folder, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(results_folder, f"{results_data.get('exam_name', 'exam')}_results_{timestamp}.json")
+    tmp_path = path + ".part"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(results_data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+class ResultsSaver:
+    """
+    save_results() on a background thread, so a large image-heavy attempt
+    doesn't freeze the window that finished it. Poll done, then path or
+    error, from the Tk thread. The thread is not a daemon: quitting right
+    after an exam still lets the save finish.
+    """
+    def __init__(self, results_data, results_folder):
+        self.path = None
+        self.error = None
+        self.thread = threading.Thread(target=self._run, args=(results_data, results_folder),
+                                       name="results-saver")
+        self.thread.start()
+
+    def _run(self, results_data, results_folder):
+        try:
+            self.path = save_results(results_data, results_folder)
+        except Exception as e:
+            self.error = e
+
+    @property
+    def done(self):
+        return not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        self.thread.join(timeout)
+        return self.done
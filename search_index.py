@@ -0,0 +1,201 @@
+# search_index.py
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from question_model import Question
+
+INDEX_FILE = ".search_index.db"     # One index per exams folder, next to the exams it covers
+
+logger = logging.getLogger(__name__)
+
+def question_entry(question):
+    """
+    (question number, searchable text) of a question dict or Question: its
+    text parts and the cleaned text of every answer.
+    """
+    question = Question.from_dict(question)
+    return question.question_number, "\n".join([question.question_text, *question.answer_texts])
+
+def match_expression(query):
+    """
+    FTS5 MATCH expression for what a user typed: every word must appear
+    (any order), "quoted phrases" must appear as written, and a trailing *
+    matches prefixes (fire* -> firehose). Returns None for an empty query.
+    """
+    terms = []
+    for token in re.findall(r'"[^"]*"|\S+', query):
+        prefix = token.endswith("*") and not token.startswith('"')
+        text = token.strip('"').rstrip("*")
+        words = re.findall(r"\w+", text)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        terms.append("body : " + term + ("*" if prefix else ""))
+    return " ".join(terms) or None
+
+def _exam_filter(exams):
+    phrases = ('"' + " ".join(re.findall(r"\w+", name)) + '"' for name in exams)
+    return "exam : (" + " OR ".join(phrases) + ")"
+
+class SearchIndex:
+    """
+    Full-text index (SQLite FTS5, BM25 ranking) over the question and answer
+    text of every exam JSON in a folder. Exams are re-indexed one at a time
+    when they change; sync() catches up with files changed outside ExaMate.
+    """
+    def __init__(self, exams_folder="./exams", db_path=None):
+        self.exams_folder = exams_folder
+        self.db_path = db_path or os.path.join(exams_folder, INDEX_FILE)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS exams (
+            name TEXT PRIMARY KEY,
+            mtime REAL,
+            size INTEGER,
+            questions INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY,     -- rowid of the question's text in question_text
+            exam TEXT NOT NULL,
+            question_index INTEGER NOT NULL,
+            question_number TEXT
+        );
+        CREATE INDEX IF NOT EXISTS entries_exam ON entries (exam);
+        -- exam holds the file name again, only so searches can be limited to some exams
+        CREATE VIRTUAL TABLE IF NOT EXISTS question_text USING fts5(body, exam, tokenize = 'porter unicode61');
+        """)
+
+    @classmethod
+    def for_exam(cls, exam_path):
+        """The index of the folder exam_path lives in."""
+        return cls(os.path.dirname(os.path.abspath(exam_path)))
+
+    # --- Updating ---
+
+    def index_exam(self, exam_path, entries=None):
+        """
+        (Re-)index one exam file. entries, the question_entry() of each question
+        in file order, saves reading the file back when the caller just wrote it.
+        """
+        name = os.path.basename(exam_path)
+        if entries is None:
+            with open(exam_path, "r", encoding="utf-8") as f:
+                entries = map(question_entry, json.load(f).get("questions", []))
+        stat = os.stat(exam_path)
+        with self.conn:
+            self._delete(name)
+            first = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM entries").fetchone()[0]
+            rows = [(first + index, number, body) for index, (number, body) in enumerate(entries)]
+            self.conn.executemany("INSERT INTO entries (id, exam, question_index, question_number) VALUES (?, ?, ?, ?)",
+                                  ((id_, name, id_ - first, number) for id_, number, _ in rows))
+            self.conn.executemany("INSERT INTO question_text (rowid, body, exam) VALUES (?, ?, ?)",
+                                  ((id_, body, name) for id_, _, body in rows))
+            self.conn.execute("INSERT OR REPLACE INTO exams (name, mtime, size, questions) VALUES (?, ?, ?, ?)",
+                              (name, stat.st_mtime, stat.st_size, len(rows)))
+        return len(rows)
+
+    def remove_exam(self, name):
+        with self.conn:
+            self._delete(name)
+            self.conn.execute("DELETE FROM exams WHERE name = ?", (name,))
+
+    def _delete(self, name):
+        self.conn.execute("DELETE FROM question_text WHERE rowid IN (SELECT id FROM entries WHERE exam = ?)", (name,))
+        self.conn.execute("DELETE FROM entries WHERE exam = ?", (name,))
+
+    def sync(self):
+        """Index new or changed exams in the folder and drop deleted ones. Returns (indexed, removed)."""
+        known = {name: (mtime, size) for name, mtime, size in self.conn.execute("SELECT name, mtime, size FROM exams")}
+        present = set()
+        indexed = 0
+        for name in os.listdir(self.exams_folder):
+            if not name.lower().endswith(".json"):
+                continue
+            path = os.path.join(self.exams_folder, name)
+            stat = os.stat(path)
+            present.add(name)
+            if known.get(name) == (stat.st_mtime, stat.st_size):
+                continue
+            try:
+                self.index_exam(path)
+                indexed += 1
+            except (OSError, ValueError) as e:
+                logger.warning("Could not index %s: %s", name, e)
+        removed = set(known) - present
+        for name in removed:
+            self.remove_exam(name)
+        return indexed, len(removed)
+
+    # --- Searching ---
+
+    def search(self, query, limit=50, exams=None):
+        """
+        Best-matching questions first, as dicts with exam, question_index,
+        question_number, score (higher is better) and a snippet with the
+        matches in [brackets]. exams limits the search to those file names.
+        """
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        # Rank inside FTS5 (ORDER BY rank stops at the limit), then look up only the hits
+        sql = ("SELECT rowid, rank, snippet(question_text, 0, '[', ']', '...', 12) "
+               "FROM question_text WHERE question_text MATCH ?")
+        params = []
+        if exams:
+            # The phrase filter narrows the match; the IN keeps exact names only (not x-aws.json for aws.json)
+            expression = f"({expression}) AND {_exam_filter(exams)}"
+            sql += f" AND exam IN ({', '.join('?' * len(exams))})"
+            params = list(exams)
+        ranked = self.conn.execute(sql + " ORDER BY rank LIMIT ?", (expression, *params, limit)).fetchall()
+        if not ranked:
+            return []
+        entries = {row[0]: row[1:] for row in self.conn.execute(
+            f"SELECT id, exam, question_index, question_number FROM entries WHERE id IN ({', '.join('?' * len(ranked))})",
+            [rowid for rowid, _, _ in ranked])}
+        hits = []
+        for rowid, rank, snippet in ranked:
+            exam, question_index, question_number = entries[rowid]
+            hits.append({"exam": exam, "question_index": question_index, "question_number": question_number,
+                         "score": -rank, "snippet": snippet})     # rank is bm25(), lower-is-better
+        return hits
+
+    def exam_names(self):
+        return [name for (name,) in self.conn.execute("SELECT name FROM exams ORDER BY name")]
+
+    def close(self):
+        self.conn.close()
+
+def load_hit_questions(exams_folder, hits):
+    """The question dicts of search hits, in hit order (each exam file is read once)."""
+    exams = {}
+    questions = []
+    for hit in hits:
+        if hit["exam"] not in exams:
+            with open(os.path.join(exams_folder, hit["exam"]), "r", encoding="utf-8") as f:
+                exams[hit["exam"]] = json.load(f).get("questions", [])
+        exam = exams[hit["exam"]]
+        if hit["question_index"] < len(exam):
+            questions.append(exam[hit["question_index"]])
+    return questions
+
+def update_index_for(exam_path, entries=None):
+    """
+    Re-index an exam that was just written, in the index of its folder.
+    Indexing problems are logged, never raised: the exam itself was saved.
+    """
+    started = time.perf_counter()
+    try:
+        index = SearchIndex.for_exam(exam_path)
+        try:
+            count = index.index_exam(exam_path, entries)
+        finally:
+            index.close()
+        logger.info("Indexed %d question(s) of %s in %.0f ms", count, exam_path, 1000 * (time.perf_counter() - started))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.warning("Could not update the search index for %s: %s", exam_path, e)
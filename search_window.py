@@ -0,0 +1,129 @@
+# search_window.py
+
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from search_index import SearchIndex, load_hit_questions
+
+SYNC_POLL_MS = 100      # How often the window checks on the background sync
+
+class SearchWindow(tk.Toplevel):
+    """
+    Full-text search over every exam in the exams folder, with a button to
+    start a quiz from the selected hits (or all of them).
+    """
+    def __init__(self, parent, exams_folder="./exams", results_folder="./results", limit=200):
+        super().__init__(parent)
+        self.parent = parent
+        self.exams_folder = exams_folder
+        self.results_folder = results_folder
+        self.limit = limit
+        self.hits = []
+        self.title("ExaMate - Search Questions")
+        self.geometry("900x550")
+
+        self.index = SearchIndex(exams_folder)
+
+        top = tk.Frame(self)
+        top.pack(fill="x", padx=10, pady=10)
+        tk.Label(top, text="Search:", font=("Segoe UI", 12)).pack(side="left")
+        self.query_var = tk.StringVar()
+        entry = tk.Entry(top, textvariable=self.query_var, font=("Segoe UI", 12))
+        entry.pack(side="left", fill="x", expand=True, padx=5)
+        entry.bind("<Return>", lambda e: self.run_search())
+        entry.focus_set()
+        tk.Button(top, text="Search", command=self.run_search).pack(side="left")
+
+        tk.Label(self, text='All words must match; use "quotes" for phrases and word* for prefixes.',
+                 font=("Segoe UI", 9), fg="gray").pack(anchor="w", padx=10)
+
+        table = tk.Frame(self)
+        table.pack(fill="both", expand=True, padx=10, pady=5)
+        columns = ("exam", "number", "snippet")
+        self.tree = ttk.Treeview(table, columns=columns, show="headings", selectmode="extended")
+        for column, heading, width in zip(columns, ("Exam", "Question", "Match"), (180, 80, 600)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "snippet")
+        scroll = tk.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        bottom = tk.Frame(self)
+        bottom.pack(fill="x", padx=10, pady=10)
+        self.status_label = tk.Label(bottom, text="Indexing...")
+        self.status_label.pack(side="left")
+        tk.Button(bottom, text="Close", command=self.close).pack(side="right")
+        tk.Button(bottom, text="Start Quiz from Results", font=("Segoe UI", 11, "bold"),
+                  command=self.start_quiz).pack(side="right", padx=5)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Catch up with exams changed outside ExaMate without blocking the window;
+        # searches meanwhile see what was already indexed
+        self.sync_outcome = {}
+        self.sync_thread = threading.Thread(target=self.sync_index, daemon=True)
+        self.sync_thread.start()
+        self.sync_job = self.after(SYNC_POLL_MS, self.check_sync)
+
+    def sync_index(self):
+        index = SearchIndex(self.exams_folder)     # A connection of its own: sqlite3 ones stay on their thread
+        try:
+            self.sync_outcome["result"] = index.sync()
+        except Exception as e:
+            self.sync_outcome["error"] = e
+        finally:
+            index.close()
+
+    def check_sync(self):
+        if self.sync_thread.is_alive():
+            self.sync_job = self.after(SYNC_POLL_MS, self.check_sync)
+            return
+        self.sync_job = None
+        if "error" in self.sync_outcome:
+            self.status_label.config(text=f"Indexing failed: {self.sync_outcome['error']}")
+            return
+        if self.query_var.get().strip():
+            self.run_search()       # Searched while indexing: the index is complete now
+            return
+        indexed, removed = self.sync_outcome["result"]
+        self.status_label.config(text=f"{len(self.index.exam_names())} exam(s) indexed"
+                                 + (f" ({indexed} updated, {removed} removed)" if indexed or removed else ""))
+
+    def run_search(self):
+        query = self.query_var.get().strip()
+        started = time.perf_counter()
+        self.hits = self.index.search(query, limit=self.limit)
+        elapsed = 1000 * (time.perf_counter() - started)
+        self.tree.delete(*self.tree.get_children())
+        for i, hit in enumerate(self.hits):
+            self.tree.insert("", "end", iid=str(i), values=(hit["exam"], f"#{hit['question_number']}",
+                                                            hit["snippet"].replace("\n", " ")))
+        more = "+" if len(self.hits) == self.limit else ""
+        indexing = " (still indexing...)" if self.sync_thread.is_alive() else ""
+        self.status_label.config(text=f"{len(self.hits)}{more} hit(s) in {elapsed:.0f} ms{indexing}")
+
+    def start_quiz(self):
+        from quizgui import QuizGUI
+        selected = [self.hits[int(iid)] for iid in self.tree.selection()] or self.hits
+        if not selected:
+            messagebox.showinfo("No Results", "Search for something first.", parent=self)
+            return
+        try:
+            questions = load_hit_questions(self.exams_folder, selected)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load the questions.\n{e}", parent=self)
+            return
+        query = self.query_var.get().strip()
+        exam_name = "Search - " + (re.sub(r"[^\w\- ]+", "", query)[:40].strip() or "results")
+        quiz_window = QuizGUI(self.parent, {"title": exam_name, "questions": questions},
+                              exam_name=exam_name, results_folder=self.results_folder)
+        quiz_window.focus()
+        quiz_window.grab_set()
+
+    def close(self):
+        if self.sync_job:
+            self.after_cancel(self.sync_job)
+        self.index.close()
+        self.destroy()
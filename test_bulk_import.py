@@ -0,0 +1,101 @@
+# test_bulk_import.py
+
+import unittest
+import base64
+import json
+import os
+import shutil
+import tempfile
+from bulk_import import import_questions, parse_letters, validate
+from exam_store import ExamStore
+
+PNG = b"\x89PNG\r\n\x1a\n fake image bytes"
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, "images"))
+        with open(os.path.join(self.folder, "images", "diagram.png"), "wb") as f:
+            f.write(PNG)
+        self.store = ExamStore()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.folder)
+
+    def write(self, name, text):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def questions(self):
+        return list(self.store)
+
+    def test_csv(self):
+        path = self.write("questions.csv",
+                          "Number,Question,Image,A,B,C,D,E,A_image,Correct,Explanation\n"
+                          "1,Which service streams data?,,Kinesis,SQS,,,,,A,Kinesis streams.\n"
+                          "2,Pick two,images/diagram.png,One,Two,Three,Four,Five,images/diagram.png,\"A, E\",\n"
+                          "3,Too few answers,,Yes,No,,,,,C,\n"
+                          "4,Missing picture,images/missing.png,Yes,No,,,,,A,\n"
+                          "\n"
+                          "5,Gap in the answers,,Yes,,Maybe,,,,A,\n")
+        report = import_questions(self.store, path, batch_size=2, workers=2)
+        self.assertEqual((report["rows"], report["imported"]), (5, 2))
+        errors = dict(report["errors"])
+        self.assertIn("only has answers A-B", errors["line 4"])
+        self.assertIn("images/missing.png", errors["line 5"])
+        self.assertEqual(errors["line 7"], "answer B is empty")
+        first, second = self.questions()
+        self.assertEqual(first["answers"], [[["text", "A. Kinesis"]], [["text", "B. SQS"]]])
+        self.assertEqual(first["explanation"], "Kinesis streams.")
+        encoded = base64.b64encode(PNG).decode("ascii")
+        self.assertEqual(second["question_parts"], [["text", "Pick two"], ["image_base64", encoded]])
+        self.assertEqual(second["answers"][0], [["text", "A. One"], ["image_base64", encoded]])
+        self.assertEqual((len(second["answers"]), second["correct_answers"]), (5, ["A", "E"]))
+        self.assertEqual(self.store.changes, 2)
+
+    def test_markdown(self):
+        path = self.write("questions.md",
+                          "# Networking\n\n"
+                          "## Question 12\n"
+                          "Which diagram shows a VPC?\n"
+                          "![vpc](images/diagram.png)\n"
+                          "A. The first\n"
+                          "- B) The second, whose text\n"
+                          "  runs over two lines\n"
+                          "C. The third ![](images/diagram.png)\n"
+                          "Answer: b\n"
+                          "Explanation: Only the second\n"
+                          "has subnets.\n\n"
+                          "## 13\n"
+                          "What is A. here?\n"
+                          "A. Yes\n"
+                          "Correct answers: A, D\n")
+        report = import_questions(self.store, path)
+        self.assertEqual(report["errors"], [("line 14", "correct answer 'D' but the question only has answers A-A")])
+        (question,) = self.questions()
+        self.assertEqual(question["question_number"], "12")
+        self.assertEqual(question["question_parts"][0], ["text", "Which diagram shows a VPC?"])
+        self.assertEqual(question["question_parts"][1][0], "image_base64")
+        self.assertEqual([a[0][1] for a in question["answers"]],
+                         ["A. The first", "B. The second, whose text runs over two lines", "C. The third"])
+        self.assertEqual(question["answers"][2][1][0], "image_base64")
+        self.assertEqual((question["correct_answers"], question["explanation"]), (["B"], "Only the second has subnets."))
+
+    def test_exam_json_and_letters(self):
+        good = {"question_number": "1", "question_parts": [["text", "Q"]],
+                "answers": [[["text", "A. x"]], [["text", "B. y"]]], "correct_answers": ["B"]}
+        bad = dict(good, correct_answers=["C"])
+        path = self.write("other.json", json.dumps({"title": "Other", "questions": [good, bad, good]}))
+        report = import_questions(self.store, path)
+        self.assertEqual((report["imported"], [where for where, _ in report["errors"]]), (2, ["question 2"]))
+        self.assertEqual(self.questions(), [good, good])
+        self.assertEqual(parse_letters("a, c;C"), ["A", "C"])
+        self.assertEqual(validate(dict(good, question_parts=[["text", " "]])), "the question has no text")
+        with self.assertRaises(ValueError):
+            import_questions(self.store, self.write("notes.docx", ""))
+
+if __name__ == "__main__":
+    unittest.main()
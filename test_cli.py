@@ -0,0 +1,64 @@
+# test_cli.py
+
+import unittest
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import contextlib
+import cli
+from exam_generator import generate_exam_folder
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.bank = os.path.join(self.folder, "bank")
+        generate_exam_folder(self.bank, questions=20, cards_per_page=5, image_rate=0.0, seed=3)
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(cli.main(list(argv)), 0)
+        return out.getvalue()
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def test_parse_sample_score_export(self):
+        self.run_cli("parse", self.bank, "--exams-dir", self.path("exams"))
+        self.run_cli("sample", self.path("exams/bank.json"), "-n", "4", "--seed", "1", "-o", self.path("four.json"))
+        with open(self.path("four.json"), encoding="utf-8") as fh:
+            questions = json.load(fh)["questions"]
+        self.assertEqual(len(questions), 4)
+
+        # Right answers for the first two questions, nothing for the rest
+        with open(self.path("sheet.csv"), "w", encoding="utf-8") as fh:
+            fh.write("question_number,answers\n")
+            for q in questions[:2]:
+                fh.write(f"{q['question_number']},{''.join(q['correct_answers'])}\n")
+        self.run_cli("score", self.path("four.json"), self.path("sheet.csv"), "-o", self.path("results.json"))
+        with open(self.path("results.json"), encoding="utf-8") as fh:
+            results = json.load(fh)
+        self.assertEqual((results["final_score"], results["percentage"]), (2.0, 50.0))
+
+        report = self.run_cli("export", self.path("results.json"))
+        self.assertIn("Score: 2.0 / 4", report)
+        self.assertEqual(report.count("Status: Correct"), 2)
+        self.run_cli("export", self.path("results.json"), "-o", self.path("results.csv"))
+        with open(self.path("results.csv"), encoding="utf-8") as fh:
+            self.assertEqual(len(fh.read().splitlines()), 5)
+
+    def test_startup_imports_stay_light(self):
+        code = "import sys, cli; print(sorted(m for m in ('tkinter', 'PIL', 'bs4', 'requests') if m in sys.modules))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(cli.__file__)), check=True).stdout
+        self.assertEqual(out.strip(), "[]")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# test_dedup.py
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from dedup import Deduplicator, dedup_exams, format_report
+from parse_html import parse_html_to_json
+from exam_generator import generate_exam_folder
+
+TEXT = ("A company stores application logs in Amazon S3 and wants to query them with standard SQL "
+        "without loading them into a database first. Which service should a solutions architect use?")
+ANSWERS = ["Amazon Athena", "Amazon Redshift with COPY commands", "AWS Glue DataBrew", "Amazon EMR with Hive"]
+
+def _question(number, text=TEXT, answers=ANSWERS, image=None, **extra):
+    parts = [["text", text]] + ([["image_base64", image]] if image else [])
+    return dict({"question_number": str(number), "question_parts": parts,
+                 "answers": [[["text", f"{letter}. {answer}"]] for letter, answer in zip("ABCD", answers)],
+                 "correct_answers": ["A"]}, **extra)
+
+class TestDedup(unittest.TestCase):
+    def test_exact_and_near_copies(self):
+        dedup = Deduplicator()
+        self.assertIsNone(dedup.add(_question(1)))
+        # Different punctuation, case and answer order is still an exact copy
+        self.assertEqual(dedup.add(_question(9, TEXT.upper().replace(",", ""), ANSWERS[::-1], correct_answers=["D"])), 0)
+        # One word changed: a near copy
+        self.assertEqual(dedup.add(_question(2, TEXT.replace("company", "startup"))), 0)
+        # Same text, different exhibit: a different question
+        self.assertIsNone(dedup.add(_question(3, "Refer to the exhibit. What does it show?", image="aGVsbG8=")))
+        self.assertIsNone(dedup.add(_question(4, "Refer to the exhibit. What does it show?", image="d29ybGQ=")))
+        self.assertIsNone(dedup.add(_question(5, "Which service sends email?", ["Amazon SES", "Amazon SNS"])))
+        self.assertEqual(dedup.duplicates, 2)
+        report = dedup.report()
+        self.assertEqual(len(report["clusters"]), 1)
+        members = report["clusters"][0]["members"]
+        self.assertEqual([m["question_number"] for m in members], ["1", "9", "2"])
+        self.assertEqual([m["exact"] for m in members], [True, True, False])
+        self.assertEqual(report["clusters"][0]["kind"], "near")
+        self.assertIn("1 cluster(s)", format_report(report))
+
+    def test_different_correct_answers_are_different_questions(self):
+        dedup = Deduplicator()
+        most = "Which option is the MOST cost-effective way to store rarely accessed backups?"
+        answers = ["S3 Glacier Deep Archive", "EBS Provisioned IOPS volumes", "S3 Standard", "EFS Standard"]
+        self.assertIsNone(dedup.add(_question(1, most, answers)))
+        # Same answers, one word different, another correct answer: not a copy
+        self.assertIsNone(dedup.add(_question(2, most.replace("MOST", "LEAST"), answers, correct_answers=["B"])))
+        # Exact text too: the correct answer alone keeps them apart
+        self.assertIsNone(dedup.add(_question(3, most, answers, correct_answers=["C"])))
+        self.assertEqual(dedup.add(_question(4, most, answers[::-1], correct_answers=["D"])), 0)
+        # A copy whose correct answer wasn't captured still matches
+        self.assertEqual(dedup.add(_question(5, most, answers, correct_answers=[])), 0)
+        self.assertEqual(dedup.duplicates, 2)
+
+    def test_policies(self):
+        dedup = Deduplicator()
+        dedup.add(_question(1), "old.json")
+        dedup.add(_question(2, image="aW1n"), "new.json")    # same text + an image: near copy, richer
+        dedup.add(_question(3, explanation="Athena queries S3 in place."), "new.json")
+        self.assertEqual(dedup.keep("first"), {0})
+        self.assertEqual(dedup.keep("last"), {2})
+        self.assertEqual(dedup.keep("richest"), {1})
+        self.assertEqual(dedup.keep("first", across_sources=False), {0, 1})
+        with self.assertRaises(ValueError):
+            dedup.keep("newest")
+
+    def test_dedup_exams_rewrites_files(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        paths = []
+        for name, questions in (("a.json", [_question(1), _question(2, "Which service sends email?"), _question(3)]),
+                                ("b.json", [_question(7), _question(8, "What is a VPC endpoint?")])):
+            paths.append(os.path.join(folder, name))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                json.dump({"title": name, "questions": questions}, f)
+
+        report = dedup_exams(paths, dry_run=True)
+        self.assertEqual((report["questions"], report["removed"]), (5, 1))
+        self.assertEqual(report["clusters"][0]["sources"], ["a.json", "b.json"])
+
+        report = dedup_exams(paths, policy="last", across_exams=True)
+        self.assertEqual(report["removed"], 2)
+        numbers = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                numbers.append([q["question_number"] for q in json.load(f)["questions"]])
+        self.assertEqual(numbers, [["2"], ["7", "8"]])
+
+    def test_parse_drops_repeated_pages(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        bank = os.path.join(folder, "bank")
+        generate_exam_folder(bank, questions=12, cards_per_page=5, image_rate=0.0, seed=4)
+        shutil.copy(os.path.join(bank, "page-00001.html"), os.path.join(bank, "page-00004.html"))
+        dedup = Deduplicator()
+        output = os.path.join(folder, "exam.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_html_to_json(bank, output, index=False, dedup=dedup)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["questions"]), 12)
+        self.assertEqual(dedup.duplicates, 5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_html_to_json(bank, output, index=False, dedup=False)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["questions"]), 17)
+
+if __name__ == "__main__":
+    unittest.main()
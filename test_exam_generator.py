@@ -0,0 +1,40 @@
+# test_exam_generator.py
+
+import unittest
+import io
+import json
+import os
+import shutil
+import tempfile
+import contextlib
+from exam_generator import generate_exam_folder
+from parse_html import parse_html_to_json
+from _classes import CardList
+
+class TestExamGenerator(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        generate_exam_folder(self.folder, questions=25, cards_per_page=10, multi_answer_rate=0.5, image_rate=0.5, seed=4)
+
+    def test_both_parsers_read_every_question(self):
+        output = os.path.join(self.folder, "exam.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_html_to_json(self.folder, output)
+        with open(output, encoding="utf-8") as fh:
+            questions = json.load(fh)["questions"]
+        self.assertEqual(len(questions), 25)
+        self.assertTrue(all(len(q["answers"]) == 4 and q["correct_answers"] for q in questions))
+        self.assertTrue(any(len(q["correct_answers"]) == 2 for q in questions))
+        parts = [part for q in questions for part in q["question_parts"]]
+        self.assertIn("image_base64", {kind for kind, _ in parts})
+        self.assertNotIn("NOT_FOUND", {content for _, content in parts})
+
+        by_number = {q["question_number"]: q["correct_answers"] for q in questions}
+        cards = CardList(self.folder).get_cards()
+        self.assertEqual({card.question_number: card.correct_answer for card in cards}, by_number)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# test_exam_store.py
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+from exam_io import ExamStreamReader
+from exam_store import ExamStore, EDIT_FOLDER
+from question_model import Question
+
+def _question(number, text, image=None):
+    parts = [["text", text]] + ([["image_base64", image]] if image else [])
+    return {"question_number": str(number), "question_parts": parts,
+            "answers": [[["text", "A. Yes"]], [["text", "B. No"]]], "correct_answers": ["A"]}
+
+class TestExamStore(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "exam.json")
+        questions = [_question(i, f"Question {i} about Kinesis streams" if i % 10 == 0 else f"Question {i} about Lambda")
+                     for i in range(1, 101)]
+        questions[4] = _question(5, "Pick the diagram", image="aGVsbG8=")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"title": "Store", "questions": questions}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_pages_and_filter(self):
+        store = ExamStore.open_exam(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual((store.title, store.count(), store.changes), ("Store", 100, 0))
+        rows = store.rows(10, 3)
+        self.assertEqual([(idx, number) for _, idx, number, _, _ in rows], [(11, "11"), (12, "12"), (13, "13")])
+        self.assertEqual(store.rows(4, 1)[0][4], 1)     # Image count, without reading the question
+        self.assertEqual(store.count("kine"), 10)       # The last word matches as a prefix
+        rows = store.rows(2, 2, "kinesis")
+        self.assertEqual([(idx, number) for _, idx, number, _, _ in rows], [(30, "30"), (40, "40")])
+        self.assertEqual(store.row_of(rows[1][0], "kinesis"), 3)
+        self.assertIsNone(store.row_of(store.rows(0, 1)[0][0], "kinesis"))
+        self.assertEqual(store.get(rows[0][0]).question_text, "Question 30 about Kinesis streams")
+
+    def test_edits_persist_until_exported(self):
+        store = ExamStore.open_exam(self.path)
+        first_id = store.rows(0, 1)[0][0]
+        store.update(first_id, Question("1", [("text", "Rewritten about DynamoDB")], [[("text", "A. Yes")]], ["A"]))
+        store.delete(store.rows(1, 1)[0][0])
+        new_id = store.add(_question(101, "A new DynamoDB question"))
+        self.assertEqual((store.changes, store.count(), store.count("dynamodb")), (3, 100, 2))
+        self.assertEqual(store.row_of(new_id), 99)
+        store.close()
+        self.assertTrue(os.path.exists(os.path.join(self.folder, EDIT_FOLDER, "exam.json.db")))
+
+        store = ExamStore.open_exam(self.path)      # The exam file is unchanged: edits are restored
+        self.assertEqual((store.changes, store.count("dynamodb")), (3, 2))
+        self.assertEqual(store.export(self.path, title="Edited"), 100)
+        self.assertEqual(store.changes, 0)
+        store.close(delete=True)        # What the editor does once nothing is left to save
+        self.assertFalse(os.path.exists(os.path.join(self.folder, EDIT_FOLDER)))
+        with ExamStreamReader(self.path) as reader:
+            self.assertEqual(reader.title, "Edited")
+            questions = list(reader)
+        self.assertEqual([q["question_number"] for q in questions[:2]], ["1", "3"])
+        self.assertEqual(questions[0]["question_parts"], [["text", "Rewritten about DynamoDB"]])
+        self.assertEqual(questions[3]["question_parts"][1], ["image_base64", "aGVsbG8="])
+        self.assertEqual(questions[-1]["question_number"], "101")
+
+        with open(self.path, "w", encoding="utf-8") as f:   # Changed outside the editor: re-imported
+            json.dump({"title": "Other", "questions": [_question(1, "Only one")]}, f)
+        store = ExamStore.open_exam(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual((store.title, store.count(), store.changes), ("Other", 1, 0))
+
+    def test_reload_from_another_connection(self):
+        store = ExamStore.working_copy(self.path)     # What the editor opens: nothing imported yet
+        self.addCleanup(store.close)
+        self.assertFalse(store.is_current(self.path))
+        self.assertEqual(store.count(), 0)
+
+        def load():     # Like the editor's loader thread: a connection of its own
+            loader = ExamStore(store.db_path)
+            loader.reload(self.path, batch_size=7)
+            loader.close()
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+        self.assertTrue(store.is_current(self.path))
+        self.assertEqual((store.count(), store.count("kinesis"), store.title), (100, 10, "Store"))
+
+    def test_temporary_store(self):
+        store = ExamStore()
+        db_path = store.db_path
+        self.assertEqual(store.import_questions([_question(i, "Text") for i in range(7)], batch_size=3), 7)
+        self.assertEqual([idx for _, idx, *_ in store.rows(0, 10)], list(range(1, 8)))
+        store.close()
+        self.assertFalse(os.path.exists(db_path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# test_exam_tools.py
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from exam_io import ExamStreamReader, ExamStreamWriter
+from exam_tools import merge_exams, split_exam, parse_ranges
+
+def _question(number, text):
+    return {"question_number": str(number), "question_parts": [["text", text]],
+            "answers": [[["text", "A. Yes"]], [["text", "B. No"]]], "correct_answers": ["A"]}
+
+class TestExamTools(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.first = self.write("first.json", "First", [
+            _question(1, "Which service runs code without servers? Lambda."),
+            _question(2, "Which service streams data? Kinesis."),
+            _question(3, "How do you grant bucket access to another account?"),
+        ])
+        self.second = self.write("second.json", "Second", [
+            _question(7, "Which service streams data? Kinesis."),          # copy of first.json #2
+            _question(8, "What limits concurrent Lambda executions?"),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write(self, name, title, questions, indent=2):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"title": title, "questions": questions, "version": 2}, f, indent=indent)
+        return path
+
+    def numbers(self, path):
+        with ExamStreamReader(path) as reader:
+            return [q["question_number"] for q in reader]
+
+    def test_stream_reader(self):
+        ExamStreamReader.CHUNK = 5     # Force values to straddle reads
+        self.addCleanup(setattr, ExamStreamReader, "CHUNK", 1 << 16)
+        for indent in (None, 2):
+            path = self.write("big.json", "Big \"exam\"", [_question(i, "x" * i + " é") for i in range(40)], indent)
+            with ExamStreamReader(path) as reader:
+                self.assertEqual(reader.title, 'Big "exam"')
+                questions = list(reader)
+            self.assertEqual(questions, [_question(i, "x" * i + " é") for i in range(40)])
+            self.assertEqual(reader.meta["version"], 2)
+        with ExamStreamWriter(path, title="Written") as writer:
+            writer.append(_question(1, "one"))
+        with ExamStreamReader(path) as reader:
+            self.assertEqual((reader.title, [q["question_number"] for q in reader]), ("Written", ["1"]))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"title": "Cut", "questions": [{"question_number": "1"}, {"question_')
+        with self.assertRaises(ValueError):
+            list(ExamStreamReader(path))
+
+    def test_merge(self):
+        output = os.path.join(self.folder, "merged.json")
+        self.assertEqual(merge_exams([self.first, self.second], output, index=False), (5, 0))
+        self.assertEqual(self.numbers(output), ["1", "2", "3", "7", "8"])
+        with ExamStreamReader(output) as reader:
+            self.assertEqual(reader.title, "First")
+        self.assertEqual(merge_exams([self.first, self.second], output, title="Both", dedup=True, index=False), (4, 1))
+        self.assertEqual(self.numbers(output), ["1", "2", "3", "8"])
+        merge_exams([self.first, self.second], output, dedup=True, policy="last", index=False)
+        self.assertEqual(self.numbers(output), ["1", "3", "7", "8"])
+        with self.assertRaises(ValueError):
+            merge_exams([self.first, self.second], self.first)
+
+    def test_split(self):
+        parts = split_exam(self.first, mode="count", count=2, index=False)
+        self.assertEqual([(os.path.basename(p), n) for p, n in parts], [("first-part01.json", 2), ("first-part02.json", 1)])
+        self.assertEqual(self.numbers(parts[1][0]), ["3"])
+
+        out = os.path.join(self.folder, "out")
+        parts = split_exam(self.first, out, mode="range", ranges=parse_ranges("1, 3-10"), index=False)
+        self.assertEqual({os.path.basename(p): n for p, n in parts},
+                         {"first-q1-1.json": 1, "first-other.json": 1, "first-q3-10.json": 1})
+
+        parts = split_exam(self.second, out, mode="keyword", keywords=["lambda", "bucket"], index=False)
+        self.assertEqual([(os.path.basename(p), n) for p, n in parts], [("second-other.json", 1), ("second-lambda.json", 1)])
+        with ExamStreamReader(parts[1][0]) as reader:
+            self.assertEqual(reader.title, "Second - lambda")
+        with self.assertRaises(ValueError):
+            parse_ranges("5-1")
+        with self.assertRaises(ValueError):
+            split_exam(self.first, mode="count", count=0)
+
+if __name__ == "__main__":
+    unittest.main()
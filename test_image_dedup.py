@@ -0,0 +1,88 @@
+# test_image_dedup.py
+
+import unittest
+import base64
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+from PIL import Image, ImageDraw
+from image_dedup import dedup_images, format_report
+from image_cache import thumbnail
+
+def diagram(size=(600, 400), fmt="PNG", label=None, seed=1):
+    """A box-and-line diagram drawn at 600x400, saved at size."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (600, 400), "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(540), rng.randrange(350)
+        draw.rectangle([x, y, x + 50, y + 30], outline="black", fill=rng.choice(["#88f", "#f88", "#8f8"]))
+        draw.line([x, y, rng.randrange(600), rng.randrange(400)], fill="black", width=2)
+    if label:
+        draw.text((20, 20), label, fill="black")
+    out = io.BytesIO()
+    image.resize(size).save(out, fmt)
+    return base64.b64encode(out.getvalue()).decode()
+
+def _question(number, image):
+    return {"question_number": str(number), "question_parts": [["text", f"Question {number}"], ["image_base64", image]],
+            "answers": [[["text", "A. Yes"]], [["text", "B. No"]]], "correct_answers": ["A"]}
+
+class TestImageDedup(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.small = diagram((300, 200), "JPEG")
+        self.large = diagram((900, 600))
+        self.labelled = diagram(label="10.0.2.0/24")
+        self.other = diagram(seed=2)
+        self.paths = [self.write("a.json", [self.large, self.labelled, "NOT_FOUND"]),
+                      self.write("b.json", [self.small, self.large, self.other])]
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def write(self, name, images):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"title": name, "questions": [_question(i, image) for i, image in enumerate(images, 1)]}, f)
+        return path
+
+    def images(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [q["question_parts"][1][1] for q in json.load(f)["questions"]]
+
+    def test_collapses_variants_across_exams(self):
+        before = os.path.getsize(self.paths[0])
+        report = dedup_images(self.paths, dry_run=True, workers=1)
+        self.assertEqual((report["images"], report["unique"], report["undecodable"]), (6, 5, 1))
+        self.assertEqual(len(report["groups"]), 1)
+        self.assertEqual(report["replaced"], 2)     # both uses of the large PNG
+        self.assertEqual(report["bytes_saved"], 2 * (len(self.large) - len(self.small)))
+        self.assertEqual(os.path.getsize(self.paths[0]), before)
+        self.assertIn("1 group(s)", format_report(report))
+
+        report = dedup_images(self.paths, workers=1)
+        # The labelled copy and the unrelated diagram are different pictures and stay
+        self.assertEqual(self.images(self.paths[0]), [self.small, self.labelled, "NOT_FOUND"])
+        self.assertEqual(self.images(self.paths[1]), [self.small, self.small, self.other])
+        self.assertEqual(sum(e["bytes_saved"] for e in report["exams"]), report["bytes_saved"])
+        self.assertLess(os.path.getsize(self.paths[0]), before)
+
+    def test_keep_largest(self):
+        out = os.path.join(self.folder, "out")
+        dedup_images(self.paths, keep="largest", output_folder=out, workers=1)
+        self.assertEqual(self.images(os.path.join(out, "b.json")), [self.large, self.large, self.other])
+        self.assertEqual(self.images(self.paths[1])[0], self.small)     # Originals untouched
+
+    def test_thumbnail_cache(self):
+        thumbnail.cache_clear()
+        first = thumbnail(self.large, (400, 300))
+        self.assertIs(thumbnail(self.large, (400, 300)), first)
+        self.assertEqual(first.size, (400, 267))
+        self.assertEqual(thumbnail.cache_info().hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
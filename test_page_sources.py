@@ -0,0 +1,83 @@
+# test_page_sources.py
+
+import unittest
+import os
+import io
+import json
+import base64
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from page_sources import iter_pages, write_page_file, compress_saved_pages
+from parse_html import parse_html_to_json
+from _classes import CardList
+
+def card_html(number, image=None):
+    img = f'<img src="{image}">' if image else ""
+    return f'''
+    <div class="card exam-question-card">
+        <div class="card-header text-white bg-primary">Question #{number}</div>
+        <p class="card-text">Question {number} text {img}</p>
+        <ul>
+            <li class="multi-choice-item">A. First</li>
+            <li class="multi-choice-item correct">B. Second</li>
+        </ul>
+    </div>
+    '''
+
+class TestPageSources(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        write_page_file(os.path.join(self.folder, "plain.html"), card_html(1))
+        write_page_file(os.path.join(self.folder, "small.html"), card_html(2), "gz")
+        write_page_file(os.path.join(self.folder, "smaller.html"), card_html(3), "xz")
+        with zipfile.ZipFile(os.path.join(self.folder, "bundle.zip"), "w") as archive:
+            archive.writestr("AWS/page4.html", card_html(4, image="img/q4.png"))
+            archive.writestr("AWS/img/q4.png", b"PNGDATA")
+        with tarfile.open(os.path.join(self.folder, "bundle.tar.gz"), "w:gz") as archive:
+            data = card_html(5).encode("utf-8")
+            info = tarfile.TarInfo("page5.html")
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    def test_every_source_is_read(self):
+        names = sorted(page.name for page in iter_pages(self.folder))
+        self.assertEqual(names, ["AWS/page4.html", "page5.html", "plain.html", "small.html.gz", "smaller.html.xz"])
+
+    def test_page_saved_twice_is_read_once(self):
+        # A re-save left plain.html.gz next to the older plain.html: read only the newest
+        stale = os.path.join(self.folder, "plain.html")
+        os.utime(stale, (1000000000, 1000000000))
+        write_page_file(stale, card_html(6), "gz")
+        pages = {page.name: page for page in iter_pages(self.folder)}
+        self.assertNotIn("plain.html", pages)
+        self.assertIn("Question #6", pages["plain.html.gz"].html)
+        cards = CardList(self.folder).get_cards()
+        self.assertEqual(sorted(card.question_number for card in cards), ["2", "3", "4", "5", "6"])
+
+    def test_parse_reads_bundles_and_their_images(self):
+        output = os.path.join(self.folder, "exam.json")
+        parse_html_to_json(self.folder, output)
+        with open(output, encoding="utf-8") as fh:
+            questions = {q["question_number"]: q for q in json.load(fh)["questions"]}
+        self.assertEqual(sorted(questions), ["1", "2", "3", "4", "5"])
+        image = [part for part in questions["4"]["question_parts"] if part[0] == "image_base64"]
+        self.assertEqual(base64.b64decode(image[0][1]), b"PNGDATA")
+
+    def test_card_list_reads_compressed_pages(self):
+        cards = CardList(self.folder).get_cards()
+        self.assertEqual(sorted(card.question_number for card in cards), ["1", "2", "3", "4", "5"])
+
+    def test_compress_saved_pages(self):
+        count, before, after = compress_saved_pages(self.folder)
+        self.assertEqual(count, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "plain.html")))
+        self.assertLess(after, before)
+        self.assertEqual(len(list(iter_pages(self.folder))), 5)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,8 +2,12 @@
 
 import unittest
 import os
+import re
 import json
-from parse_html import parse_html_to_json
+import shutil
+import tempfile
+from bs4 import BeautifulSoup
+from parse_html import parse_html_to_json, parse_cards_from_soup, prune_soup
 
 class TestParseHTML(unittest.TestCase):
     def setUp(self):
@@ -40,13 +44,15 @@ class TestParseHTML(unittest.TestCase):
         self.assertEqual(question["correct_answers"], ["D"])
         # Check that answers have single labels
         for answer in question["answers"]:
+            # Answers are lists of [type, content] parts
+            text = " ".join(content for ptype, content in answer if ptype == "text")
             # The answer text should not start with a label like "A. "
-            self.assertFalse(re.match(r'^[A-Z]\.\s+[A-Z]\.\s', answer["text"]))
+            self.assertFalse(re.match(r'^[A-Z]\.\s+[A-Z]\.\s', text))
             # It should not contain duplicated labels; no "A. A. "
-            self.assertFalse("A. A." in answer["text"])
-            self.assertFalse("B. B." in answer["text"])
-            self.assertFalse("C. C." in answer["text"])
-            self.assertFalse("D. D." in answer["text"])
+            self.assertFalse("A. A." in text)
+            self.assertFalse("B. B." in text)
+            self.assertFalse("C. C." in text)
+            self.assertFalse("D. D." in text)
             # Instead, labels should be handled by the GUI, so answer texts should start directly with the content
 
     def tearDown(self):
@@ -57,5 +63,34 @@ class TestParseHTML(unittest.TestCase):
         if os.path.exists(self.output_json):
             os.remove(self.output_json)
 
+class TestPruneSoup(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_prune_keeps_only_cards(self):
+        card = '''
+        <div class="card exam-question-card">
+            <div class="card-header text-white bg-primary">Question #6</div>
+            <p class="card-text">Question 6 text</p>
+            <ul>
+                <li class="multi-choice-item">A. First</li>
+                <li class="multi-choice-item correct">B. Second</li>
+            </ul>
+        </div>
+        '''
+        page = (f"<html><head><title>Exam page</title><script>{'x' * 5000}</script></head>"
+                f"<body><nav>menu</nav>{card}<div class='discussion'>{'comment ' * 1000}</div></body></html>")
+        soup = BeautifulSoup(page, "html.parser")
+        before = parse_cards_from_soup(soup, self.folder)
+        pruned = prune_soup(soup)
+        self.assertLess(len(str(pruned)), len(page) // 10)
+        self.assertEqual(pruned.title.string, "Exam page")
+        self.assertIsNone(pruned.find("script"))
+        self.assertEqual(parse_cards_from_soup(pruned, self.folder), before)
+        self.assertIsNone(prune_soup(BeautifulSoup("<p>no cards</p>", "html.parser")))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+# test_parse_profile.py
+
+import unittest
+import io
+import json
+import os
+import shutil
+import tempfile
+import contextlib
+from exam_generator import generate_exam_folder
+from parse_html import parse_html_to_json
+from parse_profile import ParseProfile
+
+class TestParseProfile(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        generate_exam_folder(self.folder, questions=12, cards_per_page=5, image_rate=1.0, seed=2)
+
+    def test_report_covers_every_stage_and_file(self):
+        profile = ParseProfile()
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse_html_to_json(self.folder, os.path.join(self.folder, "exam.json"), profile=profile)
+        report = profile.report()
+        self.assertEqual((report["files"], report["questions"]), (3, 12))
+        for stage in ("read", "soup", "query", "clean", "images", "write", "other"):
+            self.assertIn(stage, report["stages"])
+        self.assertEqual(report["stages"]["read"]["calls"], 3)
+        self.assertGreater(report["stages"]["images"]["bytes"], 0)
+        self.assertEqual([entry["questions"] for entry in report["per_file"]], [5, 5, 2])
+        self.assertIn("Slowest file(s):", profile.summary())
+
+        path = os.path.join(self.folder, "profile.json")
+        profile.save(path)
+        with open(path, encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh)["questions"], 12)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+if __name__ == '__main__':
+    unittest.main()
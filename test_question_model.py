@@ -0,0 +1,42 @@
+# test_question_model.py
+
+import unittest
+import json
+from question_model import Question, TEXT, IMAGE_BASE64, load_questions, replace_text
+
+QUESTION = {
+    "question_number": "7",
+    "question_parts": [["text", "Which two?"], ["image_base64", "aW1n"]],
+    "answers": [[["text", "A. A. Use a queue"]], [["text", "B. Use a cache"], ["image_base64", "Yg=="]], [["text", "C. Neither"]]],
+    "correct_answers": ["A", "B"],
+    "explanation": "Both work.",
+}
+
+class TestQuestionModel(unittest.TestCase):
+    def test_precomputed_fields(self):
+        question = Question.from_dict(QUESTION)
+        self.assertEqual(question.answer_texts, ("Use a queue", "Use a cache", "Neither"))
+        self.assertEqual(question.answer_info("b"), ("Use a cache", "Yg=="))
+        self.assertEqual(question.answer_info("E"), ("[Unknown]", None))
+        self.assertEqual(question.max_picks, 2)
+        self.assertEqual(question.score({"A", "C"}), 0.5)
+        self.assertEqual(question.explanation, "Both work.")
+        self.assertIs(question.question_parts[1].ptype, IMAGE_BASE64)
+        self.assertIs(question.answers[2][0].ptype, TEXT)
+        self.assertFalse(hasattr(question, "__dict__"))
+
+    def test_round_trips_through_json(self):
+        questions = load_questions([QUESTION])
+        data = json.loads(json.dumps(questions[0].to_dict()))
+        self.assertEqual(data, QUESTION)
+        self.assertEqual(Question.from_dict(data), questions[0])
+        self.assertEqual(Question("", correct_answers=[]).max_picks, 1)
+
+    def test_replace_text_keeps_images_in_place(self):
+        parts = [(TEXT, "Look at"), (IMAGE_BASE64, "aW1n"), (TEXT, "then pick one.")]
+        self.assertEqual(replace_text(parts, "Edited"), [(TEXT, "Edited"), (IMAGE_BASE64, "aW1n")])
+        self.assertEqual(replace_text([(IMAGE_BASE64, "aW1n")], "New"), [(TEXT, "New"), (IMAGE_BASE64, "aW1n")])
+        self.assertEqual(replace_text((), "Only text"), [(TEXT, "Only text")])
+
+if __name__ == '__main__':
+    unittest.main()
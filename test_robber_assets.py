@@ -0,0 +1,73 @@
+# test_robber_assets.py
+
+import unittest
+import os
+import shutil
+import tempfile
+from bs4 import BeautifulSoup
+from mock_examtopics import MockSite, MockExamTopicsServer
+from Robber_db import Database
+from Robber_assets import AssetStore
+
+def card_page(*srcs):
+    images = "".join(f'<img src="{src}">' for src in srcs)
+    return BeautifulSoup(f'<html><body><div class="card exam-question-card"><p>{images}</p></div>'
+                         f'<img src="{srcs[0]}" class="avatar"></body></html>', "html.parser")
+
+class TestAssetStore(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.mock = MockExamTopicsServer(MockSite(max_id=10), latency=0.05, jitter=0).start()
+        host, port = self.mock.httpd.server_address[:2]
+        self.base = f"http://{host}:{port}/assets"
+        self.db = Database(":memory:")
+        self.store = AssetStore(self.db, {}, root=os.path.join(self.work_dir, "_assets"))
+        self.page_folder = os.path.join(self.work_dir, "Exam Mock Certified")
+
+    def tearDown(self):
+        self.store.close()
+        self.db.close()
+        self.mock.stop()
+        shutil.rmtree(self.work_dir)
+
+    def stored_files(self):
+        return [name for _, _, files in os.walk(self.store.root) for name in files]
+
+    def test_identical_images_are_stored_once(self):
+        soup = card_page(f"{self.base}/1.png", f"{self.base}/2.png")
+        self.assertEqual(self.store.localize(soup, self.page_folder), (2, 0, 0))
+        self.assertEqual(len(self.stored_files()), 1)
+        self.assertEqual(len({img["src"] for img in soup.find("div").find_all("img")}), 1)
+
+    def test_concurrent_requests_for_one_url_fetch_it_once(self):
+        url = f"{self.base}/1.png"
+        futures = [self.store.fetch(url) for _ in range(5)]
+        results = [future.result() for future in futures]
+        self.assertEqual(self.mock.requests, 1)
+        self.assertEqual(len({path for path, _ in results}), 1)
+        # Already stored: neither fetched again nor requested
+        self.assertEqual(self.store.localize(card_page(url), self.page_folder), (0, 1, 0))
+        self.assertEqual(self.mock.requests, 1)
+
+    def test_src_is_rewritten_relative_to_the_page_folder(self):
+        soup = card_page(f"{self.base}/1.png")
+        pending = self.store.start(soup)
+        self.assertEqual(self.store.finish(pending, self.page_folder), (1, 0, 0))
+        card_img, avatar = soup.find_all("img")
+        self.assertFalse(os.path.isabs(card_img["src"]))
+        self.assertTrue(card_img["src"].startswith("../_assets/"))
+        self.assertTrue(os.path.exists(os.path.normpath(os.path.join(self.page_folder, card_img["src"]))))
+        self.assertEqual(avatar["src"], f"{self.base}/1.png")      # Outside the question cards
+
+    def test_offline_uses_only_stored_images(self):
+        self.store.localize(card_page(f"{self.base}/1.png"), self.page_folder)
+        requests_before = self.mock.requests
+        soup = card_page(f"{self.base}/1.png", f"{self.base}/9.png")
+        self.assertEqual(self.store.localize(soup, self.page_folder, offline=True), (0, 1, 1))
+        self.assertEqual(self.mock.requests, requests_before)
+        stored, missing = soup.find("div").find_all("img")
+        self.assertTrue(stored["src"].startswith("../_assets/"))
+        self.assertEqual(missing["src"], f"{self.base}/9.png")
+
+if __name__ == '__main__':
+    unittest.main()
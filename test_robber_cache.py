@@ -0,0 +1,59 @@
+# test_robber_cache.py
+
+import unittest
+import os
+import shutil
+import tempfile
+from Robber_cache import ResponseCache
+from Robber_db import Database
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "cache.db")
+        self.cache_dir = os.path.join(self.tmp_dir, "bodies")
+        self.db = Database(self.db_path)
+        self.cache = ResponseCache(self.db, self.cache_dir)
+
+    def test_store_and_lookup(self):
+        changed = self.cache.store("http://x/1", "http://x/1-final", "<html>one</html>", etag='"abc"', last_modified="Mon")
+        self.assertTrue(changed)
+        self.db.flush()
+        entry = self.cache.lookup("http://x/1")
+        self.assertEqual(entry["final_url"], "http://x/1-final")
+        self.assertEqual(self.cache.load_body(entry), "<html>one</html>")
+        self.assertEqual(self.cache.conditional_headers(entry), {"If-None-Match": '"abc"', "If-Modified-Since": "Mon"})
+        self.assertIsNone(self.cache.lookup("http://x/2"))
+
+    def test_unchanged_content_is_detected(self):
+        self.cache.store("http://x/1", "http://x/1", "<html>same</html>")
+        self.db.flush()
+        self.assertFalse(self.cache.store("http://x/1", "http://x/1", "<html>same</html>"))
+        self.db.flush()
+        self.assertTrue(self.cache.store("http://x/1", "http://x/1", "<html>new</html>"))
+
+    def test_persists_across_instances(self):
+        self.cache.store("http://x/1", "http://x/1", "<html>kept</html>")
+        self.cache.close()
+        self.db.close()
+        self.db = Database(self.db_path)
+        self.cache = ResponseCache(self.db, self.cache_dir)
+        self.assertEqual(self.cache.load_body(self.cache.lookup("http://x/1")), "<html>kept</html>")
+
+    def test_eviction_keeps_size_bounded(self):
+        self.cache.max_bytes = 2000
+        for i in range(50):
+            # Random-ish bodies so gzip can't shrink them to nothing
+            self.cache.store(f"http://x/{i}", f"http://x/{i}", os.urandom(300).hex())
+        self.db.flush()
+        self.assertLessEqual(self.cache.total_bytes, 2000)
+        self.assertIsNotNone(self.cache.lookup("http://x/49"))
+        self.assertIsNone(self.cache.lookup("http://x/0"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# test_robber_db.py
+
+import unittest
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from Robber_db import Database
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.tmp_dir, "robber.db"))
+        self.db.write("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT UNIQUE)").result()
+
+    def test_concurrent_writers_and_readers(self):
+        def worker(n):
+            for i in range(50):
+                self.db.write("INSERT INTO items (value) VALUES (?)", (f"{n}-{i}",))
+            self.db.read("SELECT COUNT(*) FROM items")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.db.flush()
+        counts = []
+        reader = threading.Thread(target=lambda: counts.append(self.db.read_one("SELECT COUNT(*) FROM items")[0]))
+        reader.start()
+        reader.join()
+        self.assertEqual(counts, [400])
+
+    def test_failed_write_does_not_undo_its_batch(self):
+        errors = []
+        self.db.on_error = errors.append
+        first = self.db.write("INSERT INTO items (value) VALUES ('a')")
+        duplicate = self.db.write("INSERT INTO items (value) VALUES ('a')")
+        last = self.db.write("INSERT INTO items (value) VALUES ('b')")
+        self.assertEqual(first.result(), 1)
+        self.assertEqual(last.result(), 1)
+        with self.assertRaises(sqlite3.IntegrityError):
+            duplicate.result()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.db.read("SELECT value FROM items ORDER BY value"), [("a",), ("b",)])
+
+    def test_transaction_sees_queued_writes(self):
+        self.db.write("INSERT INTO items (value) VALUES ('x')")
+        count = self.db.transaction(lambda conn: conn.execute("SELECT COUNT(*) FROM items").fetchone()[0])
+        self.assertEqual(count.result(), 1)
+
+    def test_release_reader_closes_the_thread_connection(self):
+        def worker():
+            self.db.read("SELECT COUNT(*) FROM items")
+            self.db.release_reader()
+            self.db.release_reader()    # Nothing left to release
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.db.readers, [])
+        self.db.read("SELECT COUNT(*) FROM items")
+        self.db.release_reader()
+        self.assertEqual(self.db.read_one("SELECT COUNT(*) FROM items"), (0,))   # Reopened on demand
+        self.assertEqual(len(self.db.readers), 1)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# test_robber_explorer.py
+
+import unittest
+import random
+from Robber_db import Database
+from Robber_explorer import IdBitmap, IdSpaceExplorer
+
+class TestIdSpaceExplorer(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(":memory:")
+        self.probed = []
+
+    def tearDown(self):
+        self.db.close()
+
+    def explore(self, hits, start_id=0, end_id=None):
+        def probe(id_):
+            self.probed.append(id_)
+            return id_ in hits
+        explorer = IdSpaceExplorer(IdBitmap(self.db))
+        return explorer.run(start_id, probe, end_id=end_id)
+
+    def test_bitmap_roundtrip(self):
+        bitmap = IdBitmap(self.db, "t")
+        bitmap.mark(5, True)
+        bitmap.mark(9000, False)
+        bitmap.flush(wait=True)
+        reloaded = IdBitmap(self.db, "t")
+        self.assertTrue(reloaded.is_probed(5) and reloaded.is_hit(5))
+        self.assertTrue(reloaded.is_probed(9000))
+        self.assertFalse(reloaded.is_hit(9000))
+        self.assertFalse(reloaded.is_probed(6))
+        self.assertEqual(reloaded.max_probed(), 9000)
+        self.assertEqual(reloaded.counts(), (2, 1))
+        self.assertIsNone(IdBitmap(self.db, "other").max_probed())
+
+    def test_clustered_ids_need_far_fewer_requests(self):
+        rng = random.Random(1)
+        hits = {c + i for c in range(0, 200000, 5000) for i in range(rng.randint(20, 120)) if rng.random() < 0.7}
+        requests_made, found = self.explore(hits)
+        self.assertGreaterEqual(found, 0.9 * len(hits))
+        self.assertLess(requests_made, 0.25 * max(hits))
+
+    def test_crosses_gaps_longer_than_99(self):
+        hits = set(range(0, 50)) | set(range(3000, 3050))
+        requests_made, found = self.explore(hits, end_id=3100)
+        self.assertEqual(found, len(hits))
+        self.assertLess(requests_made, 1000)
+
+    def test_uniform_sparse_ids_are_not_lost(self):
+        rng = random.Random(2)
+        hits = {i for i in range(20000) if rng.random() < 0.05}
+        _, found = self.explore(hits)
+        self.assertEqual(found, len(hits))
+
+    def test_resume_does_not_repeat_requests(self):
+        hits = set(range(0, 100))
+        stop_after = 40
+        explorer = IdSpaceExplorer(IdBitmap(self.db))
+        explorer.run(0, lambda id_: id_ in hits, should_stop=lambda: explorer.requests >= stop_after)
+        resumed = IdSpaceExplorer(IdBitmap(self.db))
+        self.assertEqual(resumed.resume_point(), stop_after)
+        self.explore(hits, start_id=resumed.resume_point())
+        self.assertNotIn(0, self.probed)
+        self.assertEqual(min(self.probed), stop_after)
+
+    def test_resume_finishes_an_interrupted_backfill(self):
+        hits = set(range(0, 2000)) | set(range(5000, 6000))
+        state = {"highest": -1, "backfilled": 0}
+
+        def probe(id_):
+            if id_ < state["highest"]:
+                state["backfilled"] += 1     # Walking down behind a gallop that landed on a hit
+            state["highest"] = max(state["highest"], id_)
+            return id_ in hits
+        explorer = IdSpaceExplorer(IdBitmap(self.db))
+        explorer.run(0, probe, should_stop=lambda: state["backfilled"] >= 3)
+        self.assertEqual(state["backfilled"], 3)
+        self.assertEqual(len(IdBitmap(self.db).pending_backfills()), 1)
+
+        resumed = IdSpaceExplorer(IdBitmap(self.db))
+        self.explore(hits, start_id=resumed.resume_point(), end_id=6100)
+        bitmap = IdBitmap(self.db)
+        self.assertEqual(bitmap.counts()[1], len(hits))
+        self.assertEqual(bitmap.pending_backfills(), [])
+
+if __name__ == '__main__':
+    unittest.main()
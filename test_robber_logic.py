@@ -0,0 +1,44 @@
+# test_robber_logic.py
+
+import unittest
+import os
+import shutil
+import tempfile
+from mock_examtopics import MockSite, MockExamTopicsServer
+from Robber_logic import RobberLogic
+
+class TestRobberLogic(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        self.mock = MockExamTopicsServer(MockSite(max_id=300, density=0.1, page_kb=5, seed=3)).start()
+        self.logic = RobberLogic(db_path="test.db", cache_dir="cache", scan_delay=(0, 0))
+        self.log = []
+
+    def test_scan_then_download(self):
+        requests_made, found = self.logic.start_scanning(0, self.log.append, url_template=self.mock.url_template, end_id=300)
+        self.assertEqual(found, len(self.mock.site.ids))
+        self.assertLessEqual(requests_made, 301)
+
+        self.logic.start_downloading("mock", self.log.append, page_compression="gz", prune_pages=True)
+        self.assertEqual(self.logic.metrics.total("write.pages"), found)
+        saved = [name for _, _, files in os.walk("Robbed") for name in files if name.endswith(".html.gz")]
+        self.assertEqual(len(saved), found)
+
+    def test_unchanged_pages_are_not_downloaded_again(self):
+        self.logic.start_scanning(0, self.log.append, url_template=self.mock.url_template, end_id=100)
+        self.logic.start_downloading("mock", self.log.append, download_assets=False)
+        written = self.logic.metrics.total("write.pages")
+        self.logic.start_downloading("mock", self.log.append, download_assets=False)
+        self.assertEqual(self.logic.metrics.total("write.pages"), written)
+        self.assertEqual(self.logic.metrics.total("download.not_modified"), written)
+
+    def tearDown(self):
+        self.logic.close_connection()
+        self.mock.stop()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.work_dir)
+
+if __name__ == '__main__':
+    unittest.main()
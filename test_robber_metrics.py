@@ -0,0 +1,58 @@
+# test_robber_metrics.py
+
+import unittest
+import os
+import csv
+import json
+import tempfile
+import requests
+from Robber_metrics import LatencyHistogram, Metrics
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.observe(0.010)
+        for _ in range(10):
+            histogram.observe(2.0)
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 100)
+        # Bucket bounds are sqrt(2) apart, so percentiles are within that factor
+        self.assertTrue(0.010 <= snapshot["p50"] < 0.010 * 1.42)
+        self.assertTrue(2.0 <= snapshot["p99"] <= 2.0 * 1.42)
+        self.assertEqual(snapshot["max"], 2.0)
+
+    def test_errors_are_counted_by_class_and_status(self):
+        metrics = Metrics()
+        response = requests.Response()
+        response.status_code = 503
+        metrics.record_error(requests.exceptions.HTTPError(response=response))
+        metrics.record_error(requests.exceptions.ConnectTimeout())
+        counters = metrics.snapshot()["counters"]
+        self.assertEqual(counters["errors.HTTPError"]["total"], 1)
+        self.assertEqual(counters["errors.http_503"]["total"], 1)
+        self.assertEqual(counters["errors.ConnectTimeout"]["total"], 1)
+
+    def test_export_json_and_csv(self):
+        metrics = Metrics()
+        metrics.incr("download.bytes", 2048)
+        with metrics.timer("download"):
+            pass
+        with tempfile.TemporaryDirectory() as folder:
+            json_path = os.path.join(folder, "metrics.json")
+            metrics.export(json_path)
+            with open(json_path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            self.assertEqual(data["counters"]["download.bytes"]["total"], 2048)
+            self.assertEqual(data["latency"]["download"]["count"], 1)
+
+            csv_path = os.path.join(folder, "metrics.csv")
+            metrics.export(csv_path)
+            metrics.export(csv_path)
+            with open(csv_path, newline="", encoding="utf-8") as fh:
+                rows = list(csv.DictReader(fh))
+            self.assertEqual(len(rows), 4)  # Two snapshots appended, one counter and one histogram each
+            self.assertEqual({row["kind"] for row in rows}, {"counter", "latency"})
+
+if __name__ == '__main__':
+    unittest.main()
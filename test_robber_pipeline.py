@@ -0,0 +1,92 @@
+# test_robber_pipeline.py
+
+import unittest
+import threading
+import time
+from Robber_metrics import Metrics
+from Robber_pipeline import DownloadPipeline
+
+class TestDownloadPipeline(unittest.TestCase):
+    def run_pipeline(self, items, fetch=None, rewrite=None, write=None, stop_event=None, **options):
+        written = []
+        pipeline = DownloadPipeline(
+            fetch=fetch or (lambda item: item),
+            rewrite=rewrite or (lambda item: item),
+            write=write or written.append,
+            stop_event=stop_event or threading.Event(),
+            **options)
+        runner = threading.Thread(target=pipeline.run, args=(items,))
+        runner.start()
+        runner.join(10)
+        self.assertFalse(runner.is_alive(), "the pipeline did not drain")
+        return pipeline, written
+
+    def test_single_workers_keep_order(self):
+        _, written = self.run_pipeline(range(1, 51), rewrite=lambda n: n * 2, fetch_workers=1, rewrite_workers=1)
+        self.assertEqual(written, [n * 2 for n in range(1, 51)])
+
+    def test_every_item_passes_once_with_several_workers(self):
+        # The last worker of each stage to finish is the one that stops the next stage
+        pipeline, written = self.run_pipeline(range(200), fetch=lambda n: n + 1,
+                                              fetch_workers=5, rewrite_workers=3, queue_size=2)
+        self.assertEqual(sorted(written), list(range(1, 201)))
+        stats = pipeline.stats()
+        self.assertEqual([s["processed"] for s in stats[:2]], [200, 200])
+        self.assertEqual([s["queued"] for s in stats], [0, 0, 0])
+
+    def test_images_stage_runs_between_rewrite_and_write(self):
+        pipeline, written = self.run_pipeline(range(1, 21), rewrite=lambda n: n * 2, images=lambda n: n + 1,
+                                              image_workers=3)
+        self.assertEqual(sorted(written), [n * 2 + 1 for n in range(1, 21)])
+        self.assertEqual([s["stage"] for s in pipeline.stats()], ["fetch", "rewrite", "images", "write"])
+
+    def test_every_worker_thread_calls_on_worker_exit(self):
+        exited = []
+        self.run_pipeline(range(1, 11), on_worker_exit=lambda: exited.append(threading.current_thread().name),
+                          fetch_workers=3, rewrite_workers=2)
+        self.assertEqual(len(set(exited)), 3 + 2 + 1)
+
+    def test_queues_are_bounded(self):
+        peak = []
+        holder = {}
+
+        def write(item):
+            peak.append(max(q.qsize() for q in holder["pipeline"].queues))
+            time.sleep(0.002)   # A slow writer must throttle the fetchers
+            return item
+        pipeline = DownloadPipeline(lambda n: n, lambda n: n, write, threading.Event(),
+                                    fetch_workers=4, rewrite_workers=2, queue_size=3)
+        holder["pipeline"] = pipeline
+        pipeline.run(range(1, 101))   # Falsy items are dropped, so no 0
+        self.assertEqual(len(peak), 100)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_stop_drains_without_blocking(self):
+        stop = threading.Event()
+        written = []
+
+        def write(item):
+            written.append(item)
+            if len(written) == 5:
+                stop.set()
+            return item
+        self.run_pipeline(range(10000), write=write, stop_event=stop, queue_size=2)
+        self.assertLess(len(written), 100)
+
+    def test_stage_errors_are_logged_and_counted(self):
+        metrics = Metrics()
+
+        def fetch(n):
+            if n % 10 == 0:
+                raise ValueError(f"bad item {n}")
+            return n
+        with self.assertLogs("robber.pipeline", level="ERROR") as logs:
+            pipeline, written = self.run_pipeline(range(30), fetch=fetch, metrics=metrics)
+        self.assertEqual(len(written), 27)
+        self.assertEqual(pipeline.stats()[0]["failed"], 3)
+        self.assertEqual(metrics.total("errors.ValueError"), 3)
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn("fetch stage failed", logs.output[0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# test_robber_scheduler.py
+
+import threading
+import time
+import unittest
+from Robber_db import Database
+from Robber_scheduler import RateBudget, CrawlTarget, CrawlScheduler
+
+class FakeLogic:
+    """Stands in for RobberLogic: escaneo() 'finds' the IDs in hits."""
+    def __init__(self, db, hits, delay=0.0):
+        self.db = db
+        self.hits = hits
+        self.delay = delay
+        self.urls = []
+
+    def escaneo(self, url, log):
+        time.sleep(self.delay)
+        self.urls.append(url)
+        return int(url.rsplit("/", 1)[1]) in self.hits
+
+
+class TestRateBudget(unittest.TestCase):
+    def test_slots_are_shared_between_threads(self):
+        budget = RateBudget(rate=50)
+        stop = threading.Event()
+        times = []
+        lock = threading.Lock()
+
+        def take(count):
+            for _ in range(count):
+                budget.acquire(stop)
+                with lock:
+                    times.append(time.monotonic())
+        threads = [threading.Thread(target=take, args=(5,)) for _ in range(2)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(times), 10)
+        # Ten slots 1/50 s apart, whichever thread asked for them
+        self.assertGreaterEqual(max(times) - start, 9 / 50 - 0.01)
+
+    def test_stop_while_waiting(self):
+        budget = RateBudget(rate=0.5)
+        stop = threading.Event()
+        self.assertTrue(budget.acquire(stop))
+        threading.Timer(0.05, stop.set).start()
+        started = time.monotonic()
+        self.assertFalse(budget.acquire(stop))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class TestCrawlScheduler(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(":memory:")
+        self.messages = []
+
+    def tearDown(self):
+        self.db.close()
+
+    def scheduler(self, hits, delay=0.0, rate=1000):
+        self.logic = FakeLogic(self.db, hits, delay)
+        return CrawlScheduler(self.logic, rate=rate)
+
+    def wait(self, scheduler, name, timeout=10):
+        deadline = time.monotonic() + timeout
+        while scheduler.is_running(name) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(scheduler.is_running(name))
+
+    def target(self, scheduler, name):
+        return next((t for t in scheduler.targets() if t["name"] == name), None)
+
+    def test_finishes_at_end_id(self):
+        scheduler = self.scheduler(set(range(10, 20)))
+        scheduler.add_target(CrawlTarget("aws", "https://example.com/d/{id}", 0, 40))
+        self.assertTrue(scheduler.start_target("aws", self.messages.append))
+        self.wait(scheduler, "aws")
+        row = self.target(scheduler, "aws")
+        self.assertEqual(row["status"], "finished")
+        self.assertEqual(row["hits"], 10)
+        self.assertEqual(row["probes"], len(self.logic.urls))
+        self.assertEqual(len(self.db.readers), 1)      # The test thread's; the crawl thread closed its own
+
+    def test_stop_and_resume(self):
+        scheduler = self.scheduler(set(range(0, 5000)), delay=0.001)
+        scheduler.add_target(CrawlTarget("aws", "https://example.com/d/{id}", 0, 300))
+        scheduler.start_target("aws", self.messages.append)
+        time.sleep(0.05)
+        scheduler.stop_target("aws")
+        self.wait(scheduler, "aws")
+        row = self.target(scheduler, "aws")
+        self.assertEqual(row["status"], "stopped")
+        self.assertLess(row["hits"], 300)
+
+        first_run = len(self.logic.urls)
+        scheduler.start_target("aws", self.messages.append)
+        self.wait(scheduler, "aws")
+        row = self.target(scheduler, "aws")
+        self.assertEqual(row["status"], "finished")
+        self.assertEqual(row["hits"], 301)
+        self.assertEqual(len(set(self.logic.urls)), len(self.logic.urls))     # Nothing probed twice
+        self.assertGreater(len(self.logic.urls), first_run)
+
+    def test_remove_running_target_leaves_nothing_behind(self):
+        scheduler = self.scheduler(set(range(0, 5000)), delay=0.001)
+        scheduler.add_target(CrawlTarget("aws", "https://example.com/d/{id}", 0))
+        scheduler.start_target("aws", self.messages.append)
+        time.sleep(0.05)
+        scheduler.remove_target("aws")
+        self.wait(scheduler, "aws")
+        self.db.flush()
+        self.assertEqual(scheduler.targets(), [])
+        self.assertIsNone(self.db.read_one("SELECT 1 FROM id_bitmap WHERE target = 'target:aws'"))
+        self.assertIsNone(self.db.read_one("SELECT 1 FROM id_backfill WHERE target = 'target:aws'"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# test_scoring.py
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from question_model import Question
+from scoring import build_results, save_results, ResultsSaver
+
+class TestSaveResults(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        questions = [Question("1", [("text", "Q1")], [[("text", "A. x")], [("text", "B. y")]], ["A"]),
+                     Question("2", [("text", "Q2")], [[("text", "A. x")], [("text", "B. y")]], ["A", "B"])]
+        self.results = build_results("aws", questions, [{"A"}, {"B"}], 65)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_background_save(self):
+        saver = ResultsSaver(self.results, self.folder)
+        self.assertTrue(saver.wait(10))
+        self.assertIsNone(saver.error)
+        self.assertEqual(os.listdir(self.folder), [os.path.basename(saver.path)])
+        with open(saver.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["final_score"], 1.5)
+
+    def test_failed_write_leaves_nothing_behind(self):
+        with mock.patch("scoring.json.dump", side_effect=OSError("disk full")):
+            saver = ResultsSaver(self.results, self.folder)
+            saver.wait(10)
+        self.assertIsInstance(saver.error, OSError)
+        self.assertEqual(os.listdir(self.folder), [])
+        path = save_results(self.results, self.folder)     # The synchronous call still works
+        self.assertTrue(path.endswith(".json") and os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# test_search_index.py
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from search_index import SearchIndex, match_expression, load_hit_questions, INDEX_FILE
+from parse_html import parse_html_to_json
+from exam_generator import generate_exam_folder
+
+def _question(number, text, answers, correct="A"):
+    return {
+        "question_number": str(number),
+        "question_parts": [["text", text]],
+        "answers": [[["text", f"{letter}. {answer}"]] for letter, answer in zip("ABCD", answers)],
+        "correct_answers": list(correct),
+    }
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.write_exam("aws.json", [
+            _question(1, "Which service streams records into S3?", ["Kinesis Data Firehose", "Amazon SQS"]),
+            _question(2, "A company needs a relational database.", ["Amazon RDS", "DynamoDB"]),
+        ])
+        self.write_exam("azure.json", [
+            _question(7, "Which service streams events from devices?", ["Event Hubs", "Blob Storage"]),
+        ])
+        self.index = SearchIndex(self.folder)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def write_exam(self, name, questions):
+        with open(os.path.join(self.folder, name), "w", encoding="utf-8") as f:
+            json.dump({"title": name, "questions": questions}, f)
+
+    def test_search_ranks_and_filters(self):
+        self.assertEqual(self.index.sync(), (2, 0))
+        hits = self.index.search("streams service")
+        self.assertEqual({(h["exam"], h["question_number"]) for h in hits}, {("aws.json", "1"), ("azure.json", "7")})
+        self.assertEqual([h["exam"] for h in self.index.search("streams", exams=["azure.json"])], ["azure.json"])
+        # Other names containing the same words don't pass the exam filter
+        self.write_exam("old-aws.json", [_question(4, "Which service streams logs?", ["CloudWatch", "S3"])])
+        self.index.sync()
+        self.assertEqual([h["exam"] for h in self.index.search("streams", exams=["aws.json"])], ["aws.json"])
+        # Answer text is searchable, stemmed, and prefixes/phrases work
+        self.assertEqual(self.index.search("firehose")[0]["question_index"], 0)
+        self.assertEqual(self.index.search("databases")[0]["question_number"], "2")
+        self.assertEqual(len(self.index.search("fire*")), 1)
+        self.assertEqual(self.index.search('"data firehose"')[0]["exam"], "aws.json")
+        self.assertEqual(self.index.search('"firehose data"'), [])
+        self.assertIn("[", self.index.search("kinesis")[0]["snippet"])
+        self.assertEqual(match_expression('  " " * '), None)
+        questions = load_hit_questions(self.folder, self.index.search("rds"))
+        self.assertEqual([q["question_number"] for q in questions], ["2"])
+
+    def test_sync_follows_changes(self):
+        self.index.sync()
+        self.assertEqual(self.index.sync(), (0, 0))
+        os.remove(os.path.join(self.folder, "azure.json"))
+        self.write_exam("aws.json", [_question(3, "Serverless compute", ["AWS Lambda", "EC2"])])
+        self.assertEqual(self.index.sync(), (1, 1))
+        self.assertEqual(self.index.search("streams"), [])
+        self.assertEqual(self.index.search("lambda")[0]["question_number"], "3")
+        self.assertEqual(self.index.exam_names(), ["aws.json"])
+
+    def test_parse_updates_index(self):
+        bank = os.path.join(self.folder, "bank")
+        generate_exam_folder(bank, questions=12, cards_per_page=4, image_rate=0.0, seed=5)
+        exams = os.path.join(self.folder, "exams")
+        os.makedirs(exams)
+        output = os.path.join(exams, "bank.json")
+        parse_html_to_json(bank, output, index=True)
+        self.assertTrue(os.path.exists(os.path.join(exams, INDEX_FILE)))
+        with open(output, encoding="utf-8") as f:
+            first = json.load(f)["questions"][0]
+        word = max(first["question_parts"][0][1].split(), key=len).strip(".,")
+        index = SearchIndex(exams)
+        try:
+            self.assertEqual(index.sync(), (0, 0))   # Already indexed by the parse
+            self.assertIn("bank.json", {h["exam"] for h in index.search(word)})
+        finally:
+            index.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# test_startup.py
+
+import unittest
+import os
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+# Cumulative import time allowed for main.py (tkinter included). It is ~15 ms on
+# a dev machine; the old eager imports (bs4, Pillow, requests, the scraper) took ~200 ms.
+MAIN_IMPORT_BUDGET_MS = 80
+# Must not load before the first menu action needs them
+DEFERRED_MODULES = ("bs4", "PIL", "requests", "parse_html", "quizgui", "results", "editor", "Robber_GUI", "Robber_logic")
+
+def import_times(module):
+    """{module name: cumulative microseconds} from python -X importtime -c 'import module'."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO,
+                            capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        try:
+            import tkinter  # noqa: F401
+        except ImportError:
+            self.skipTest("tkinter is not available")
+
+    def test_main_defers_heavy_imports(self):
+        times = import_times("main")
+        self.assertEqual([name for name in DEFERRED_MODULES if name in times], [])
+
+    def test_main_import_budget(self):
+        # Best of three, so a busy machine doesn't fail the build
+        best = min(import_times("main")["main"] for _ in range(3)) / 1000
+        self.assertLess(best, MAIN_IMPORT_BUDGET_MS,
+                        f"importing main.py took {best:.0f} ms (budget {MAIN_IMPORT_BUDGET_MS} ms); check for new eager imports")
+
+if __name__ == '__main__':
+    unittest.main()